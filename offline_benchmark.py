@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+오프라인 다운로드 벤치마크
+
+로컬 미디어 서버(src/core/local_media_server.py)를 띄우고 실제 다운로드 경로
+(VideoDownloader.download → yt-dlp → 저장소 루트의 localmedia 추출기 플러그인)로
+워커 수별 다운로드 시간을 측정합니다. YouTube에 접속하지 않으므로 CI나 격리된
+빌드 호스트에서도 같은 조건(지연, 연결당 대역폭, 지터, seed)으로 반복할 수 있습니다.
+
+사용 예:
+    python offline_benchmark.py                                  # HLS, 워커 1/2/4/8
+    python offline_benchmark.py --protocol dash --bandwidth-mbps 100 --latency-ms 30
+    python offline_benchmark.py --network-benchmark              # NetworkBenchmark A/B를 로컬 서버로 실행
+    python offline_benchmark.py --backend-benchmark              # 형식별 전송 백엔드(native/aria2c/ffmpeg) 비교
+    python offline_benchmark.py --protocol dash --max-connections 4 --adaptive   # IP 단위 제한에서 적응형 조절
+    python offline_benchmark.py --extraction-comparison --runs 5  # 단일 추출 경로와 이전 경로(추출 2회)의 첫 바이트 시간 비교
+"""
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from src.core.config import config
+from src.core.local_media_server import LocalMediaServer
+
+
+def run_downloads(server, args):
+    """워커 수별로 VideoDownloader.download 실행, 결과 목록 반환"""
+    from src.core.downloader import VideoDownloader
+
+    # 합성 데이터는 병합/후처리가 필요 없는 단일 포맷으로 제공되므로 FFmpeg 설치 확인(네트워크) 생략
+    # (별도 오디오 스트림을 받으면 병합에 FFmpeg가 필요하므로 평소처럼 확인)
+    if not args.audio_file:
+        VideoDownloader.ffmpeg_ensured = True
+
+    url = server.media_url(args.media, args.protocol)
+    media = server.media[args.media]
+    total_size = media['size'] + (server.media[media['audio']]['size'] if media['audio'] else 0)
+    results = []
+    for workers in args.workers:
+        durations = []
+        for run in range(args.runs):
+            output_dir = tempfile.mkdtemp(prefix="offline-benchmark-")
+            config.override("download_path", output_dir)
+            sent_before = server.bytes_sent
+            try:
+                start = time.perf_counter()
+                downloader = VideoDownloader()
+                # 측정할 워커 수를 예상 크기 기반 계획으로 줄이지 않도록 고정
+                downloader.download(url, concurrent_fragments=workers, fixed_workers=True)
+                durations.append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+            received_mb = (server.bytes_sent - sent_before) / 1048576
+            print(f"[Offline] 워커 {workers}개 #{run + 1}: {durations[-1]:.2f}초, {received_mb:.1f}MB")
+            for report in downloader.telemetry.get('fragment_concurrency', []):
+                print(f"[Offline]   적응형 워커: {report['initial']} → {report['final']}개 "
+                      f"(평균 {report['average']}, 429 {report['throttled']}회)")
+
+        median = statistics.median(durations)
+        results.append({
+            'workers': workers,
+            'durations': durations,
+            'median': median,
+            'speed_mbps': total_size * 8 / 1000000 / median,
+        })
+    return results
+
+
+def run_extraction_comparison(server, args):
+    """
+    작업 시작 → 첫 바이트 시간을 단일 추출 경로와 이전 경로(추출 2회)로 비교
+
+    이전 경로는 영상 정보 확인용 추출(get_video_info) 뒤에 다운로드가 URL로 다시 추출하던 흐름을
+    그대로 재현합니다. 첫 바이트 시각은 첫 진행 이벤트(받은 바이트 > 0) 기준이므로
+    진행 이벤트 전달 주기(0.1초) 단위로 측정됩니다.
+
+    Returns:
+        dict: {'single': [초, ...], 'double': [초, ...]}
+    """
+    from src.core.downloader import VideoDownloader
+
+    if not args.audio_file:
+        VideoDownloader.ffmpeg_ensured = True
+
+    url = server.media_url(args.media, args.protocol)
+    workers = args.workers[0]
+    results = {'single': [], 'double': []}
+    for run in range(args.runs):
+        for path in ('single', 'double'):
+            output_dir = tempfile.mkdtemp(prefix="offline-benchmark-")
+            config.override("download_path", output_dir)
+            first_byte = {}
+
+            def on_event(event):
+                if event['downloaded_bytes'] > 0:
+                    first_byte.setdefault('time', time.perf_counter())
+
+            try:
+                start = time.perf_counter()
+                downloader = VideoDownloader()
+                if path == 'double':
+                    # 이전 경로: 정보 확인용 추출 후 다운로드에서 다시 추출
+                    downloader.get_video_info(url)
+                downloader.download(url, concurrent_fragments=workers, fixed_workers=True,
+                                    progress_event_callback=on_event)
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+
+            if 'time' not in first_byte:
+                raise Exception("진행 이벤트를 받지 못했습니다")
+            results[path].append(first_byte['time'] - start)
+            label = "단일 추출" if path == 'single' else "추출 2회"
+            print(f"[Offline] {label} #{run + 1}: 첫 바이트까지 {results[path][-1]:.3f}초")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 미디어 서버를 사용한 오프라인 다운로드 벤치마크")
+    parser.add_argument("--protocol", default="m3u8", choices=["https", "m3u8", "dash"], help="측정할 전송 형식")
+    parser.add_argument("--media", default="a", help="영상 이름 (a: 64MB, b: 256MB)")
+    parser.add_argument("--workers", default="1,2,4,8", help="측정할 워커 수 (쉼표로 구분)")
+    parser.add_argument("--runs", type=int, default=3, help="워커 수별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--latency-ms", type=float, default=30, help="요청당 지연 (TTFB)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=100, help="연결당 최대 속도 (0 = 무제한)")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="지연 무작위 변동 폭")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--total-bandwidth-mbps", type=float, default=0, help="서버 전체 최대 속도 (0 = 무제한)")
+    parser.add_argument("--max-connections", type=int, default=0, help="서버 동시 연결 수 (0 = 무제한, 초과 시 429)")
+    parser.add_argument("--adaptive", action="store_true", help="다운로드 중 프래그먼트 워커 수 자동 조절 사용")
+    parser.add_argument("--media-file", help="합성 데이터 대신 사용할 미디어 파일 (--media 이름으로 등록)")
+    parser.add_argument("--audio-file", help="--media-file과 별도 스트림으로 제공할 오디오 파일 (영상+오디오 병합 측정)")
+    parser.add_argument("--sequential-streams", action="store_true", help="영상/오디오 포맷을 차례로 다운로드")
+    parser.add_argument("--single-connection-http", action="store_true",
+                        help="https 형식을 Range 분할 없이 연결 하나로 다운로드")
+    parser.add_argument("--network-benchmark", action="store_true",
+                        help="NetworkBenchmark.run_benchmark를 로컬 서버의 A/B 영상으로 실행")
+    parser.add_argument("--extraction-comparison", action="store_true",
+                        help="작업 시작 → 첫 바이트 시간을 단일 추출 경로와 이전 경로(추출 2회)로 비교 (--workers의 첫 값 사용)")
+    parser.add_argument("--backend-benchmark", action="store_true",
+                        help="NetworkBenchmark.run_backend_benchmark를 로컬 서버의 A/B 영상으로 실행 (--workers의 첫 값 사용)")
+    args = parser.parse_args()
+    args.workers = [int(value) for value in args.workers.split(",")]
+
+    # 측정 중 설정 파일은 바꾸지 않고, 기록/캐시 때문에 다운로드가 생략되지 않도록 함
+    config.override("download_archive_enabled", False)
+    config.override("info_cache_enabled", False)
+    config.override("speed_limit_mbps", 0)
+    config.override("adaptive_fragments", args.adaptive)
+    config.override("parallel_streams", not args.sequential_streams)
+    config.override("segmented_http", not args.single_connection_http)
+
+    server = LocalMediaServer(
+        latency_ms=args.latency_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+        total_bandwidth_mbps=args.total_bandwidth_mbps,
+        max_connections=args.max_connections
+    )
+    if args.media_file:
+        server.add_media(args.media, media_file=args.media_file, audio_file=args.audio_file)
+
+    with server:
+        if args.network_benchmark:
+            from src.core.network_benchmark import NetworkBenchmark
+            result = NetworkBenchmark.run_benchmark(media_server=server)
+            print(f"[Offline] 최적 워커 수: {result['optimal_workers']}개, "
+                  f"워커당 권장 최소 크기: {result['min_size_per_worker']}MB")
+            return 0
+
+        if args.backend_benchmark:
+            from src.core.network_benchmark import NetworkBenchmark
+            result = NetworkBenchmark.run_backend_benchmark(media_server=server, workers=args.workers[0])
+            for protocol, speeds in result['results'].items():
+                print(f"[Offline] {protocol}: "
+                      f"{', '.join(f'{name} {speed:.1f} Mbps' for name, speed in speeds.items())}")
+            print(f"[Offline] 선택된 백엔드: "
+                  f"{', '.join(f'{protocol}={name}' for protocol, name in result['backends'].items())}")
+            return 0
+
+        if args.extraction_comparison:
+            results = run_extraction_comparison(server, args)
+            single = statistics.median(results['single'])
+            double = statistics.median(results['double'])
+            print(f"\n[Offline] 첫 바이트까지 (중앙값, {args.runs}회, 지연 {args.latency_ms}ms): "
+                  f"단일 추출 {single:.3f}초, 추출 2회 {double:.3f}초 → 작업당 {double - single:.3f}초 단축")
+            return 0
+
+        results = run_downloads(server, args)
+
+    print(f"\n[Offline] 결과 ({args.protocol}, 영상 {args.media}, 지연 {args.latency_ms}ms, "
+          f"지터 {args.jitter_ms}ms, 연결당 {args.bandwidth_mbps} Mbps, seed {args.seed})")
+    for result in results:
+        spread = max(result['durations']) - min(result['durations'])
+        print(f"  워커 {result['workers']:>3}개: 중앙값 {result['median']:6.2f}초 (편차 {spread:.2f}초), "
+              f"{result['speed_mbps']:.1f} Mbps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""
+명령줄(CLI) 및 데몬 진입점
+
+PyQt6/qasync를 import하지 않으므로 GUI가 없는 Linux 서버나 스크립트에서 실행할 수 있습니다.
+
+사용 예:
+    python run_cli.py https://youtu.be/...             # URL 하나
+    python run_cli.py -f urls.txt                      # URL 목록 파일 (한 줄에 하나)
+    cat urls.txt | python run_cli.py -                 # 표준 입력 (한 줄씩 읽는 대로 대기열에 추가)
+    python run_cli.py --daemon                         # inbox 디렉토리 감시 (상시 실행)
+
+데몬 모드는 inbox 디렉토리(기본: 설정 디렉토리/inbox)에 놓인 *.txt 파일의 URL을
+대기열에 추가하고, 처리한 파일은 inbox/done으로 옮깁니다.
+"""
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+
+from src.core.config import config, Config
+from src.core.download_queue import DownloadQueue
+
+
+class CliRunner:
+    """대기열에 URL을 넣고 작업 결과를 모으는 CLI 실행기"""
+
+    def __init__(self, max_concurrent_downloads=None, show_progress=True):
+        self.queue = DownloadQueue(max_concurrent_downloads=max_concurrent_downloads)
+        self.show_progress = show_progress and sys.stderr.isatty()
+        self._lock = threading.Lock()
+        self.feed_futures = []
+        self.job_futures = []
+
+    def report(self, message):
+        """CLI 메시지 출력 (--quiet에서도 표시되도록 stderr 사용)"""
+        sys.stderr.write(message + "\n")
+        sys.stderr.flush()
+
+    def _on_status(self, message):
+        self.report(message)
+
+    def _on_progress(self, event):
+        """터미널이면 진행 상황을 한 줄에 갱신 (최대 10Hz로 호출됨)"""
+        if not self.show_progress:
+            return
+        if event['status'] == 'finished':
+            sys.stderr.write("\n")
+            return
+        line = f"[#{event['job_id']}] {event['percent']:5.1f}% | {event['downloaded_bytes'] / 1048576:.1f}"
+        if event['total_bytes']:
+            line += f"/{event['total_bytes'] / 1048576:.1f}"
+        line += "MiB"
+        if event['speed']:
+            line += f" | {event['speed'] / 1048576:.2f}MiB/s"
+        if event['eta'] is not None:
+            line += f" | ETA {int(event['eta'])}s"
+        sys.stderr.write("\r" + line.ljust(70))
+        sys.stderr.flush()
+
+    def _on_job(self, job):
+        with self._lock:
+            self.job_futures.append((job, job.future))
+
+    def add_url(self, url):
+        """URL을 대기열에 추가 (플레이리스트는 항목이 발견되는 대로 추가됨)"""
+        url = url.strip()
+        if not url or url.startswith('#'):
+            return
+        self.report(f"[CLI] 대기열 추가: {url}")
+        feed_future = self.queue.submit_url(
+            url,
+            status_callback=self._on_status,
+            on_job=self._on_job,
+            progress_event_callback=self._on_progress
+        )
+        with self._lock:
+            self.feed_futures.append((url, feed_future))
+
+    def wait(self):
+        """
+        추가한 URL의 확장과 모든 작업이 끝날 때까지 대기
+
+        Returns:
+            int: 실패한 URL/작업 수
+        """
+        failures = 0
+
+        # 확장이 모두 끝나야 작업 목록이 확정됨
+        with self._lock:
+            feed_futures = list(self.feed_futures)
+            self.feed_futures.clear()
+        for url, feed_future in feed_futures:
+            try:
+                feed_future.result()
+            except Exception as e:
+                failures += 1
+                self.report(f"[CLI] 주소 확인 실패: {url} ({e})")
+
+        with self._lock:
+            job_futures = list(self.job_futures)
+        for job, future in job_futures:
+            try:
+                future.result()
+            except Exception:
+                pass
+
+        return failures + self.reap()
+
+    def reap(self):
+        """
+        끝난 작업을 목록에서 제거하고 실패를 보고 (데몬 모드에서 목록이 계속 커지지 않도록)
+
+        Returns:
+            int: 이번에 확인한 실패 작업 수
+        """
+        with self._lock:
+            done = [(job, future) for job, future in self.job_futures if future.done()]
+            self.job_futures = [item for item in self.job_futures if not item[1].done()]
+
+        failures = 0
+        for job, future in done:
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                failures += 1
+                self.report(f"[CLI] 작업 #{job.job_id} 실패: {job.url} ({error})")
+        return failures
+
+    def shutdown(self, wait=True):
+        self.queue.shutdown(wait=wait)
+
+
+def run_batch(runner, urls, url_file):
+    """URL 인자/파일/표준 입력을 처리하고 모두 끝나면 종료 코드 반환"""
+    for url in urls:
+        if url == '-':
+            # 표준 입력은 한 줄씩 읽는 대로 바로 대기열에 추가
+            for line in sys.stdin:
+                runner.add_url(line)
+        else:
+            runner.add_url(url)
+
+    if url_file:
+        with open(url_file, "r", encoding="utf-8") as f:
+            for line in f:
+                runner.add_url(line)
+
+    failures = runner.wait()
+    runner.report(f"[CLI] 완료 (실패 {failures}건)")
+    return 1 if failures else 0
+
+
+def run_daemon(runner, inbox_dir, poll_interval):
+    """inbox 디렉토리를 감시하며 URL 목록 파일을 처리 (종료 신호까지 실행)"""
+    inbox_dir = Path(inbox_dir)
+    done_dir = inbox_dir / "done"
+    done_dir.mkdir(parents=True, exist_ok=True)
+
+    stop_event = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda signum, frame: stop_event.set())
+
+    runner.report(f"[Daemon] inbox 감시 시작: {inbox_dir} ({poll_interval}초 간격)")
+
+    while not stop_event.is_set():
+        for path in sorted(inbox_dir.glob("*.txt")):
+            # 다른 프로세스가 아직 쓰는 중일 수 있으므로 이름을 바꾼 뒤 읽음
+            processing = path.with_suffix(".processing")
+            try:
+                os.replace(path, processing)
+                with open(processing, "r", encoding="utf-8") as f:
+                    urls = f.read().splitlines()
+            except OSError as e:
+                runner.report(f"[Daemon] 파일 읽기 실패: {path.name} ({e})")
+                continue
+
+            runner.report(f"[Daemon] {path.name}: URL {len(urls)}개")
+            for url in urls:
+                runner.add_url(url)
+            os.replace(processing, done_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{path.name}")
+
+        runner.reap()
+        stop_event.wait(poll_interval)
+
+    runner.report("[Daemon] 종료 신호 수신 - 대기열 정리 중")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="video-downloader",
+        description="비디오 다운로더 (명령줄/데몬 모드, GUI 없음)"
+    )
+    parser.add_argument("urls", nargs="*", help="다운로드할 URL ('-'이면 표준 입력에서 한 줄씩 읽음)")
+    parser.add_argument("-f", "--file", dest="url_file", help="URL 목록 파일 (한 줄에 하나, #으로 시작하면 무시)")
+    parser.add_argument("-o", "--output", help="다운로드 경로 (기본: 설정값)")
+    parser.add_argument("-q", "--quality", choices=["Best", "2160p", "1440p", "1080p", "720p", "480p", "360p"],
+                        help="화질 (기본: 설정값)")
+    parser.add_argument("--format", dest="output_format", choices=["mp4", "mkv"], help="출력 포맷 (기본: 설정값)")
+    parser.add_argument("--embed-metadata", action="store_true", help="제목/업로더/챕터 등 메타데이터 삽입")
+    parser.add_argument("--embed-thumbnail", action="store_true", help="썸네일 삽입")
+    parser.add_argument("--embed-subs", action="store_true", help="자막 삽입")
+    parser.add_argument("--separate-postprocess", action="store_true",
+                        help="병합과 삽입을 FFmpeg 한 번으로 처리하지 않고 yt-dlp 후처리기를 차례로 실행")
+    parser.add_argument("-j", "--jobs", type=int, help="동시 다운로드 작업 수 (기본: 설정값)")
+    parser.add_argument("--adaptive-fragments", action="store_true",
+                        help="다운로드 중 처리량/429에 따라 프래그먼트 워커 수 자동 조절")
+    parser.add_argument("--sequential-streams", action="store_true",
+                        help="영상/오디오 포맷을 동시에 받지 않고 차례로 다운로드")
+    parser.add_argument("--single-connection-http", action="store_true",
+                        help="단일 파일(https) 포맷을 Range 분할 없이 연결 하나로 다운로드")
+    parser.add_argument("--quiet", action="store_true", help="상세 로그 숨김 (결과와 오류만 표시)")
+    parser.add_argument("--daemon", action="store_true", help="inbox 디렉토리를 감시하며 상시 실행")
+    parser.add_argument("--inbox", default=str(Config.get_config_dir() / "inbox"),
+                        help="데몬 모드 inbox 디렉토리 (기본: %(default)s)")
+    parser.add_argument("--poll-interval", type=float, default=5.0, help="데몬 모드 감시 간격 (초)")
+
+    args = parser.parse_args(argv)
+    if not args.daemon and not args.urls and not args.url_file:
+        parser.error("URL, -f 파일 또는 --daemon 중 하나를 지정하세요")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # 명령줄 옵션은 이번 실행에만 적용 (config.json은 변경하지 않음)
+    if args.output:
+        config.override("download_path", os.path.abspath(args.output))
+    if args.quality:
+        config.override("default_quality", args.quality)
+    if args.output_format:
+        config.override("output_format", args.output_format)
+    if args.embed_metadata:
+        config.override("embed_metadata", True)
+    if args.embed_thumbnail:
+        config.override("embed_thumbnail", True)
+    if args.embed_subs:
+        config.override("embed_subtitles", True)
+    if args.separate_postprocess:
+        config.override("single_pass_postprocess", False)
+    if args.adaptive_fragments:
+        config.override("adaptive_fragments", True)
+    if args.sequential_streams:
+        config.override("parallel_streams", False)
+    if args.single_connection_http:
+        config.override("segmented_http", False)
+
+    if args.quiet:
+        # 모듈 로그(print)는 stdout으로 나가므로 버림 - CLI 메시지는 stderr
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
+
+    runner = CliRunner(max_concurrent_downloads=args.jobs)
+    try:
+        if args.daemon:
+            exit_code = run_daemon(runner, args.inbox, args.poll_interval)
+        else:
+            exit_code = run_batch(runner, args.urls, args.url_file)
+    except KeyboardInterrupt:
+        runner.report("[CLI] 중단됨 - 진행 중인 작업 취소")
+        exit_code = 130
+    finally:
+        runner.shutdown(wait=True)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
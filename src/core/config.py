@@ -1,5 +1,11 @@
+import atexit
+import contextlib
+import copy
 import json
 import os
+import shutil
+import tempfile
+import threading
 from pathlib import Path
 
 class Config:
@@ -9,16 +15,41 @@ class Config:
         "default_quality": "Best", # Best, 2160p, 1440p, 1080p, 720p, 480p, 360p
         "output_format": "mp4", # mp4, mkv (최종 출력 포맷)
         "keep_original": False,
+        "embed_metadata": False,  # 제목/업로더/챕터 등 메타데이터 삽입
+        "embed_thumbnail": False,  # 썸네일 삽입 (mp4: 커버 이미지, mkv: 첨부 파일)
+        "embed_subtitles": False,  # 자막 삽입 (mp4는 mov_text로 변환)
+        "single_pass_postprocess": True,  # 병합과 삽입을 FFmpeg 한 번으로 처리 (False면 yt-dlp 후처리기를 차례로 실행)
 
         # 성능 옵션
         "concurrent_fragments": 8,  # 동시 다운로드 프래그먼트 수 (자동 설정됨)
         "speed_limit_mbps": 0,  # 속도 제한 (0 = 무제한, Mbps)
+        "max_concurrent_downloads": 3,  # 동시에 실행할 다운로드 작업 수
+        "connection_budget": 16,  # 전체 작업이 나누어 쓰는 최대 연결(프래그먼트) 수
+        "adaptive_fragments": False,  # 다운로드 중 처리량/429에 따라 프래그먼트 워커 수 자동 조절 (AIMD)
+        "parallel_streams": True,  # 영상+오디오 포맷을 연결 수를 나누어 동시에 다운로드
+        "segmented_http": True,  # 단일 파일(https) 포맷을 여러 Range 연결로 나누어 다운로드
+
+        # 전송 형식별 다운로드 백엔드 (native, aria2c, ffmpeg - 네트워크 벤치마크로 선택 가능)
+        "transfer_backends": {"https": "native", "m3u8": "native", "dash": "native"},
+        "aria2c_path": "",  # Empty means system path
+        "aria2c_connections": 16,  # aria2c 서버당 최대 연결 수 (-x)
+        "aria2c_split": 16,  # aria2c 파일 분할 수 (-s)
+        "aria2c_min_split_size_mb": 1,  # aria2c 분할 최소 크기 (-k, MB)
+        "ffmpeg_hls_multiple_connections": True,  # ffmpeg HLS 세그먼트를 여러 연결로 다운로드 (-http_multiple)
 
         # 네트워크 벤치마크 결과
         "benchmark_completed": False,  # 벤치마크 완료 여부
         "benchmark_optimal_workers": None,  # 벤치마크로 찾은 최적 워커 수
         "benchmark_min_size_per_worker": 100,  # 벤치마크로 찾은 워커당 최소 크기 (MB)
 
+        # 영상 정보 캐시 (재시도/재등록 시 추출 생략)
+        "info_cache_enabled": True,  # 캐시 사용 여부
+        "info_cache_ttl_minutes": 60,  # 캐시 유효 시간 (포맷 URL 만료 대비)
+        "info_cache_max_mb": 50,  # 캐시 최대 용량 (초과 시 오래된 항목부터 삭제)
+
+        # 다운로드 기록 (이미 받은 영상은 추출 없이 건너뜀)
+        "download_archive_enabled": True,
+
         # 쿠키 인증 설정 (YouTube Premium, 봇 검증 우회 등)
         "cookies_enabled": False,  # 쿠키 사용 여부
         "cookies_from_browser": "",  # 브라우저 이름 (chrome, firefox, edge, brave 등) - 비어있으면 비활성화
@@ -45,18 +76,46 @@ class Config:
 
     CONFIG_FILE = get_config_dir.__func__() / "config.json"
 
+    # set() 후 파일에 저장하기까지 기다리는 시간 (초) - 연속 변경을 한 번의 쓰기로 묶음
+    SAVE_DELAY = 1.0
+
     def __init__(self):
-        self.config = self.load_config()
-        self._apply_auto_settings_if_first_run()
+        # 설정 파일은 처음 사용할 때 읽음 (import 시점에 파일 읽기/AutoConfig 실행 방지)
+        self._config = None
+        self._overrides = {}  # 이번 실행에만 적용하고 저장하지 않는 값 (CLI 옵션 등)
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()  # 파일 쓰기 직렬화
+        self._dirty = False
+        self._save_timer = None
+        self._transaction_depth = 0
+
+    @property
+    def config(self):
+        """설정 dict (최초 접근 시 파일에서 읽고, 최초 실행이면 자동 설정 적용)"""
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = self.load_config()
+                    self._apply_auto_settings_if_first_run()
+        return self._config
 
     def load_config(self):
+        # 기본값 dict는 공유되므로 항상 복사본에 병합
+        loaded = copy.deepcopy(self.DEFAULT_CONFIG)
         if self.CONFIG_FILE.exists():
             try:
                 with open(self.CONFIG_FILE, "r", encoding="utf-8") as f:
-                    return {**self.DEFAULT_CONFIG, **json.load(f)}
-            except Exception:
-                return self.DEFAULT_CONFIG
-        return self.DEFAULT_CONFIG
+                    loaded.update(json.load(f))
+            except Exception as e:
+                # 손상된 파일은 덮어쓰기 전에 백업
+                backup = self.CONFIG_FILE.with_suffix(".json.bak")
+                print(f"[Config] 설정 파일 읽기 실패 (기본값 사용, 백업: {backup}): {e}")
+                try:
+                    shutil.copyfile(self.CONFIG_FILE, backup)
+                except OSError:
+                    pass
+        return loaded
 
     def _apply_auto_settings_if_first_run(self):
         """최초 실행 시 CPU 기반 자동 설정 적용"""
@@ -74,14 +133,107 @@ class Config:
                 print(f"[Config] 자동 설정 실패 (기본값 사용): {e}")
 
     def save_config(self):
-        with open(self.CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.config, f, indent=4)
+        """
+        설정 파일에 즉시 저장 (임시 파일에 쓴 뒤 교체하므로 쓰는 도중 종료되어도 기존 파일 유지)
+        """
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            data = json.dumps(self.config, indent=4)
+            self._dirty = False
+
+        with self._save_lock:
+            fd, temp_path = tempfile.mkstemp(prefix="config-", suffix=".tmp", dir=self.CONFIG_FILE.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.CONFIG_FILE)
+            except Exception:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+
+    def _schedule_save(self):
+        """변경 표시 후 SAVE_DELAY 뒤에 저장 (lock 보유 상태에서 호출)"""
+        self._dirty = True
+        if self._transaction_depth > 0:
+            return
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.SAVE_DELAY, self._save_if_dirty)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def _save_if_dirty(self):
+        if self._dirty:
+            try:
+                self.save_config()
+            except Exception as e:
+                print(f"[Config] 설정 저장 실패: {e}")
+
+    def flush(self):
+        """저장 대기 중인 변경을 바로 저장 (프로그램 종료 시 자동 호출)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        self._save_if_dirty()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        여러 값을 한 번에 변경 (블록이 끝난 뒤 한 번만 저장 예약)
+
+        with config.transaction():
+            config.set("default_quality", "1080p")
+            config.set("output_format", "mp4")
+
+        블록 동안 lock을 잡고 있지 않으므로 다른 스레드의 get/set은 막히지 않습니다
+        (그 사이의 변경도 블록이 끝난 뒤 함께 저장). 블록에는 set 호출만 두고
+        파일/네트워크 I/O나 오래 걸리는 작업은 넣지 마세요.
+        """
+        with self._lock:
+            self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0 and self._dirty:
+                    self._schedule_save()
 
     def get(self, key):
-        return self.config.get(key, self.DEFAULT_CONFIG.get(key))
+        """
+        값 조회
+
+        dict/list 값은 복사본을 반환합니다. 반환값을 고쳐도 설정(기본값 포함)은 바뀌지 않으므로
+        변경하려면 set으로 다시 지정해야 합니다 (같은 객체를 고쳐서 set하면 변경이 감지되지 않음).
+        """
+        if key in self._overrides:
+            value = self._overrides[key]
+        else:
+            value = self.config.get(key, self.DEFAULT_CONFIG.get(key))
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
 
     def set(self, key, value):
-        self.config[key] = value
-        self.save_config()
+        """값 변경 (메모리에 바로 반영, 파일 저장은 SAVE_DELAY 후 묶어서 수행)"""
+        if isinstance(value, (dict, list)):
+            # 호출자가 넘긴 객체를 나중에 고쳐도 저장된 값과 비교가 어긋나지 않도록 복사해 보관
+            value = copy.deepcopy(value)
+        with self._lock:
+            if self.config.get(key) == value and key in self.config:
+                return
+            self.config[key] = value
+            self._schedule_save()
+
+    def override(self, key, value):
+        """이번 실행에만 적용할 값 지정 (파일에 저장하지 않음)"""
+        self._overrides[key] = value
 
 config = Config()
+atexit.register(config.flush)
@@ -0,0 +1,101 @@
+"""
+다운로드 기록(아카이브) 모듈
+
+다운로드를 마친 영상의 (extractor, id)를 추가 전용 파일에 기록하고 메모리의 set으로
+조회합니다. 추출 전에 O(1)로 확인하므로 플레이리스트를 다시 동기화할 때
+이미 받은 영상은 flat 목록 조회와 해시 조회 비용만 듭니다.
+
+파일 형식은 yt-dlp --download-archive와 같으며("youtube p_lrljKEVQY" 한 줄에 하나),
+객체를 yt-dlp의 download_archive 옵션에 그대로 넘길 수 있습니다.
+"""
+import os
+import threading
+from .config import Config
+
+
+class DownloadArchive:
+    """추가 전용 파일 + 메모리 set 기반 다운로드 기록"""
+
+    FILENAME = "download-archive.txt"
+
+    # 파일을 읽을 때 한 번에 읽는 크기
+    READ_CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, path=None):
+        self.path = path or (Config.get_config_dir() / self.FILENAME)
+        self._ids = set()
+        self._offset = 0  # 지금까지 읽은 파일 위치 (이후 추가된 부분만 읽음)
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        """
+        파일에서 아직 읽지 않은 부분만 읽어 set에 반영 (lock 보유 상태에서 호출)
+
+        처음 조회할 때 전체를 읽고, 이후에는 다른 작업/프로세스가 추가한 줄만 읽습니다.
+        """
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+
+        if size < self._offset:
+            # 파일이 외부에서 잘리거나 교체됨 - 처음부터 다시 읽기
+            self._ids.clear()
+            self._offset = 0
+
+        if size == self._offset:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            pending = b''
+            while True:
+                chunk = f.read(self.READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                lines = (pending + chunk).split(b'\n')
+                pending = lines.pop()  # 마지막 조각은 아직 쓰는 중일 수 있음
+                for line in lines:
+                    line = line.strip()
+                    if line:
+                        self._ids.add(line.decode('utf-8', 'replace'))
+                self._offset += len(chunk)
+            # 줄바꿈으로 끝나지 않은 마지막 조각은 다음 동기화 때 다시 읽음
+            self._offset -= len(pending)
+
+    def __contains__(self, key):
+        if not key:
+            return False
+        with self._lock:
+            self._sync()
+            return key in self._ids
+
+    def __len__(self):
+        with self._lock:
+            self._sync()
+            return len(self._ids)
+
+    def add(self, key):
+        """
+        다운로드 완료 기록 추가 (yt-dlp가 다운로드 성공 시 호출)
+
+        Args:
+            key: "<extractor> <id>" 형식의 영상 키
+        """
+        if not key:
+            return
+        with self._lock:
+            self._sync()
+            if key in self._ids:
+                return
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(key + '\n')
+            self._ids.add(key)
+
+    @staticmethod
+    def is_enabled():
+        from .config import config
+        return bool(config.get("download_archive_enabled"))
+
+
+download_archive = DownloadArchive()
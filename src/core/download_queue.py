@@ -0,0 +1,266 @@
+"""
+다운로드 대기열 모듈
+
+여러 다운로드 작업을 동시에 실행하고, 전체 연결 예산(connection_budget)을
+실행 중인 작업들의 concurrent_fragment_downloads로 나누어 배분합니다.
+각 작업은 독립된 VideoDownloader 인스턴스를 사용합니다.
+"""
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from .config import config
+from .downloader import VideoDownloader
+from .playlist_expander import PlaylistExpander
+from .download_archive import download_archive
+from src.utils.video_id import make_video_key_from_info
+
+
+class DownloadJob:
+    """대기열의 다운로드 작업 하나"""
+
+    # 작업 상태
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    def __init__(self, job_id, url, progress_callback=None, status_callback=None, info=None,
+                 progress_event_callback=None, quality=None, output_format=None, ie_key=None):
+        self.job_id = job_id
+        self.url = url
+        self.info = info  # 이미 추출된 info dict (없으면 실행 시 추출)
+        self.ie_key = ie_key  # 플레이리스트 확장에서 알려진 extractor 키 (영상 키 계산용)
+        # 화질/출력 포맷은 추가 시점 값으로 고정 (실행 전에 설정이 바뀌어도 유지)
+        self.quality = quality or config.get("default_quality")
+        self.output_format = output_format or VideoDownloader.configured_output_format()
+        self.progress_callback = progress_callback
+        self.status_callback = status_callback
+        self.progress_event_callback = progress_event_callback
+
+        self.state = DownloadJob.QUEUED
+        self.downloader = VideoDownloader()
+        self.concurrent_fragments = None  # 작업 시작 시 배분된 연결 수
+        self.telemetry = {}  # 다운로드 중 선택된 값 (VideoDownloader.telemetry)
+        self.error = None
+        self.future = None  # concurrent.futures.Future (완료 대기용)
+
+    def cancel(self):
+        """작업 취소 (대기 중이면 실행하지 않고, 실행 중이면 다음 progress hook에서 중단)"""
+        if self.future is not None and self.future.cancel():
+            self.state = DownloadJob.CANCELLED
+        self.downloader.cancel()
+
+
+class DownloadQueue:
+    """
+    동시 다운로드 대기열
+
+    - 최대 max_concurrent_downloads개의 작업을 동시에 실행
+    - 작업 시작 시 connection_budget에서 실행 중인 작업이 쓰는 연결을 뺀 나머지를
+      아직 시작하지 않은 슬롯 수로 나누어 배분 (끝난 작업의 연결은 반납)
+      (단, 작업당 최대값은 벤치마크/설정의 concurrent_fragments)
+    """
+
+    def __init__(self, max_concurrent_downloads=None, connection_budget=None):
+        self.max_concurrent_downloads = max_concurrent_downloads or config.get("max_concurrent_downloads")
+        self.connection_budget = connection_budget or config.get("connection_budget")
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrent_downloads,
+            thread_name_prefix="download"
+        )
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)  # 대기 작업이 실행되기 시작하면 알림
+        self._job_ids = itertools.count(1)
+        self._shutdown = False
+        self.jobs = []  # 대기 중이거나 실행 중인 작업
+        self._allocated = {}  # 실행 중인 작업 id -> 배분된 연결 수
+
+        print(f"[Queue] 동시 다운로드: {self.max_concurrent_downloads}개, 전체 연결 예산: {self.connection_budget}개")
+
+    def submit(self, url, progress_callback=None, status_callback=None, info=None, progress_event_callback=None,
+               quality=None, output_format=None, ie_key=None):
+        """
+        다운로드 작업 추가
+
+        Args:
+            url: 다운로드할 URL
+            progress_callback: 진행률 콜백 (0-100)
+            status_callback: 상태 메시지 콜백
+            info: 이미 추출된 info dict (있으면 다운로드 시 추출 생략)
+            progress_event_callback: 진행 이벤트 콜백 (이벤트 dict에 'job_id' 추가, 작업별 최대 10Hz)
+            quality: 화질 (None이면 현재 설정값으로 고정)
+            output_format: 출력 포맷 (None이면 현재 설정값으로 고정)
+            ie_key: extractor 키 (알면 다운로드 기록/캐시 키 계산 시 전체 extractor 검사 생략)
+
+        Returns:
+            DownloadJob: 추가된 작업 (job.future로 완료 대기)
+        """
+        with self._lock:
+            job = DownloadJob(next(self._job_ids), url, progress_callback, status_callback, info,
+                              progress_event_callback, quality, output_format, ie_key)
+            self.jobs.append(job)
+            job.future = self._executor.submit(self._run_job, job)
+
+        # 끝난(또는 실행 전 취소된) 작업은 목록에서 제거 (긴 세션에서 목록이 계속 커지지 않도록)
+        job.future.add_done_callback(lambda _: self._remove_job(job))
+
+        print(f"[Queue] 작업 #{job.job_id} 추가 ({job.quality}/{job.output_format}): {url}")
+        return job
+
+    def submit_url(self, url, progress_callback=None, status_callback=None, on_job=None,
+                   progress_event_callback=None, quality=None, output_format=None):
+        """
+        URL을 확장하여 작업 추가 (플레이리스트/채널은 항목이 발견되는 대로 스트리밍)
+
+        대기 중인 작업이 동시 다운로드 수만큼 쌓이면 확장을 잠시 멈추므로
+        항목이 수천 개여도 메모리 사용량이 일정하게 유지됩니다.
+
+        Args:
+            url: 영상, 플레이리스트 또는 채널 URL
+            progress_callback: 진행률 콜백 (0-100)
+            status_callback: 상태 메시지 콜백
+            on_job: 작업이 추가될 때마다 호출되는 콜백 (DownloadJob 전달, 확장 스레드에서 호출)
+            progress_event_callback: 진행 이벤트 콜백 (submit 참고)
+            quality: 화질 (None이면 현재 설정값, 확장된 모든 항목에 같은 값 사용)
+            output_format: 출력 포맷 (None이면 현재 설정값, 확장된 모든 항목에 같은 값 사용)
+
+        Returns:
+            Future: 확장이 끝나면 추가된 작업 수로 완료
+        """
+        # 확장은 백그라운드에서 계속되므로 호출 시점의 화질/포맷을 고정
+        quality = quality or config.get("default_quality")
+        output_format = output_format or VideoDownloader.configured_output_format()
+
+        feed_future = Future()
+        feed_future.set_running_or_notify_cancel()
+
+        def feed():
+            count = 0
+            skipped = 0
+            archive_enabled = download_archive.is_enabled()
+            try:
+                expander = PlaylistExpander(VideoDownloader())
+                for item in expander.expand(url):
+                    # 이미 받은 항목은 작업을 만들지 않음 (flat 목록의 id로 조회)
+                    if archive_enabled and make_video_key_from_info(item) in download_archive:
+                        skipped += 1
+                        continue
+                    if not self._wait_for_pending_slot():
+                        break
+                    job = self.submit(item['url'], progress_callback, status_callback, item['info'],
+                                      progress_event_callback, quality, output_format, item['ie_key'])
+                    count += 1
+                    if on_job:
+                        on_job(job)
+                if skipped:
+                    print(f"[Queue] 다운로드 기록에 있는 {skipped}개 항목 건너뜀")
+                feed_future.set_result(count)
+            except Exception as e:
+                print(f"[Queue] URL 확장 실패: {e}")
+                feed_future.set_exception(e)
+
+        threading.Thread(target=feed, name="playlist-feed", daemon=True).start()
+        return feed_future
+
+    def _wait_for_pending_slot(self):
+        """대기 중인 작업이 동시 다운로드 수보다 적어질 때까지 대기 (종료 시 False)"""
+        with self._slot_freed:
+            while not self._shutdown and sum(1 for job in self.jobs if job.state == DownloadJob.QUEUED) >= self.max_concurrent_downloads:
+                self._slot_freed.wait()
+            return not self._shutdown
+
+    def _remove_job(self, job):
+        with self._slot_freed:
+            if job in self.jobs:
+                self.jobs.remove(job)
+            self._slot_freed.notify_all()
+
+    def _allocate_connections(self, job):
+        """
+        새로 시작하는 작업에 연결 수 배분 (self._lock을 잡은 상태에서 호출)
+
+        실행 중인 작업이 이미 받은 연결을 예산에서 빼고, 남은 연결을 아직 시작하지 않은
+        슬롯(이 작업 포함, 대기 중인 작업도 곧 슬롯을 차지)에 나눔.
+        예산이 모두 배분된 상태에서도 작업은 최소 1개의 연결을 받음
+        """
+        per_job_max = config.get("concurrent_fragments")
+        demand = sum(1 for other in self.jobs if other.state in (DownloadJob.QUEUED, DownloadJob.RUNNING))
+        slots = max(1, min(self.max_concurrent_downloads, demand))
+        waiting_slots = max(1, slots - len(self._allocated))
+        remaining = self.connection_budget - sum(self._allocated.values())
+        connections = max(1, min(per_job_max, remaining // waiting_slots))
+        self._allocated[job.job_id] = connections
+        return connections
+
+    def _run_job(self, job):
+        """작업 실행 (워커 스레드)"""
+        if job.state == DownloadJob.CANCELLED:
+            return
+
+        with self._slot_freed:
+            job.concurrent_fragments = self._allocate_connections(job)
+            job.state = DownloadJob.RUNNING
+            self._slot_freed.notify_all()
+        print(f"[Queue] 작업 #{job.job_id} 시작 (연결 {job.concurrent_fragments}개): {job.url}")
+
+        # 여러 작업의 상태 메시지가 섞이므로 작업 번호를 붙여 전달
+        status_callback = None
+        if job.status_callback:
+            status_callback = lambda message: job.status_callback(f"[#{job.job_id}] {message}")
+
+        progress_event_callback = None
+        if job.progress_event_callback:
+            progress_event_callback = lambda event: job.progress_event_callback(dict(event, job_id=job.job_id))
+
+        job.telemetry = job.downloader.telemetry
+        try:
+            job.downloader.download(
+                job.url,
+                job.progress_callback,
+                status_callback,
+                concurrent_fragments=job.concurrent_fragments,
+                info=job.info,
+                progress_event_callback=progress_event_callback,
+                quality=job.quality,
+                output_format=job.output_format,
+                ie_key=job.ie_key
+            )
+            job.info = None  # 완료된 작업의 info dict는 보관하지 않음
+            job.state = DownloadJob.COMPLETED
+            print(f"[Queue] 작업 #{job.job_id} 완료 "
+                  f"(후처리로 다시 쓴 데이터 {job.telemetry.get('bytes_rewritten', 0) / (1024 * 1024):.1f}MB)")
+            for report in job.telemetry.get("fragment_concurrency", []):
+                print(f"[Queue] 작업 #{job.job_id} 프래그먼트 워커: {report['initial']} → {report['final']}개 "
+                      f"(평균 {report['average']}, 429 {report['throttled']}회)")
+        except Exception as e:
+            job.error = e
+            job.state = DownloadJob.CANCELLED if job.downloader.cancel_requested else DownloadJob.FAILED
+            print(f"[Queue] 작업 #{job.job_id} 실패: {e}")
+            raise
+        finally:
+            # 끝난 작업의 연결은 다음 작업이 쓰도록 반납
+            with self._lock:
+                self._allocated.pop(job.job_id, None)
+
+    def active_count(self):
+        """실행 중이거나 대기 중인 작업 수"""
+        with self._lock:
+            return sum(1 for job in self.jobs if job.state in (DownloadJob.QUEUED, DownloadJob.RUNNING))
+
+    def cancel_all(self):
+        """모든 작업 취소"""
+        with self._lock:
+            jobs = list(self.jobs)
+        for job in jobs:
+            if job.state in (DownloadJob.QUEUED, DownloadJob.RUNNING):
+                job.cancel()
+
+    def shutdown(self, wait=True):
+        """대기열 종료 (남은 작업 취소)"""
+        with self._slot_freed:
+            self._shutdown = True
+            self._slot_freed.notify_all()
+        self.cancel_all()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -1,12 +1,33 @@
-import yt_dlp
+import math
 import os
+import time
+import threading
 from .config import config, Config
 from .ffmpeg_installer import FFmpegInstaller
+from .info_cache import info_cache
+from .download_archive import download_archive
+from .ydl_pool import ydl_pool
+from .progress import ProgressCoalescer, make_progress_event
+from .transfer_backends import TransferBackends
+from src.utils.video_id import make_video_key, make_video_key_from_info
 
 class VideoDownloader:
+    # FFmpeg 확인/설치는 프로세스 전체에서 1회만 수행 (동시 작업 간 공유)
+    ffmpeg_ensured = False
+    _ffmpeg_lock = threading.Lock()
+
+    # 출력 컨테이너별 포맷 정렬 (yt-dlp format_sort)
+    # 해상도/프레임레이트/HDR이 같으면 컨테이너에 그대로 넣을 수 있는 스트림을 우선해 병합이 스트림 복사로 끝나도록 함
+    # (mp4: mp4 영상(H.264/AV1/HEVC) + m4a 오디오(AAC), mkv는 모든 코덱을 담을 수 있으므로 yt-dlp 기본 순서)
+    CONTAINER_FORMAT_SORT = {
+        'mp4': ['res', 'fps', 'hdr:12', 'ext:mp4:m4a'],
+        'mkv': [],
+    }
+
     def __init__(self):
         self.cancel_requested = False
-        self.ffmpeg_ensured = False
+        self.info_from_cache = False  # 마지막 get_video_info 결과가 캐시에서 왔는지 여부
+        self.telemetry = {}  # 마지막 다운로드에서 선택된 값 (작업 telemetry로 보고)
 
         # yt-dlp 작업 디렉토리를 %APPDATA%로 제한
         self.yt_dlp_cache_dir = Config.get_config_dir() / "yt-dlp-cache"
@@ -15,6 +36,12 @@ class VideoDownloader:
         self.yt_dlp_temp_dir = Config.get_config_dir() / "temp"
         self.yt_dlp_temp_dir.mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def configured_output_format():
+        """설정의 출력 포맷 (이전 설정 키 마이그레이션 포함, ts는 더 이상 지원하지 않으므로 mp4)"""
+        output_format = config.get("output_format") or config.get("preferred_format") or config.get("default_format") or "mp4"
+        return "mp4" if output_format == "ts" else output_format
+
     def _build_format_selector(self, quality):
         """
         포맷 선택 로직 - 지정 화질의 최고 품질을 다운로드
@@ -36,6 +63,21 @@ class VideoDownloader:
         print(f"[Downloader] 포맷 선택자: {format_str}")
         return format_str
 
+    def _build_format_sort(self, output_format):
+        """
+        출력 컨테이너에 맞는 포맷 정렬 순서
+
+        Args:
+            output_format: 출력 포맷 (mp4, mkv)
+
+        Returns:
+            list: yt-dlp format_sort (비어 있으면 yt-dlp 기본 순서)
+        """
+        format_sort = self.CONTAINER_FORMAT_SORT.get(output_format, [])
+        if format_sort:
+            print(f"[Downloader] 포맷 정렬: {','.join(format_sort)} ({output_format}에 그대로 병합할 수 있는 스트림 우선)")
+        return format_sort
+
     def _apply_cookie_settings(self, ydl_opts):
         """
         쿠키 설정을 yt-dlp 옵션에 적용
@@ -62,34 +104,174 @@ class VideoDownloader:
 
         print("[Downloader] 쿠키 활성화되어 있으나 유효한 설정이 없습니다")
 
-    def get_video_info(self, url):
+    @staticmethod
+    def _estimate_format_size(fmt, duration):
+        """포맷 하나의 예상 크기 (filesize → filesize_approx → tbr × 길이 순서, 알 수 없으면 0)"""
+        size = fmt.get('filesize') or fmt.get('filesize_approx')
+        if not size and fmt.get('tbr') and duration:
+            size = fmt['tbr'] * 1000 / 8 * duration  # tbr: kbps
+        return size or 0
+
+    @staticmethod
+    def _select_requested_formats(ydl, info):
         """
-        영상 정보 추출
-        모든 작업을 %APPDATA%/VideoDownloader 내부로 제한하여 권한 문제 방지
+        다운로드될 포맷 목록 (yt-dlp와 같은 포맷 선택자로 미리 선택)
+
+        Returns:
+            list: bestvideo+bestaudio처럼 여러 포맷을 받으면 각 포맷, 아니면 포맷 1개 (실패 시 빈 목록)
         """
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'extract_flat': False,  # Full extraction for detailed info
+        formats = info.get('formats')
+        if not formats:
+            return [info]
 
-            # 캐시 및 임시 파일 경로를 %APPDATA%로 제한
-            'cachedir': str(self.yt_dlp_cache_dir),
-            'paths': {'temp': str(self.yt_dlp_temp_dir)},
+        try:
+            selected = ydl._select_formats(formats, ydl.format_selector)
+        except Exception as e:
+            print(f"[Downloader] 포맷 미리 선택 실패 (크기 추정 생략): {e}")
+            return []
+        if not selected:
+            return []
+        return selected[0].get('requested_formats') or [selected[0]]
 
-            # 네트워크 타임아웃 설정
-            'socket_timeout': 30,
+    def _estimate_download_size(self, ydl, info):
+        """
+        다운로드될 포맷의 예상 크기 (바이트, 여러 포맷을 받는 경우 합계)
+
+        Returns:
+            int: 예상 크기 (알 수 없으면 0)
+        """
+        duration = info.get('duration')
+        requested = self._select_requested_formats(ydl, info)
+        return int(sum(self._estimate_format_size(fmt, duration) for fmt in requested))
+
+    def _plan_parallel_streams(self, ydl, info, workers, budget):
+        """
+        영상/오디오 동시 다운로드 시 스트림별 연결 수
+
+        작업의 연결 수를 스트림의 예상 크기에 비례해 나눕니다 (스트림마다 최소 1개,
+        크기를 모르면 균등 분배). 가장 큰 스트림(보통 영상)이 나머지를 모두 사용합니다.
+
+        Args:
+            ydl: 다운로드에 사용할 YoutubeDL
+            info: 추출된 영상 정보
+            workers: 이 작업에 계획된 병렬 프래그먼트 수
+            budget: 이 작업이 쓸 수 있는 최대 연결 수 (적응형 모드의 스트림별 최대값 계산)
+
+        Returns:
+            dict: {format_id: {'workers': int, 'maximum': int}} (포맷이 1개뿐이면 None)
+        """
+        requested = self._select_requested_formats(ydl, info)
+        if len(requested) < 2:
+            return None
+
+        duration = info.get('duration')
+        sizes = [self._estimate_format_size(fmt, duration) for fmt in requested]
+        if not all(sizes):
+            sizes = [1] * len(requested)
+        largest = sizes.index(max(sizes))
+
+        def split(total):
+            shares = [max(1, round(total * size / sum(sizes))) for size in sizes]
+            shares[largest] = max(1, total - (sum(shares) - shares[largest]))
+            return shares
+
+        budgets = {
+            fmt['format_id']: {'workers': stream_workers, 'maximum': stream_maximum}
+            for fmt, stream_workers, stream_maximum in zip(requested, split(workers), split(budget))
         }
+        print("[Downloader] 영상/오디오 동시 다운로드: " + ", ".join(
+            f"{format_id} 워커 {plan['workers']}개" for format_id, plan in budgets.items()))
+        return budgets
 
-        # 쿠키 설정 추가
-        self._apply_cookie_settings(ydl_opts)
+    def _plan_concurrent_fragments(self, ydl, info, budget):
+        """
+        다운로드 크기에 맞춘 병렬 프래그먼트 수
+
+        벤치마크로 구한 워커당 최소 크기(benchmark_min_size_per_worker)를 기준으로
+        ceil(예상 크기 / 워커당 최소 크기)개를 사용하되 1 ~ budget 범위로 제한합니다.
+        작은 영상은 적은 연결로, 큰 영상은 예산 전체로 다운로드합니다.
+
+        Args:
+            ydl: 다운로드에 사용할 YoutubeDL (포맷 선택자 사용)
+            info: 추출된 영상 정보
+            budget: 이 작업이 쓸 수 있는 최대 연결 수
+
+        Returns:
+            int: 사용할 병렬 프래그먼트 수
+        """
+        min_size_mb = config.get("benchmark_min_size_per_worker")
+        if not min_size_mb or budget <= 1:
+            return budget
+
+        size = self._estimate_download_size(ydl, info)
+        if not size:
+            print(f"[Downloader] 예상 크기를 알 수 없어 최대 {budget}개 워커 사용")
+            return budget
+
+        workers = max(1, min(budget, math.ceil(size / (min_size_mb * 1024 * 1024))))
+        print(f"[Downloader] 예상 크기 {size / (1024 * 1024):.1f}MB → 병렬 다운로드 {workers}개 워커 "
+              f"(워커당 최소 {min_size_mb}MB, 최대 {budget}개)")
+        return workers
+
+    def get_video_info(self, url, ydl=None, ie_key=None):
+        """
+        영상 정보 추출
+        모든 작업을 %APPDATA%/VideoDownloader 내부로 제한하여 권한 문제 방지
+
+        Args:
+            url: 영상 URL
+            ydl: 이미 생성된 YoutubeDL 인스턴스 (다운로드 옵션 그대로 추출하여
+                 결과 info dict를 process_ie_result로 재사용할 때 전달)
+            ie_key: extractor 키 (알면 캐시 키 계산 시 해당 extractor만 확인)
+        """
+        # 캐시 확인 (재시도/재등록 시 추출 생략)
+        self.info_from_cache = False
+        cache_key = make_video_key(url, ie_key) if info_cache.is_enabled() else None
+        if cache_key:
+            cached_info = info_cache.get(cache_key)
+            if cached_info is not None:
+                self.info_from_cache = True
+                print(f"[InfoCache] 캐시 적중: {cache_key} (적중 {info_cache.hits} / 미스 {info_cache.misses})")
+                return cached_info
+            print(f"[InfoCache] 캐시 미스: {cache_key} (적중 {info_cache.hits} / 미스 {info_cache.misses})")
 
         try:
             print(f"[Downloader] 영상 정보 추출 시작...")
             print(f"[Downloader] 캐시 디렉토리: {self.yt_dlp_cache_dir}")
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            if ydl is not None:
                 info = ydl.extract_info(url, download=False)
-                print(f"[Downloader] 영상 정보 추출 완료")
-                return info
+            else:
+                ydl_opts = {
+                    'quiet': True,
+                    'no_warnings': True,
+                    'extract_flat': False,  # Full extraction for detailed info
+
+                    # 캐시 및 임시 파일 경로를 %APPDATA%로 제한
+                    'cachedir': str(self.yt_dlp_cache_dir),
+                    'paths': {'temp': str(self.yt_dlp_temp_dir)},
+
+                    # 네트워크 타임아웃 설정
+                    'socket_timeout': 30,
+                }
+
+                # 쿠키 설정 추가
+                self._apply_cookie_settings(ydl_opts)
+
+                with ydl_pool.acquire(ydl_opts) as pooled_ydl:
+                    info = pooled_ydl.extract_info(url, download=False)
+
+            if info is None:
+                raise Exception("영상 정보를 가져올 수 없습니다")
+
+            print(f"[Downloader] 영상 정보 추출 완료")
+
+            # 단일 영상만 캐시 (플레이리스트, 라이브 제외)
+            # 포맷 선택 결과(requested_formats 등)는 제거하여 재처리 시 다시 선택되도록 함
+            if cache_key and info.get('_type', 'video') == 'video' and not info.get('is_live'):
+                import yt_dlp
+                info_cache.put(cache_key, yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=True))
+
+            return info
         except Exception as e:
             print(f"[ERROR] 영상 정보 추출 실패: {e}")
             raise e
@@ -174,35 +356,67 @@ class VideoDownloader:
         if status_callback:
             status_callback("영상 정보 확인 완료")
 
-    def download(self, url, progress_callback=None, status_callback=None):
-        self.cancel_requested = False
-
-        # FFmpeg 자동 설치 확인 (최초 1회만)
-        if not self.ffmpeg_ensured:
-            try:
-                if status_callback:
-                    status_callback("FFmpeg 확인 중...")
-
-                ffmpeg_path = FFmpegInstaller.ensure_ffmpeg(
-                    progress_callback=lambda p: progress_callback(p * 0.1) if progress_callback else None
-                )
-
-                if status_callback:
-                    status_callback("FFmpeg 확인 완료")
+    def download(self, url, progress_callback=None, status_callback=None, concurrent_fragments=None, info=None,
+                 progress_event_callback=None, quality=None, output_format=None, fixed_workers=False,
+                 ie_key=None):
+        """
+        영상 다운로드
 
-                self.ffmpeg_ensured = True
-            except Exception as e:
-                print(f"[FFmpeg] 자동 설치 실패: {e}")
+        Args:
+            url: 영상 URL
+            progress_callback: 진행률 콜백 (0-100)
+            status_callback: 상태 메시지 콜백
+            concurrent_fragments: 병렬 프래그먼트 수 (None이면 설정값 사용,
+                                  다운로드 대기열이 연결 예산을 나누어 지정)
+            info: 이미 추출된 info dict (플레이리스트 확장 시 단일 영상 결과 재사용, None이면 추출)
+            progress_event_callback: 진행 이벤트 콜백 (make_progress_event 형식의 dict, 최대 10Hz)
+                                     지정하면 다운로드 중 상태 메시지는 status_callback으로 보내지 않음
+            quality: 화질 (None이면 설정값, 다운로드 대기열은 작업 추가 시점 값을 지정)
+            output_format: 출력 포맷 (None이면 설정값)
+            fixed_workers: True이면 concurrent_fragments를 예상 크기로 줄이지 않고 그대로 사용
+                           (워커 수별 측정 등 호출자가 워커 수를 정하는 경우)
+            ie_key: extractor 키 (플레이리스트 항목처럼 알고 있으면 영상 키 계산 시 전체 extractor 검사 생략)
+        """
+        self.cancel_requested = False
+        self.info_from_cache = False
+        self.skipped = False  # 다운로드 기록에 있어 건너뛰었는지 여부
+        self.telemetry.clear()
+
+        # 다운로드 기록 확인 (추출 전에 해시 조회만으로 판단)
+        archive_enabled = download_archive.is_enabled()
+        if archive_enabled:
+            archive_key = make_video_key_from_info(info) if info else make_video_key(url, ie_key)
+            if archive_key in download_archive:
+                self.skipped = True
+                print(f"[Archive] 이미 다운로드한 영상이므로 건너뜀: {archive_key}")
                 if status_callback:
-                    status_callback(f"FFmpeg 설치 실패: {e}")
-                # FFmpeg 없이도 일부 다운로드는 가능하므로 계속 진행
+                    status_callback("이미 다운로드한 영상입니다 (건너뜀)")
+                return
+
+        # FFmpeg 자동 설치 확인 (최초 1회만, 동시 작업은 먼저 시작한 작업의 설치를 대기)
+        with VideoDownloader._ffmpeg_lock:
+            if not VideoDownloader.ffmpeg_ensured:
+                try:
+                    if status_callback:
+                        status_callback("FFmpeg 확인 중...")
+
+                    ffmpeg_path = FFmpegInstaller.ensure_ffmpeg(
+                        progress_callback=lambda p: progress_callback(p * 0.1) if progress_callback else None
+                    )
+
+                    if status_callback:
+                        status_callback("FFmpeg 확인 완료")
+
+                    VideoDownloader.ffmpeg_ensured = True
+                except Exception as e:
+                    print(f"[FFmpeg] 자동 설치 실패: {e}")
+                    if status_callback:
+                        status_callback(f"FFmpeg 설치 실패: {e}")
+                    # FFmpeg 없이도 일부 다운로드는 가능하므로 계속 진행
 
         output_path = config.get("download_path")
-        quality = config.get("default_quality")
-        output_format = config.get("output_format") or config.get("preferred_format") or config.get("default_format") or "mp4"
-        # ts는 더 이상 지원하지 않으므로 mp4로 변환
-        if output_format == "ts":
-            output_format = "mp4"
+        quality = quality or config.get("default_quality")
+        output_format = output_format or self.configured_output_format()
         ffmpeg_path = config.get("ffmpeg_path")
 
         print(f"[Downloader] URL: {url}")
@@ -212,24 +426,14 @@ class VideoDownloader:
         # 포맷 선택 로직 - 지정 화질의 최고 품질 다운로드
         format_str = self._build_format_selector(quality)
 
-        # 영상 정보 추출 및 출력
-        if status_callback:
-            status_callback("영상 정보 확인 중...")
-
-        try:
-            info = self.get_video_info(url)
-            self._print_video_info(info, quality, output_format, status_callback)
-        except Exception as e:
-            print(f"[Downloader] 영상 정보 확인 실패: {e}")
-            if status_callback:
-                status_callback(f"영상 정보 확인 실패 (다운로드는 계속 진행)")
-
-        # 병렬 다운로드 설정 (벤치마크로 결정된 값 사용)
-        concurrent_fragments = config.get("concurrent_fragments")
+        # 병렬 다운로드 설정 (대기열 배분값 또는 벤치마크로 결정된 값 사용)
+        if concurrent_fragments is None:
+            concurrent_fragments = config.get("concurrent_fragments")
 
         speed_limit_mbps = config.get("speed_limit_mbps")
 
-        print(f"[Downloader] 병렬 다운로드: {concurrent_fragments}개 워커")
+        if not fixed_workers:
+            print(f"[Downloader] 병렬 다운로드: 최대 {concurrent_fragments}개 워커 (예상 크기에 따라 조정)")
         print(f"[Downloader] 참고: 청크 크기, 버퍼 등은 yt-dlp가 자동으로 최적화합니다")
 
         # 속도 제한 계산 (Mbps -> bytes/s)
@@ -239,11 +443,21 @@ class VideoDownloader:
         else:
             print(f"[Downloader] 속도 제한: 없음 (최대 속도)")
 
+        # 후처리 전 파일 상태 (후처리기 이름 → (파일 식별 정보, 시작 시각))
+        file_states = {}
+
+        # hook은 조각마다 호출되므로 워커 스레드에서 모아 일정 주기로만 전달
+        coalescer = ProgressCoalescer(
+            lambda event: self._deliver_progress(event, progress_callback, status_callback, progress_event_callback)
+        )
+
         ydl_opts = {
             'format': format_str,
             'outtmpl': os.path.join(output_path, '%(title)s.%(ext)s'),
             'merge_output_format': output_format,  # FFmpeg로 remux하여 출력 포맷 변환
-            'progress_hooks': [lambda d: self._progress_hook(d, progress_callback, status_callback)],
+            'format_sort': self._build_format_sort(output_format),
+            'progress_hooks': [lambda d: self._progress_hook(d, coalescer)],
+            'postprocessor_hooks': [lambda d: self._postprocessor_hook(d, file_states)],
             'quiet': True,
             'no_warnings': True,
 
@@ -254,6 +468,9 @@ class VideoDownloader:
             # 병렬 다운로드 설정 (CPU 기반 자동 설정)
             'concurrent_fragment_downloads': concurrent_fragments,
 
+            # 단일 파일(https) 포맷도 같은 연결 수로 Range 분할 다운로드 (SegmentedHttpFD)
+            'segmented_http': config.get("segmented_http"),
+
             # 재시도 설정
             'retries': 10,
             'fragment_retries': 10,
@@ -273,43 +490,221 @@ class VideoDownloader:
         if ffmpeg_path:
             ydl_opts['ffmpeg_location'] = ffmpeg_path
 
+        # 다운로드 성공 시 yt-dlp가 기록 추가 (yt-dlp 아카이브와 같은 형식)
+        if archive_enabled:
+            ydl_opts['download_archive'] = download_archive
+
+        # 메타데이터/썸네일/자막 삽입
+        self._apply_postprocess_settings(ydl_opts)
+
+        # 전송 형식별 백엔드 (aria2c/ffmpeg를 고른 형식만 yt-dlp 외부 다운로더로 전달)
+        backends = TransferBackends.apply(ydl_opts, config.get("transfer_backends"))
+        if any(name != TransferBackends.DEFAULT for name in backends.values()):
+            print(f"[Downloader] 전송 백엔드: {', '.join(f'{protocol}={name}' for protocol, name in backends.items())}")
+        self.telemetry['transfer_backends'] = backends
+
         # 쿠키 설정 추가
         self._apply_cookie_settings(ydl_opts)
 
         print(f"[Downloader] yt-dlp 임시 파일 디렉토리: {self.yt_dlp_temp_dir}")
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            # 미리 생성된 YoutubeDL 재사용 (쿠키, keep-alive 연결 유지)
+            with ydl_pool.acquire(ydl_opts) as ydl:
+                # 영상 정보 추출 (1회)
+                # ydl.download([url])은 추출을 처음부터 다시 수행하므로(플레이어 페이지/API 요청,
+                # 서명 해독, 브라우저 쿠키 복호화 반복) 추출된 info dict를 그대로 다운로드에 재사용
+                if status_callback:
+                    status_callback("영상 정보 확인 중...")
+
+                extract_start = time.time()
+                if info is None:
+                    info = self.get_video_info(url, ydl=ydl, ie_key=ie_key)
+                else:
+                    print("[Downloader] 미리 추출된 영상 정보 사용 (추출 생략)")
+                extract_duration = time.time() - extract_start
+
+                try:
+                    self._print_video_info(info, quality, output_format, status_callback)
+                except Exception as e:
+                    print(f"[Downloader] 영상 정보 출력 실패: {e}")
+
+                # 예상 크기에 맞춰 병렬 프래그먼트 수 조정 (yt-dlp는 다운로드 시점에 params에서 읽음,
+                # 풀은 다음 작업에 인스턴스를 빌려줄 때 이 값을 다시 설정함)
+                if fixed_workers:
+                    planned_fragments = concurrent_fragments
+                    print(f"[Downloader] 병렬 다운로드: {planned_fragments}개 워커 (지정값 그대로 사용)")
+                else:
+                    planned_fragments = self._plan_concurrent_fragments(ydl, info, concurrent_fragments)
+                ydl.params['concurrent_fragment_downloads'] = planned_fragments
+                self.telemetry['planned_fragments'] = planned_fragments
+
+                # 영상+오디오를 받는 경우 연결 수를 나누어 동시에 다운로드 (진행률은 합쳐서 전달)
+                if config.get("parallel_streams"):
+                    stream_budgets = self._plan_parallel_streams(ydl, info, planned_fragments, concurrent_fragments)
+                    if stream_budgets:
+                        ydl.params['parallel_streams'] = stream_budgets
+                        coalescer.combine_streams = True
+                        self.telemetry['parallel_streams'] = stream_budgets
+
+                # 적응형 모드: 계획값에서 시작해 예산(concurrent_fragments) 안에서 다운로드 중 조절
+                # (HLS/DASH 프래그먼트 다운로드에만 적용, 결과는 스트림마다 telemetry에 추가)
+                if config.get("adaptive_fragments") and concurrent_fragments > 1:
+                    reports = self.telemetry.setdefault('fragment_concurrency', [])
+                    ydl.params['adaptive_fragments'] = {
+                        'initial': planned_fragments,
+                        'maximum': concurrent_fragments,
+                        'on_report': reports.append,
+                    }
+
+                # 추출된 info dict로 바로 다운로드 (재추출 없음)
+                download_start = time.time()
+                ydl.process_ie_result(info, download=True)
+                download_duration = time.time() - download_start
+
+                print(f"[Downloader] 소요 시간: 정보 추출 {extract_duration:.2f}초 (1회), 다운로드 및 처리 {download_duration:.2f}초")
+                self._report_phases(extract_duration, download_duration)
+                self._report_rewrites()
         except Exception as e:
+            # 캐시된 정보로 실패한 경우 (포맷 URL 만료 등) 다음 재시도는 새로 추출
+            if self.info_from_cache:
+                info_cache.invalidate(make_video_key(url, ie_key))
+                print("[InfoCache] 캐시된 정보로 다운로드 실패 - 캐시 항목 삭제")
             if status_callback:
                 status_callback(f"Error: {str(e)}")
             raise e
+        finally:
+            coalescer.flush()
+            print(f"[Downloader] 진행 이벤트: hook {coalescer.received}회 → 전달 {coalescer.emitted}회")
 
-    def _progress_hook(self, d, progress_callback, status_callback):
+    def _apply_postprocess_settings(self, ydl_opts):
+        """
+        메타데이터/썸네일/자막 삽입 설정을 yt-dlp 옵션에 적용
+
+        single_pass_postprocess이면 병합과 삽입을 ExtendedYoutubeDL의 SinglePassPP 하나로 실행하고
+        (출력 파일을 한 번만 씀), 아니면 yt-dlp 후처리기를 차례로 실행합니다 (작업마다 파일 전체를 다시 씀).
+
+        Args:
+            ydl_opts: yt-dlp 옵션 dict (직접 수정)
+        """
+        embeds = {
+            'metadata': config.get("embed_metadata"),
+            'thumbnail': config.get("embed_thumbnail"),
+            'subtitles': config.get("embed_subtitles"),
+        }
+        if not any(embeds.values()):
+            return
+
+        # 썸네일/자막은 삽입용으로만 받음 (삽입 후 삭제)
+        if embeds['thumbnail']:
+            ydl_opts['writethumbnail'] = True
+        if embeds['subtitles']:
+            ydl_opts['writesubtitles'] = True
+            ydl_opts['subtitleslangs'] = ['all', '-live_chat']
+
+        operations = [name for name, enabled in embeds.items() if enabled]
+        if config.get("single_pass_postprocess"):
+            reports = self.telemetry.setdefault('single_pass', [])
+            ydl_opts['single_pass_postprocess'] = dict(embeds, on_report=reports.append)
+            print(f"[Downloader] 후처리: {', '.join(operations)} 삽입 (병합과 함께 FFmpeg 1회)")
+        else:
+            postprocessors = []
+            if embeds['metadata']:
+                postprocessors.append({'key': 'FFmpegMetadata', 'add_metadata': True, 'add_chapters': True})
+            if embeds['subtitles']:
+                postprocessors.append({'key': 'FFmpegEmbedSubtitle', 'already_have_subtitle': False})
+            if embeds['thumbnail']:
+                postprocessors.append({'key': 'EmbedThumbnail', 'already_have_thumbnail': False})
+            ydl_opts['postprocessors'] = postprocessors
+            print(f"[Downloader] 후처리: {', '.join(operations)} 삽입 (후처리기별 실행)")
+
+    @staticmethod
+    def _file_identity(path):
+        """파일 식별 정보 (장치, inode, 수정 시각, 크기) - 없으면 None"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _postprocessor_hook(self, d, file_states):
+        """
+        후처리기가 파일을 다시 썼는지와 실행 시간 기록 (telemetry['rewrites'], telemetry['postprocess_phases'])
+
+        후처리 전후 파일 식별 정보가 다르면(병합/remux로 새 파일 생성, 다른 드라이브로 복사)
+        결과 파일 크기만큼 다시 쓴 것으로 봅니다. 같은 드라이브 안에서 이름만 바뀐 경우
+        (단일 파일 이동, 아무것도 하지 않은 후처리기)는 식별 정보가 같으므로 제외됩니다.
+        """
+        path = d.get('info_dict', {}).get('filepath')
+        name = d.get('postprocessor')
+        if not path:
+            return
+
+        # yt-dlp는 옵션(postprocessors)으로 만든 후처리기에 hook을 두 번 등록하므로 중복 이벤트는 무시
+        if d['status'] == 'started':
+            file_states.setdefault(name, (self._file_identity(path), time.time()))
+        elif d['status'] == 'finished' and name in file_states:
+            before, started = file_states.pop(name)
+            after = self._file_identity(path)
+            if after is not None and after != before:
+                self.telemetry.setdefault('rewrites', []).append({'postprocessor': name, 'bytes': after[3]})
+            self.telemetry.setdefault('postprocess_phases', []).append(
+                {'postprocessor': name, 'seconds': time.time() - started})
+
+    def _report_phases(self, extract_duration, download_duration):
+        """
+        단계별 소요 시간을 telemetry['phases']에 기록하고 로그 출력
+
+        다운로드 시간은 process_ie_result 전체 시간에서 후처리기 실행 시간을 뺀 값입니다.
+        """
+        postprocess = self.telemetry.get('postprocess_phases', [])
+        postprocess_duration = sum(phase['seconds'] for phase in postprocess)
+        self.telemetry['phases'] = {
+            'extract': extract_duration,
+            'download': max(0.0, download_duration - postprocess_duration),
+            'postprocess': postprocess_duration,
+        }
+        details = ", ".join(f"{phase['postprocessor']} {phase['seconds']:.2f}초" for phase in postprocess)
+        print(f"[Downloader] 단계별 시간: 추출 {extract_duration:.2f}초, "
+              f"다운로드 {self.telemetry['phases']['download']:.2f}초, "
+              f"후처리 {postprocess_duration:.2f}초" + (f" ({details})" if details else ""))
+
+    def _report_rewrites(self):
+        """작업에서 후처리로 다시 쓴 바이트 합계를 telemetry에 기록하고 로그 출력"""
+        rewrites = self.telemetry.get('rewrites', [])
+        total = sum(rewrite['bytes'] for rewrite in rewrites)
+        self.telemetry['bytes_rewritten'] = total
+        if rewrites:
+            details = ", ".join(f"{rewrite['postprocessor']} {rewrite['bytes'] / (1024 * 1024):.1f}MB" for rewrite in rewrites)
+            print(f"[Downloader] 후처리로 다시 쓴 데이터: {total / (1024 * 1024):.1f}MB ({details})")
+        else:
+            print("[Downloader] 후처리로 다시 쓴 데이터: 0MB (받은 파일을 그대로 이동)")
+
+    def _progress_hook(self, d, coalescer):
         if self.cancel_requested:
-            raise yt_dlp.utils.DownloadError("사용자에 의해 다운로드가 취소되었습니다.")
-
-        if d['status'] == 'downloading':
-            p = d.get('_percent_str', '0%').replace('%', '')
-            try:
-                percent = float(p)
-            except:
-                percent = 0
-            
-            if progress_callback:
-                progress_callback(percent)
-            
-            if status_callback:
-                speed = d.get('_speed_str', 'N/A')
-                eta = d.get('_eta_str', 'N/A')
-                status_callback(f"다운로드 중: {percent}% | 속도: {speed} | 남은 시간: {eta}")
-        
-        elif d['status'] == 'finished':
-            if progress_callback:
-                progress_callback(100)
-            if status_callback:
+            from yt_dlp.utils import DownloadError
+            raise DownloadError("사용자에 의해 다운로드가 취소되었습니다.")
+
+        if d['status'] in ('downloading', 'finished', 'error'):
+            coalescer.update(make_progress_event(d))
+
+    @staticmethod
+    def _deliver_progress(event, progress_callback, status_callback, progress_event_callback):
+        """묶인 진행 이벤트를 콜백으로 전달 (워커 스레드, 최대 10Hz)"""
+        if progress_callback:
+            progress_callback(event['percent'])
+
+        if progress_event_callback:
+            progress_event_callback(event)
+
+        if status_callback:
+            if event['status'] == 'finished':
                 status_callback("다운로드 완료. 처리 중...")
+            elif event['status'] == 'downloading' and not progress_event_callback:
+                from yt_dlp.utils import format_bytes, formatSeconds
+                speed = format_bytes(event['speed']) + "/s" if event['speed'] else 'N/A'
+                eta = formatSeconds(event['eta']) if event['eta'] is not None else 'N/A'
+                status_callback(f"다운로드 중: {event['percent']:.1f}% | 속도: {speed} | 남은 시간: {eta}")
 
     def cancel(self):
         self.cancel_requested = True
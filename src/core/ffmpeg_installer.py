@@ -1,13 +1,18 @@
 import os
+import io
 import sys
+import json
+import hashlib
 import subprocess
 import shutil
+import tempfile
+import threading
 import zipfile
 import tarfile
 import platform
-import requests
 from pathlib import Path
 from .config import Config
+from .segmented_http import SegmentedDownloader, HttpRangeFile, ChecksumMismatchError
 
 class FFmpegInstaller:
     """
@@ -23,6 +28,14 @@ class FFmpegInstaller:
     FFMPEG_LINUX_URL = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/ffmpeg-master-latest-linux64-gpl.tar.xz"
     FFMPEG_MACOS_URL = "https://evermeet.cx/ffmpeg/getrelease/ffmpeg/zip"
 
+    # BtbN 릴리스의 SHA-256 목록 (Windows/Linux 압축 파일 검증용, macOS 빌드는 제공하지 않음)
+    FFMPEG_BTBN_CHECKSUMS_URL = "https://github.com/BtbN/FFmpeg-Builds/releases/download/latest/checksums.sha256"
+
+    # 실행 파일 검사 결과 캐시 (경로별, 파일 크기/수정 시각이 같으면 재사용)
+    PROBE_CACHE_FILENAME = "ffmpeg-probe.json"
+    _probe_cache = None  # 메모리 캐시 (최초 사용 시 파일에서 읽음)
+    _probe_lock = threading.Lock()
+
     @staticmethod
     def get_ffmpeg_dir():
         """FFmpeg 설치 디렉토리 반환 (%APPDATA%/VideoDownloader/ffmpeg)"""
@@ -37,19 +50,13 @@ class FFmpegInstaller:
         Returns:
             str: ffmpeg 실행 파일 경로 (없으면 None)
         """
-        # 1. config에 저장된 경로 확인
+        # 1. config에 저장된 경로 확인 (검사 결과가 캐시되어 있으면 stat만 수행)
         from .config import config
         ffmpeg_path = config.get("ffmpeg_path")
         if ffmpeg_path and os.path.isfile(ffmpeg_path):
-            try:
-                result = subprocess.run([ffmpeg_path, "-version"],
-                                      capture_output=True,
-                                      timeout=5)
-                if result.returncode == 0:
-                    print(f"[FFmpeg] config 경로에서 발견: {ffmpeg_path}")
-                    return ffmpeg_path
-            except Exception:
-                pass
+            if FFmpegInstaller.probe(ffmpeg_path):
+                print(f"[FFmpeg] config 경로에서 발견: {ffmpeg_path}")
+                return ffmpeg_path
 
         # 2. 시스템 PATH에서 확인
         system_ffmpeg = shutil.which("ffmpeg")
@@ -65,19 +72,149 @@ class FFmpegInstaller:
             local_ffmpeg = FFmpegInstaller.get_ffmpeg_dir() / "bin" / "ffmpeg"
 
         if local_ffmpeg.exists():
-            try:
-                result = subprocess.run([str(local_ffmpeg), "-version"],
-                                      capture_output=True,
-                                      timeout=5)
-                if result.returncode == 0:
-                    print(f"[FFmpeg] 로컬 설치본 발견: {local_ffmpeg}")
-                    return str(local_ffmpeg)
-            except Exception:
-                pass
+            if FFmpegInstaller.probe(str(local_ffmpeg)):
+                print(f"[FFmpeg] 로컬 설치본 발견: {local_ffmpeg}")
+                return str(local_ffmpeg)
 
         print("[FFmpeg] 설치되지 않음")
         return None
 
+    @staticmethod
+    def get_capabilities(ffmpeg_path=None):
+        """
+        FFmpeg 버전 및 지원 muxer/코덱 조회 (캐시된 결과 사용, 파일이 바뀐 경우에만 다시 실행)
+
+        Args:
+            ffmpeg_path: ffmpeg 실행 파일 경로 (None이면 check_ffmpeg로 찾음)
+
+        Returns:
+            dict: {
+                'path': str,  # 실행 파일 경로
+                'version': str,  # 버전 문자열 (예: "N-112345-g...", "6.1.1")
+                'muxers': list,  # 지원 muxer 이름 (예: "mp4", "matroska", "webm")
+                'codecs': dict  # 코덱 이름 -> 플래그 ("DEV.LS": D=디코딩, E=인코딩, V/A/S=종류)
+            }
+            (FFmpeg가 없거나 실행할 수 없으면 None)
+        """
+        if ffmpeg_path is None:
+            ffmpeg_path = FFmpegInstaller.check_ffmpeg()
+            if ffmpeg_path is None:
+                return None
+        return FFmpegInstaller.probe(ffmpeg_path)
+
+    @staticmethod
+    def probe(ffmpeg_path):
+        """
+        ffmpeg 실행 파일 검사 (경로, 크기, 수정 시각이 캐시와 같으면 프로세스를 실행하지 않음)
+
+        Args:
+            ffmpeg_path: ffmpeg 실행 파일 경로
+
+        Returns:
+            dict: get_capabilities 형식의 검사 결과 (실행할 수 없으면 None)
+        """
+        try:
+            stat = os.stat(ffmpeg_path)
+        except OSError:
+            return None
+
+        key = os.path.abspath(ffmpeg_path)
+        with FFmpegInstaller._probe_lock:
+            cache = FFmpegInstaller._load_probe_cache()
+            entry = cache.get(key)
+            if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                return entry['result']
+
+        result = FFmpegInstaller._run_probe(ffmpeg_path)
+
+        with FFmpegInstaller._probe_lock:
+            cache = FFmpegInstaller._load_probe_cache()
+            if result is None:
+                cache.pop(key, None)
+            else:
+                cache[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'result': result}
+            # 삭제된 실행 파일의 항목 정리
+            for path in [path for path in cache if not os.path.exists(path)]:
+                del cache[path]
+            FFmpegInstaller._save_probe_cache(cache)
+
+        return result
+
+    @staticmethod
+    def _run_probe(ffmpeg_path):
+        """ffmpeg를 실행하여 버전, muxer, 코덱 목록 파싱"""
+        def run(*args):
+            result = subprocess.run([ffmpeg_path, "-hide_banner", *args],
+                                    capture_output=True, text=True,
+                                    encoding="utf-8", errors="replace", timeout=10)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip())
+            return result.stdout
+
+        try:
+            version_output = run("-version")
+            muxers_output = run("-muxers")
+            codecs_output = run("-codecs")
+        except Exception as e:
+            print(f"[FFmpeg] 실행 파일 검사 실패: {ffmpeg_path} ({e})")
+            return None
+
+        # "ffmpeg version 6.1.1 Copyright ..." 형식
+        first_line = version_output.splitlines()[0] if version_output else ""
+        parts = first_line.split()
+        version = parts[2] if len(parts) > 2 and parts[1] == "version" else first_line
+
+        # 목록은 " --" 또는 " -------" 구분선 다음부터 " E mp4   MP4 (MPEG-4 Part 14)" 형식
+        def parse_list(output):
+            entries = []
+            started = False
+            for line in output.splitlines():
+                stripped = line.strip()
+                if not started:
+                    started = stripped.startswith("--")
+                    continue
+                fields = stripped.split(None, 2)
+                if len(fields) >= 2:
+                    entries.append((fields[0], fields[1]))
+            return entries
+
+        muxers = sorted({
+            name
+            for flags, names in parse_list(muxers_output) if "E" in flags
+            for name in names.split(",")
+        })
+        codecs = {name: flags for flags, name in parse_list(codecs_output)}
+
+        print(f"[FFmpeg] 실행 파일 검사 완료: {version} (muxer {len(muxers)}개, 코덱 {len(codecs)}개)")
+        return {'path': ffmpeg_path, 'version': version, 'muxers': muxers, 'codecs': codecs}
+
+    @staticmethod
+    def _get_probe_cache_path():
+        return Config.get_config_dir() / FFmpegInstaller.PROBE_CACHE_FILENAME
+
+    @staticmethod
+    def _load_probe_cache():
+        """검사 결과 캐시 읽기 (_probe_lock 보유 상태에서 호출)"""
+        if FFmpegInstaller._probe_cache is None:
+            try:
+                with open(FFmpegInstaller._get_probe_cache_path(), "r", encoding="utf-8") as f:
+                    FFmpegInstaller._probe_cache = json.load(f)
+            except (OSError, ValueError):
+                FFmpegInstaller._probe_cache = {}
+        return FFmpegInstaller._probe_cache
+
+    @staticmethod
+    def _save_probe_cache(cache):
+        """검사 결과 캐시 저장 (임시 파일에 쓴 뒤 교체)"""
+        cache_path = FFmpegInstaller._get_probe_cache_path()
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix="ffmpeg-probe-", suffix=".tmp", dir=cache_path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(temp_path, cache_path)
+        except OSError as e:
+            print(f"[FFmpeg] 검사 결과 캐시 저장 실패: {e}")
+
     @staticmethod
     def get_download_url():
         """현재 플랫폼에 맞는 FFmpeg 다운로드 URL 반환"""
@@ -114,41 +251,69 @@ class FFmpegInstaller:
             archive_path = ffmpeg_dir / "ffmpeg_archive"
 
         try:
-            # 다운로드
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-
-            with open(archive_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback and total_size > 0:
-                            percent = int((downloaded / total_size) * 70)  # 다운로드는 70%까지
-                            progress_callback(percent)
-
-            print(f"[FFmpeg] 다운로드 완료: {archive_path}")
-
-            # 압축 해제
-            if progress_callback:
-                progress_callback(75)
-
-            print("[FFmpeg] 압축 해제 중...")
-
-            if str(archive_path).endswith('.zip'):
-                FFmpegInstaller._extract_zip(archive_path, ffmpeg_dir)
-            elif str(archive_path).endswith('.tar.xz'):
-                FFmpegInstaller._extract_tar(archive_path, ffmpeg_dir)
+            # 다운로드 (여러 Range 연결, 중단 시 다음 설치에서 이어받음)
+            downloader = SegmentedDownloader()
+
+            expected_sha256 = None
+            if download_url.startswith("https://github.com/BtbN/"):
+                try:
+                    expected_sha256 = downloader.fetch_sha256(
+                        FFmpegInstaller.FFMPEG_BTBN_CHECKSUMS_URL,
+                        download_url.rsplit('/', 1)[-1]
+                    )
+                except Exception as e:
+                    print(f"[FFmpeg] 체크섬 목록을 가져오지 못함 (검증 생략): {e}")
+            if not expected_sha256:
+                print("[FFmpeg] 체크섬 정보 없음 - 무결성 검증 생략")
+
+            # 받으면서 바로 압축 해제 (bin/ 파일만 한 번 기록, 압축 파일은 디스크에 남기지 않음)
+            installed = False
+            try:
+                if download_url.endswith('.tar.xz'):
+                    FFmpegInstaller._stream_extract_tar(
+                        download_url, ffmpeg_dir, downloader.session, expected_sha256, progress_callback)
+                    installed = True
+                elif download_url.endswith('.zip'):
+                    if expected_sha256:
+                        # ZIP 전체 SHA-256은 전체를 받아야 검증할 수 있으므로 부분 다운로드 대신 전체를 받음
+                        print("[FFmpeg] 체크섬 있음 - ZIP 전체를 받아 SHA-256 검증 후 압축 해제")
+                    else:
+                        # 체크섬이 없으면 bin/ 구간만 받고 파일별 CRC32로만 검증
+                        print("[FFmpeg] 체크섬 없음 - ZIP bin/ 구간만 받아 압축 해제 (파일별 CRC32로만 검증)")
+                        FFmpegInstaller._remote_extract_zip(
+                            download_url, ffmpeg_dir, downloader.session, progress_callback)
+                        installed = True
+            except ChecksumMismatchError:
+                raise
+            except Exception as e:
+                print(f"[FFmpeg] 스트리밍 설치 실패 - 압축 파일을 받은 뒤 해제: {e}")
+
+            if not installed:
+                def on_progress(downloaded, total_size):
+                    if progress_callback and total_size > 0:
+                        progress_callback(int((downloaded / total_size) * 70))  # 다운로드는 70%까지
+
+                downloader.download(download_url, archive_path, on_progress, expected_sha256)
+
+                print(f"[FFmpeg] 다운로드 완료: {archive_path}")
+
+                # 압축 해제
+                if progress_callback:
+                    progress_callback(75)
+
+                print("[FFmpeg] 압축 해제 중...")
+
+                if str(archive_path).endswith('.zip'):
+                    FFmpegInstaller._extract_zip(archive_path, ffmpeg_dir)
+                elif str(archive_path).endswith('.tar.xz'):
+                    FFmpegInstaller._extract_tar(archive_path, ffmpeg_dir)
+
+                # 다운로드한 압축 파일 삭제
+                archive_path.unlink()
 
             if progress_callback:
                 progress_callback(90)
 
-            # 다운로드한 압축 파일 삭제
-            archive_path.unlink()
-
             # 실행 파일 경로 확인
             system = platform.system()
             if system == "Windows":
@@ -180,6 +345,106 @@ class FFmpegInstaller:
                 archive_path.unlink()
             raise e
 
+    @staticmethod
+    def _stream_extract_tar(url, target_dir, session, expected_sha256=None, progress_callback=None):
+        """
+        TAR.XZ를 받으면서 바로 압축 해제 (HTTP 응답 → xz 해제 → bin/ 파일만 기록)
+
+        받은 바이트로 SHA-256을 함께 계산하고, 검증이 끝난 뒤에만 staging 디렉토리의
+        파일을 bin/으로 옮깁니다.
+        """
+        staging_dir = target_dir / "bin.staging"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        digest = hashlib.sha256()
+        received = 0
+
+        with session.get(url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            total_size = int(response.headers.get('content-length', 0))
+            response.raw.decode_content = True
+
+            class HashingReader:
+                """읽은 압축 데이터를 해시와 진행률에 반영하는 파일 객체"""
+                def read(self, size=-1):
+                    nonlocal received
+                    data = response.raw.read(size if size and size > 0 else SegmentedDownloader.CHUNK_SIZE)
+                    digest.update(data)
+                    received += len(data)
+                    if progress_callback and total_size > 0:
+                        progress_callback(int((received / total_size) * 85))
+                    return data
+
+            reader = HashingReader()
+            print("[FFmpeg] 다운로드와 동시에 압축 해제 중 (tar.xz 스트리밍)...")
+
+            # "r|xz": seek 없이 순서대로 읽는 스트림 모드
+            with tarfile.open(fileobj=reader, mode='r|xz') as tar_ref:
+                for member in tar_ref:
+                    if member.isfile() and 'bin/' in member.name:
+                        filename = os.path.basename(member.name)
+                        source = tar_ref.extractfile(member)
+                        with open(staging_dir / filename, 'wb') as target:
+                            shutil.copyfileobj(source, target, SegmentedDownloader.CHUNK_SIZE)
+
+            # tar 끝 이후의 패딩까지 읽어야 전체 파일 해시가 맞음
+            while reader.read(SegmentedDownloader.CHUNK_SIZE):
+                pass
+
+        if expected_sha256:
+            actual = digest.hexdigest()
+            if actual.lower() != expected_sha256.lower():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                raise ChecksumMismatchError(f"SHA-256 불일치: 예상 {expected_sha256}, 실제 {actual}")
+            print(f"[FFmpeg] SHA-256 확인 완료: {actual}")
+
+        print(f"[FFmpeg] 스트리밍 압축 해제 완료: {received / 1024 / 1024:.1f}MB 수신")
+        FFmpegInstaller._commit_staging(staging_dir, target_dir)
+
+    @staticmethod
+    def _remote_extract_zip(url, target_dir, session, progress_callback=None):
+        """
+        ZIP의 중앙 디렉토리를 Range 요청으로 먼저 읽고 bin/ 파일 구간만 받아 압축 해제
+
+        ZIP 전체 SHA-256은 전체를 받아야 계산할 수 있으므로 파일별 CRC32로만 검증합니다
+        (zipfile이 읽는 동안 확인하고 다르면 BadZipFile 발생). 체크섬이 있으면 사용하지 않습니다.
+        """
+        staging_dir = target_dir / "bin.staging"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        staging_dir.mkdir(parents=True)
+
+        with HttpRangeFile(url, session=session) as remote:
+            buffered = io.BufferedReader(remote, buffer_size=SegmentedDownloader.CHUNK_SIZE)
+            with zipfile.ZipFile(buffered, 'r') as zip_ref:
+                members = [info for info in zip_ref.infolist()
+                           if 'bin/' in info.filename and os.path.basename(info.filename)]
+                total_size = sum(info.compress_size for info in members) or 1
+                print(f"[FFmpeg] ZIP 중앙 디렉토리 확인: 전체 {remote.size / 1024 / 1024:.1f}MB 중 "
+                      f"bin/ {len(members)}개 파일 ({total_size / 1024 / 1024:.1f}MB)만 다운로드")
+
+                done = 0
+                for info in members:
+                    with zip_ref.open(info) as source:
+                        with open(staging_dir / os.path.basename(info.filename), 'wb') as target:
+                            shutil.copyfileobj(source, target, SegmentedDownloader.CHUNK_SIZE)
+                    done += info.compress_size
+                    if progress_callback:
+                        progress_callback(int((done / total_size) * 85))
+
+            print(f"[FFmpeg] ZIP 부분 다운로드 완료: {remote.bytes_fetched / 1024 / 1024:.1f}MB 수신")
+
+        FFmpegInstaller._commit_staging(staging_dir, target_dir)
+
+    @staticmethod
+    def _commit_staging(staging_dir, target_dir):
+        """검증이 끝난 staging 파일을 bin/으로 이동"""
+        bin_dir = target_dir / "bin"
+        bin_dir.mkdir(parents=True, exist_ok=True)
+        for path in staging_dir.iterdir():
+            os.replace(path, bin_dir / path.name)
+        staging_dir.rmdir()
+
     @staticmethod
     def _extract_zip(zip_path, target_dir):
         """ZIP 파일 압축 해제"""
@@ -0,0 +1,185 @@
+"""
+영상 메타데이터 캐시 모듈
+
+get_video_info로 추출한 info dict를 SQLite에 저장하여 같은 영상을 다시 대기열에 넣거나
+재시도할 때 추출(플레이어 페이지/API 요청, 서명 해독 등)을 생략합니다.
+
+- 키: 정규화된 영상 ID ("youtube p_lrljKEVQY")
+- TTL: 포맷 URL은 일정 시간 후 만료되므로 info_cache_ttl_minutes 이후 폐기
+- 용량 제한: 전체 크기가 info_cache_max_mb를 넘으면 가장 오래 사용되지 않은 항목부터 삭제 (LRU)
+"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from .config import Config
+
+
+class InfoCache:
+    """SQLite 기반 영상 정보 캐시 (TTL + 용량 기반 LRU 제거)"""
+
+    DB_FILENAME = "info-cache.sqlite3"
+
+    def __init__(self, db_path=None):
+        # yt-dlp-cache 디렉토리와 같은 위치(%APPDATA%/VideoDownloader)에 저장
+        self.db_path = db_path or (Config.get_config_dir() / self.DB_FILENAME)
+        self._conn = None
+        self._lock = threading.Lock()
+
+        # 적중/미스 카운터 (프로세스 단위)
+        self.hits = 0
+        self.misses = 0
+
+    def _get_conn(self):
+        """DB 연결 (최초 사용 시 생성)"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS info ("
+                "key TEXT PRIMARY KEY, "
+                "data BLOB NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created REAL NOT NULL, "
+                "accessed REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS info_accessed ON info (accessed)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _get_ttl_seconds():
+        from .config import config
+        return (config.get("info_cache_ttl_minutes") or 0) * 60
+
+    @staticmethod
+    def _get_max_bytes():
+        from .config import config
+        return int((config.get("info_cache_max_mb") or 0) * 1024 * 1024)
+
+    @staticmethod
+    def is_enabled():
+        from .config import config
+        return bool(config.get("info_cache_enabled"))
+
+    def get(self, key):
+        """
+        캐시된 info dict 조회
+
+        Args:
+            key: 정규화된 영상 키
+
+        Returns:
+            dict: 캐시된 info dict (없거나 만료되었으면 None)
+        """
+        if not key:
+            return None
+
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute("SELECT data, created FROM info WHERE key = ?", (key,)).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            data, created = row
+            if now - created > self._get_ttl_seconds():
+                # 만료된 항목 (포맷 URL 만료 가능성)
+                conn.execute("DELETE FROM info WHERE key = ?", (key,))
+                conn.commit()
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE info SET accessed = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(data).decode('utf-8'))
+
+    def put(self, key, info):
+        """
+        info dict 저장
+
+        Args:
+            key: 정규화된 영상 키
+            info: yt-dlp sanitize_info로 정리된(JSON 직렬화 가능한) info dict
+        """
+        if not key or info is None:
+            return
+
+        data = zlib.compress(json.dumps(info, ensure_ascii=False).encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO info (key, data, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data), now, now)
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn, now):
+        """만료 항목 삭제 후 용량 초과분을 LRU 순서로 삭제"""
+        conn.execute("DELETE FROM info WHERE created < ?", (now - self._get_ttl_seconds(),))
+
+        max_bytes = self._get_max_bytes()
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM info").fetchone()[0]
+        if total <= max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM info ORDER BY accessed ASC").fetchall():
+            if total <= max_bytes:
+                break
+            conn.execute("DELETE FROM info WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+
+        if evicted:
+            print(f"[InfoCache] 용량 초과로 {evicted}개 항목 삭제")
+
+    def invalidate(self, key):
+        """특정 항목 삭제 (캐시된 정보로 다운로드 실패 시 사용)"""
+        if not key:
+            return
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM info WHERE key = ?", (key,))
+            conn.commit()
+
+    def clear(self):
+        """전체 캐시 삭제"""
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute("DELETE FROM info")
+            conn.commit()
+            conn.execute("VACUUM")
+
+    def stats(self):
+        """
+        캐시 통계
+
+        Returns:
+            dict: {
+                'hits': int,  # 적중 횟수
+                'misses': int,  # 미스 횟수
+                'entries': int,  # 저장된 항목 수
+                'total_bytes': int  # 저장된 데이터 크기 (압축 후)
+            }
+        """
+        with self._lock:
+            conn = self._get_conn()
+            entries, total_bytes = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM info").fetchone()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'total_bytes': total_bytes,
+        }
+
+
+info_cache = InfoCache()
@@ -0,0 +1,515 @@
+"""
+로컬 미디어 서버 (오프라인 벤치마크용)
+
+YouTube 대신 같은 구조(HLS 프래그먼트, DASH 세그먼트, 단일 mp4)를 로컬 HTTP 서버로 제공합니다.
+연결마다 지연(TTFB), 대역폭 제한, 지터를 설정할 수 있어 CI나 격리된 빌드 호스트에서도
+같은 조건으로 반복 측정할 수 있습니다. 서버 전체 대역폭과 동시 연결 수를 제한하면
+IP 단위 제한(초과 시 429)을 하는 CDN도 흉내 낼 수 있습니다.
+
+서버의 영상 주소(http://host:port/localmedia/<이름>)는 저장소 루트의
+yt_dlp_plugins/extractor/localmedia.py 플러그인이 추출하므로
+VideoDownloader.download를 그대로 사용해 측정할 수 있습니다.
+
+사용 예:
+    python -m src.core.local_media_server --port 8900 --latency-ms 40 --bandwidth-mbps 50
+"""
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class LocalMediaServer:
+    """
+    HLS/DASH/progressive 형식으로 결정적인(seed 고정) 데이터를 제공하는 로컬 서버
+
+    데이터는 seed와 영상 이름으로 만든 블록을 반복한 것이라 메모리를 거의 쓰지 않으며,
+    media_file을 지정하면 실제 파일 내용을 같은 방식으로 나누어 제공합니다
+    (세그먼트를 이어 붙이면 원본과 같으므로 MPEG-TS 파일이면 병합/후처리까지 측정 가능).
+    """
+
+    # 반복할 데이터 블록 크기
+    BLOCK_SIZE = 1024 * 1024
+
+    # 전송 단위 (대역폭 제한도 이 단위로 적용)
+    SEND_CHUNK_SIZE = 64 * 1024
+
+    # 프래그먼트 크기 (MPEG-TS 패킷 188바이트 배수, 약 2MB)
+    DEFAULT_FRAGMENT_SIZE = 188 * 11155
+
+    # 기본 영상 (벤치마크 A/B 영상과 같은 1440p60 구성, 크기만 축소)
+    DEFAULT_MEDIA = {
+        'a': {'size_mb': 64, 'duration': 60},
+        'b': {'size_mb': 256, 'duration': 240},
+    }
+
+    # 서버 전체 대역폭 제한에서 한 번에 몰아 보낼 수 있는 양 (초)
+    SHARED_BURST_SECONDS = 0.25
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0, bandwidth_mbps=0, jitter_ms=0, seed=0,
+                 fragment_size=None, total_bandwidth_mbps=0, max_connections=0):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 빈 포트 자동 선택)
+            latency_ms: 요청마다 응답 전 지연 (TTFB)
+            bandwidth_mbps: 연결당 최대 전송 속도 (0이면 무제한)
+            jitter_ms: 지연에 더해지는 무작위 변동 폭 (0 ~ jitter_ms)
+            seed: 데이터와 지터 난수 seed
+            fragment_size: HLS/DASH 프래그먼트 크기 (바이트)
+            total_bandwidth_mbps: 모든 연결을 합친 최대 전송 속도 (0이면 무제한, IP 단위 제한 흉내)
+            max_connections: 동시에 데이터를 받을 수 있는 연결 수 (0이면 무제한, 초과 시 429 응답)
+        """
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.bandwidth_mbps = bandwidth_mbps
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self.fragment_size = fragment_size or LocalMediaServer.DEFAULT_FRAGMENT_SIZE
+        self.total_bandwidth_mbps = total_bandwidth_mbps
+        self.max_connections = max_connections
+
+        self.media = {}
+        self.requests = 0  # 처리한 요청 수
+        self.bytes_sent = 0  # 전송한 본문 바이트 수
+        self.throttled = 0  # 동시 연결 수 초과로 거절(429)한 요청 수
+        self.active_connections = 0
+
+        self._jitter_random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._shared_ready = 0.0  # 서버 전체 대역폭 제한: 다음 전송이 가능한 시각
+        self._httpd = None
+        self._thread = None
+
+        for name, spec in LocalMediaServer.DEFAULT_MEDIA.items():
+            self.add_media(name, **spec)
+
+    def add_media(self, name, size_mb=64, duration=60, media_file=None, width=2560, height=1440, fps=60,
+                  audio_size_mb=0, audio_file=None):
+        """
+        제공할 영상 등록 (같은 이름이면 교체)
+
+        Args:
+            name: 영상 이름 (URL 경로에 사용, 영문/숫자/-/_)
+            size_mb: 합성 데이터 크기 (media_file을 지정하면 무시)
+            duration: 영상 길이 (초, 프래그먼트 길이와 비트레이트 계산에 사용)
+            media_file: 실제 미디어 파일 경로 (지정하면 파일 내용을 제공)
+            audio_size_mb: 0보다 크면 영상/오디오를 별도 스트림으로 제공 (YouTube의 bestvideo+bestaudio 구성)
+            audio_file: 오디오 스트림으로 제공할 실제 파일 (audio_size_mb 대신 사용)
+
+        오디오 스트림은 '<이름>-audio' 영상으로 함께 등록되며, 영상 스트림의 매니페스트가 이를 참조합니다.
+        """
+        if not re.fullmatch(r'[\w-]+', name):
+            raise ValueError(f"영상 이름에는 영문, 숫자, -, _만 사용할 수 있습니다: {name}")
+
+        if media_file:
+            size = os.path.getsize(media_file)
+            block = None
+        else:
+            size = int(size_mb * 1024 * 1024)
+            block = random.Random(f"{self.seed}:{name}").randbytes(LocalMediaServer.BLOCK_SIZE)
+
+        self.media[name] = {
+            'name': name,
+            'size': size,
+            'duration': duration,
+            'width': width,
+            'height': height,
+            'fps': fps,
+            'media_file': media_file,
+            'block': block,
+            'fragments': max(1, math.ceil(size / self.fragment_size)),
+            'vcodec': 'avc1.640032',
+            'acodec': 'mp4a.40.2',
+            'audio': None,  # 별도 오디오 스트림 이름
+        }
+
+        if audio_size_mb or audio_file:
+            audio_name = f"{name}-audio"
+            self.add_media(audio_name, size_mb=audio_size_mb, duration=duration, media_file=audio_file,
+                           width=None, height=None, fps=None)
+            self.media[audio_name]['vcodec'] = 'none'
+            self.media[name].update(acodec='none', audio=audio_name)
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        server = self
+
+        class Handler(LocalMediaRequestHandler):
+            media_server = server
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="LocalMediaServer", daemon=True)
+        self._thread.start()
+        bandwidth = f"{self.bandwidth_mbps} Mbps" if self.bandwidth_mbps else "무제한"
+        total = f"{self.total_bandwidth_mbps} Mbps" if self.total_bandwidth_mbps else "무제한"
+        connections = f"{self.max_connections}개" if self.max_connections else "무제한"
+        print(f"[MediaServer] 시작: {self.base_url} (지연 {self.latency_ms}ms, 지터 {self.jitter_ms}ms, "
+              f"연결당 대역폭 {bandwidth}, 전체 대역폭 {total}, 동시 연결 {connections})")
+        return self
+
+    def stop(self):
+        """서버 종료"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+            print(f"[MediaServer] 종료: 요청 {self.requests}회, 전송 {self.bytes_sent / 1048576:.1f}MB, "
+                  f"429 응답 {self.throttled}회")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def media_url(self, name, protocol=None):
+        """
+        yt-dlp에 넘길 영상 주소
+
+        Args:
+            name: 영상 이름
+            protocol: 제공할 형식만 지정 ("https", "m3u8", "dash", 쉼표로 여러 개), None이면 전체
+        """
+        url = f"{self.base_url}/localmedia/{name}"
+        if protocol:
+            url += f"?protocol={protocol}"
+        return url
+
+    def read_payload(self, media, start, end):
+        """영상 데이터의 [start, end) 구간을 SEND_CHUNK_SIZE 단위로 생성"""
+        if media['media_file']:
+            with open(media['media_file'], 'rb') as f:
+                f.seek(start)
+                while start < end:
+                    chunk = f.read(min(LocalMediaServer.SEND_CHUNK_SIZE, end - start))
+                    if not chunk:
+                        break
+                    start += len(chunk)
+                    yield chunk
+            return
+
+        block = media['block']
+        while start < end:
+            offset = start % LocalMediaServer.BLOCK_SIZE
+            length = min(LocalMediaServer.SEND_CHUNK_SIZE, end - start, LocalMediaServer.BLOCK_SIZE - offset)
+            start += length
+            yield block[offset:offset + length]
+
+    def next_delay(self):
+        """요청마다 적용할 지연 (초)"""
+        with self._lock:
+            self.requests += 1
+            jitter = self._jitter_random.uniform(0, self.jitter_ms) if self.jitter_ms else 0
+        return (self.latency_ms + jitter) / 1000
+
+    def add_sent(self, length):
+        with self._lock:
+            self.bytes_sent += length
+
+    def open_transfer(self):
+        """데이터 전송 시작 (동시 연결 수 제한을 넘으면 False)"""
+        with self._lock:
+            if self.max_connections and self.active_connections >= self.max_connections:
+                self.throttled += 1
+                return False
+            self.active_connections += 1
+            return True
+
+    def close_transfer(self):
+        with self._lock:
+            self.active_connections -= 1
+
+    def consume_shared(self, length):
+        """
+        서버 전체 대역폭 제한 (토큰 버킷)
+
+        length 바이트를 보내기 전에 기다려야 하는 시간(초)을 반환합니다.
+        연결 수와 관계없이 합계 속도가 total_bandwidth_mbps를 넘지 않습니다.
+        """
+        if not self.total_bandwidth_mbps:
+            return 0
+        rate = self.total_bandwidth_mbps * 1000000 / 8
+        with self._lock:
+            now = time.monotonic()
+            # 쉬는 동안 쌓이는 여유는 SHARED_BURST_SECONDS까지만 인정
+            ready = max(self._shared_ready, now - LocalMediaServer.SHARED_BURST_SECONDS) + length / rate
+            self._shared_ready = ready
+        return max(0, ready - now)
+
+    def fragment_range(self, media, index):
+        """프래그먼트 index의 [start, end) 바이트 구간"""
+        start = index * self.fragment_size
+        return start, min(start + self.fragment_size, media['size'])
+
+    def build_info(self, media):
+        """추출기 플러그인이 읽는 영상 정보"""
+        return {
+            'id': media['name'],
+            'title': f"Local media {media['name']}",
+            'duration': media['duration'],
+            'filesize': media['size'],
+            'width': media['width'],
+            'height': media['height'],
+            'fps': media['fps'],
+            'vcodec': media['vcodec'],
+            'acodec': media['acodec'],
+            'tbr': media['size'] * 8 / media['duration'] / 1000,
+            'audio': self.build_info(self.media[media['audio']]) if media['audio'] else None,
+        }
+
+    @staticmethod
+    def _codecs(media):
+        return ",".join(codec for codec in (media['vcodec'], media['acodec']) if codec != 'none')
+
+    def build_hls_master(self, media):
+        bandwidth = int(media['size'] * 8 / media['duration'])
+        codecs = self._codecs(media)
+        audio_media = ""
+        audio_group = ""
+        if media['audio']:
+            audio = self.media[media['audio']]
+            bandwidth += int(audio['size'] * 8 / audio['duration'])
+            codecs += f",{audio['acodec']}"
+            audio_media = (f"#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID=\"audio\",NAME=\"main\",DEFAULT=YES,AUTOSELECT=YES,"
+                           f"URI=\"../../{audio['name']}/hls/media.m3u8\"\n")
+            audio_group = ",AUDIO=\"audio\""
+        return (
+            "#EXTM3U\n"
+            "#EXT-X-VERSION:3\n"
+            f"{audio_media}"
+            f"#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={media['width']}x{media['height']},"
+            f"FRAME-RATE={media['fps']},CODECS=\"{codecs}\"{audio_group}\n"
+            "media.m3u8\n"
+        )
+
+    def build_hls_media(self, media):
+        fragment_duration = media['duration'] / media['fragments']
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{math.ceil(fragment_duration)}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:VOD",
+        ]
+        for index in range(media['fragments']):
+            lines.append(f"#EXTINF:{fragment_duration:.3f},")
+            lines.append(f"seg-{index}.ts")
+        lines.append("#EXT-X-ENDLIST")
+        return "\n".join(lines) + "\n"
+
+    def build_dash_manifest(self, media):
+        adaptation_sets = self._build_dash_adaptation_set(media, 'main', 'video/mp4', '')
+        if media['audio']:
+            adaptation_sets += self._build_dash_adaptation_set(
+                self.media[media['audio']], 'audio', 'audio/mp4', f"../../{media['audio']}/dash/")
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" '
+            f'mediaPresentationDuration="PT{media["duration"]}S" minBufferTime="PT2S" '
+            'profiles="urn:mpeg:dash:profile:isoff-on-demand:2011">\n'
+            '  <Period>\n'
+            f'{adaptation_sets}'
+            '  </Period>\n'
+            '</MPD>\n'
+        )
+
+    def _build_dash_adaptation_set(self, media, representation_id, mime_type, segment_prefix):
+        fragment_duration = media['duration'] / media['fragments']
+        bandwidth = int(media['size'] * 8 / media['duration'])
+        video_attributes = (
+            f' width="{media["width"]}" height="{media["height"]}" frameRate="{media["fps"]}"'
+            if media['vcodec'] != 'none' else ''
+        )
+        segments = "\n".join(
+            f'          <SegmentURL media="{segment_prefix}seg-{index}.m4s"/>' for index in range(media['fragments'])
+        )
+        return (
+            f'    <AdaptationSet mimeType="{mime_type}">\n'
+            f'      <Representation id="{representation_id}" codecs="{self._codecs(media)}" '
+            f'bandwidth="{bandwidth}"{video_attributes}>\n'
+            f'        <SegmentList timescale="1000" duration="{int(fragment_duration * 1000)}">\n'
+            f'{segments}\n'
+            '        </SegmentList>\n'
+            '      </Representation>\n'
+            '    </AdaptationSet>\n'
+        )
+
+
+class LocalMediaRequestHandler(BaseHTTPRequestHandler):
+    """LocalMediaServer 요청 처리 (media_server는 서버 시작 시 하위 클래스에서 지정)"""
+
+    media_server = None
+    protocol_version = "HTTP/1.1"  # keep-alive (yt-dlp가 연결을 재사용하는 것과 같은 조건)
+
+    ROUTE = re.compile(r'/localmedia/(?P<name>[\w-]+)(?:/(?P<path>.*))?$')
+    FRAGMENT = re.compile(r'(?:hls/seg-(?P<ts>\d+)\.ts|dash/seg-(?P<m4s>\d+)\.m4s)$')
+
+    def do_HEAD(self):
+        self.handle_request(send_body=False)
+
+    def do_GET(self):
+        self.handle_request(send_body=True)
+
+    def handle_request(self, send_body):
+        server = self.media_server
+        time.sleep(server.next_delay())
+
+        match = self.ROUTE.match(urlsplit(self.path).path)
+        media = server.media.get(match.group('name')) if match else None
+        if media is None:
+            self.send_error(404)
+            return
+
+        path = match.group('path') or 'info.json'
+        if path == 'info.json':
+            self.send_text(json.dumps(server.build_info(media)), 'application/json', send_body)
+        elif path == 'hls/master.m3u8':
+            self.send_text(server.build_hls_master(media), 'application/vnd.apple.mpegurl', send_body)
+        elif path == 'hls/media.m3u8':
+            self.send_text(server.build_hls_media(media), 'application/vnd.apple.mpegurl', send_body)
+        elif path == 'dash/manifest.mpd':
+            self.send_text(server.build_dash_manifest(media), 'application/dash+xml', send_body)
+        elif path == 'video.mp4':
+            self.send_payload(media, 0, media['size'], 'video/mp4', send_body)
+        else:
+            fragment = self.FRAGMENT.match(path)
+            index = int(fragment.group('ts') or fragment.group('m4s')) if fragment else -1
+            if not 0 <= index < media['fragments']:
+                self.send_error(404)
+                return
+            start, end = server.fragment_range(media, index)
+            content_type = 'video/mp2t' if fragment.group('ts') else 'video/iso.segment'
+            self.send_payload(media, start, end, content_type, send_body)
+
+    def send_text(self, text, content_type, send_body):
+        body = text.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def send_payload(self, media, start, end, content_type, send_body):
+        """데이터 구간 전송 (Range 요청 지원, 연결당/전체 대역폭 제한과 동시 연결 수 제한 적용)"""
+        if send_body and not self.media_server.open_transfer():
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        try:
+            self._send_payload(media, start, end, content_type, send_body)
+        finally:
+            if send_body:
+                self.media_server.close_transfer()
+
+    def _send_payload(self, media, start, end, content_type, send_body):
+        length = end - start
+        status = 200
+
+        range_match = re.match(r'bytes=(\d*)-(\d*)$', self.headers.get('Range', ''))
+        if range_match and (range_match.group(1) or range_match.group(2)):
+            first, last = range_match.groups()
+            if first:
+                range_start = int(first)
+                range_end = min(int(last) + 1, length) if last else length
+            else:
+                range_start = max(0, length - int(last))
+                range_end = length
+            if range_start >= length or range_start >= range_end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{length}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = 206
+            start, end = start + range_start, start + range_end
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(end - start))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {range_start}-{range_end - 1}/{length}')
+        self.end_headers()
+        if not send_body:
+            return
+
+        rate = self.media_server.bandwidth_mbps * 1000000 / 8
+        sent = 0
+        begin = time.monotonic()
+        try:
+            for chunk in self.media_server.read_payload(media, start, end):
+                shared_delay = self.media_server.consume_shared(len(chunk))
+                if shared_delay:
+                    time.sleep(shared_delay)
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                if rate:
+                    # 보낸 양이 허용량을 앞서면 그만큼 대기 (연결당 평균 속도를 rate로 제한)
+                    ahead = sent / rate - (time.monotonic() - begin)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # 클라이언트가 중간에 끊음 (부분 다운로드 중단 등)
+        finally:
+            self.media_server.add_sent(sent)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 남기지 않음 (측정에 영향)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크용 로컬 미디어 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0, help="요청당 지연 (TTFB)")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="연결당 최대 속도 (0 = 무제한)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="지연 무작위 변동 폭")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--total-bandwidth-mbps", type=float, default=0,
+                        help="모든 연결을 합친 최대 속도 (0 = 무제한)")
+    parser.add_argument("--max-connections", type=int, default=0,
+                        help="동시에 데이터를 받을 수 있는 연결 수 (0 = 무제한, 초과 시 429)")
+    parser.add_argument("--media-file", help="합성 데이터 대신 제공할 미디어 파일 (영상 이름 'file')")
+    parser.add_argument("--audio-file", help="--media-file과 별도 스트림으로 제공할 오디오 파일")
+    args = parser.parse_args(argv)
+
+    server = LocalMediaServer(args.host, args.port, args.latency_ms, args.bandwidth_mbps, args.jitter_ms, args.seed,
+                              total_bandwidth_mbps=args.total_bandwidth_mbps,
+                              max_connections=args.max_connections)
+    if args.media_file:
+        server.add_media('file', media_file=args.media_file, audio_file=args.audio_file)
+    server.start()
+    for name in server.media:
+        print(f"[MediaServer] {name}: {server.media_url(name)}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -3,12 +3,17 @@
 
 실제 YouTube 다운로드로 다양한 워커 설정을 테스트하여 최적값을 찾습니다.
 """
-import time
-import tempfile
+import copy
+import math
 import os
-from pathlib import Path
-import yt_dlp
-from .config import Config
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from .config import Config, config
+from .transfer_backends import TransferBackends
+from .ydl_pool import ydl_pool
 
 
 class NetworkBenchmark:
@@ -18,130 +23,196 @@ class NetworkBenchmark:
     # A: 1440p60, 10분, 10k 비트레이트, 최대 품질 mp4 약 824MB
     TEST_VIDEO_A_URL = "https://youtu.be/p_lrljKEVQY"
 
-    # B: 1440p60, 80분, 최대 품질 약 6.24GB (824MB까지만 다운로드하여 테스트)
+    # B: 1440p60, 80분, 최대 품질 약 6.24GB (측정 시간 동안만 다운로드)
     TEST_VIDEO_B_URL = "https://youtu.be/QNlIlfT3N58"
 
-    # 부분 다운로드 제한 (MB)
-    PARTIAL_DOWNLOAD_LIMIT_MB = 824
+    # 측정 시간 (초): 첫 바이트 이후 워밍업 구간은 버리고 정상 상태 구간만 측정
+    WARMUP_SECONDS = 2.0
+    MEASURE_SECONDS = 5.0
+
+    # 구간별 속도 샘플 간격 (초, p50/p95/분산 계산 단위)
+    SAMPLE_INTERVAL = 0.5
 
-    # 성능 차이 임계값 (10% 이내면 더 적은 워커 선택)
+    # 성능 차이 임계값 (5% 이내면 더 적은 워커 선택, 백엔드 비교에서는 native 유지)
     PERFORMANCE_THRESHOLD = 0.05
 
+    # 워커 수 탐색 상한 (프래그먼트 다운로드는 네트워크 대기 위주라 CPU 코어 수와 무관)
+    MAX_WORKERS = 32
+
+    # 측정할 워커 설정 수 상한 (A/B 한 쌍이 1회)
+    MAX_EVALUATIONS = 8
+
+    # 세부 탐색 종료 폭 (탐색 구간이 상한의 이 비율 이하가 되면 중단)
+    SEARCH_RESOLUTION = 0.25
+
+    # 백엔드 비교 시 전송 형식별 포맷 필터 (yt-dlp 포맷 선택 문법)
+    PROTOCOL_FILTERS = {
+        'https': '[protocol^=http][protocol!*=dash]',  # 단일 파일 (로컬 서버는 http)
+        'm3u8': '[protocol^=m3u8]',
+        'dash': '[protocol=http_dash_segments]',
+    }
+
+    # ffmpeg 측정의 출력 크기 상한 (native가 같은 영상에서 받은 양의 배수)
+    # yt-dlp의 FFmpegFD는 프로세스 핸들을 넘겨주지 않아 측정 시간이 지나도 중단할 수 없으므로 -fs로 끝냄
+    FFMPEG_SIZE_LIMIT_RATIO = 2
+
+    @staticmethod
+    def _search_workers(measure, max_workers=None, max_evaluations=None):
+        """
+        측정 횟수를 줄이는 워커 수 탐색 (거친 탐색 → 황금분할 세부 탐색)
+
+        1. 1, 2, 4, ...로 늘리며 지금까지의 최고 속도보다 PERFORMANCE_THRESHOLD 이상
+           빨라지지 않으면 중단 (향상이 멈춘 지점 이후는 측정하지 않음)
+        2. 최고점 양옆 구간 [최고/2, 최고*2] 안에서 황금분할 탐색
+           (두 측정점의 차이가 PERFORMANCE_THRESHOLD 이내이거나 구간이 충분히 좁아지면 중단)
+
+        Args:
+            measure: 워커 수를 받아 속도를 반환하는 함수 (같은 워커 수는 한 번만 호출)
+            max_workers: 탐색 상한 (None이면 MAX_WORKERS)
+            max_evaluations: 측정 횟수 상한 (None이면 MAX_EVALUATIONS)
+
+        Returns:
+            list: 탐색 경로 [(단계, 워커 수, 속도), ...] (측정 순서)
+        """
+        max_workers = max_workers or NetworkBenchmark.MAX_WORKERS
+        max_evaluations = max_evaluations or NetworkBenchmark.MAX_EVALUATIONS
+        threshold = NetworkBenchmark.PERFORMANCE_THRESHOLD
+
+        speeds = {}
+        path = []
+
+        def evaluate(workers, stage):
+            if workers not in speeds:
+                speeds[workers] = measure(workers)
+                path.append((stage, workers, speeds[workers]))
+                print(f"[Benchmark] 탐색 {len(path)}: [{stage}] {workers}개 워커 → {speeds[workers]:.1f} Mbps")
+            return speeds[workers]
+
+        # 1. 거친 탐색 (2배씩)
+        best = 1
+        evaluate(best, "배수")
+        workers = 2
+        while workers <= max_workers and len(speeds) < max_evaluations:
+            if evaluate(workers, "배수") <= speeds[best] * (1 + threshold):
+                break  # 향상이 임계값 이하 → 더 늘려도 이득 없음
+            best = workers
+            workers *= 2
+
+        # 2. 황금분할 세부 탐색
+        golden = (5 ** 0.5 - 1) / 2  # 0.618...
+        low = max(1, best // 2)
+        high = min(max_workers, best * 2)
+        while (high - low > max(2, high * NetworkBenchmark.SEARCH_RESOLUTION)
+               and len(speeds) < max_evaluations):
+            left = high - round((high - low) * golden)
+            right = low + round((high - low) * golden)
+            if left >= right:
+                right = left + 1
+
+            left_speed = evaluate(left, "세부")
+            if len(speeds) >= max_evaluations:
+                break
+            right_speed = evaluate(right, "세부")
+
+            if abs(left_speed - right_speed) <= max(left_speed, right_speed) * threshold:
+                break  # 두 지점 차이가 임계값 이내 → 평탄 구간
+            if left_speed > right_speed:
+                high = right
+            else:
+                low = left
+
+        print(f"[Benchmark] 탐색 경로 ({len(path)}회 측정): "
+              f"{' → '.join(str(workers) for _, workers, _ in path)}")
+        return path
+
     @staticmethod
-    def run_benchmark(progress_callback=None, status_callback=None):
+    def run_benchmark(progress_callback=None, status_callback=None, media_server=None):
         """
         다양한 워커 수로 벤치마크를 실행하여 최적값 찾기
 
         Args:
             progress_callback: 진행률 콜백 (0-100)
             status_callback: 상태 메시지 콜백
+            media_server: 시작된 LocalMediaServer (지정하면 YouTube 대신 서버의 A/B 영상으로 오프라인 측정)
 
         Returns:
             dict: {
                 'optimal_workers': int,  # 최적 워커 수
                 'min_size_per_worker': int,  # 워커당 권장 최소 크기 (MB)
-                'results': list  # 각 테스트 결과
+                'results': list,  # 각 테스트 결과
+                'search_path': list  # 탐색 경로 [(단계, 워커 수, 속도), ...]
             }
         """
-        # CPU 코어 수 확인
-        cpu_count = os.cpu_count() or 4
-
-        # 1부터 CPU 코어 수까지 2의 제곱수로 테스트 설정 생성
-        test_configs = []
-        workers = 1
-        while workers <= cpu_count:
-            test_configs.append({
-                'workers': workers,
-                'name': f'{workers}개 워커'
-            })
-            workers *= 2  # 1, 2, 4, 8, 16, ...
+        if media_server:
+            # 워커 수(프래그먼트 병렬)가 영향을 주는 DASH 세그먼트 형식으로 측정
+            video_a_url = media_server.media_url('a', 'dash')
+            video_b_url = media_server.media_url('b', 'dash')
+        else:
+            video_a_url = NetworkBenchmark.TEST_VIDEO_A_URL
+            video_b_url = NetworkBenchmark.TEST_VIDEO_B_URL
 
-        print(f"[Benchmark] CPU 코어 수: {cpu_count}개")
-        print(f"[Benchmark] 테스트 워커 설정: {[c['workers'] for c in test_configs]}")
+        print("[Benchmark] A/B 네트워크 벤치마크 시작")
+        print(f"[Benchmark] A 영상 (작은 파일): {video_a_url}")
+        print(f"[Benchmark] B 영상 (큰 파일): {video_b_url}")
+        print(f"[Benchmark] 워커 탐색 범위: 1~{NetworkBenchmark.MAX_WORKERS}개 "
+              f"(최대 {NetworkBenchmark.MAX_EVALUATIONS}가지 설정)")
 
         results_a = []
         results_b = []
-        total_tests = len(test_configs) * 2  # A/B 테스트
+        infos = {}  # 영상별 추출 정보 (측정마다 다시 추출하지 않음)
 
-        print("[Benchmark] A/B 네트워크 벤치마크 시작")
-        print(f"[Benchmark] A 영상 (작은 파일): {NetworkBenchmark.TEST_VIDEO_A_URL}")
-        print(f"[Benchmark] B 영상 (큰 파일): {NetworkBenchmark.TEST_VIDEO_B_URL}")
-
-        # A 영상 테스트 (작은 파일)
-        print("\n[Benchmark] === A 영상 테스트 시작 (작은 파일) ===")
-        for idx, config in enumerate(test_configs):
-            workers = config['workers']
-            test_name = config['name']
-
-            if status_callback:
-                status_callback(f"A 영상 테스트 중: {test_name}")
-
-            if progress_callback:
-                progress = int((idx / total_tests) * 100)
-                progress_callback(progress)
-
-            print(f"\n[Benchmark] A 테스트 {idx + 1}/{len(test_configs)}: {test_name}")
-
-            try:
-                result = NetworkBenchmark._run_single_test(
-                    workers,
-                    NetworkBenchmark.TEST_VIDEO_A_URL,
-                    partial_download=False
-                )
-                results_a.append(result)
-
-                print(f"[Benchmark] {test_name} 완료: {result['speed_mbps']:.1f} Mbps, {result['duration']:.1f}초, {result['file_size_mb']:.1f}MB")
-
-            except Exception as e:
-                print(f"[Benchmark] {test_name} 실패: {e}")
-                results_a.append({
-                    'workers': workers,
-                    'success': False,
-                    'error': str(e)
-                })
-
-        # B 영상 테스트 (큰 파일, 부분 다운로드)
-        print("\n[Benchmark] === B 영상 테스트 시작 (큰 파일, 부분 다운로드) ===")
-        for idx, config in enumerate(test_configs):
-            workers = config['workers']
-            test_name = config['name']
-
-            if status_callback:
-                status_callback(f"B 영상 테스트 중: {test_name}")
+        def measure(workers):
+            """워커 수 하나를 A/B 영상으로 측정하여 평균 속도(Mbps) 반환"""
+            test_name = f'{workers}개 워커'
+            step = len(results_a)
 
             if progress_callback:
-                progress = int(((len(test_configs) + idx) / total_tests) * 100)
-                progress_callback(progress)
-
-            print(f"\n[Benchmark] B 테스트 {idx + 1}/{len(test_configs)}: {test_name}")
-
-            try:
-                result = NetworkBenchmark._run_single_test(
-                    workers,
-                    NetworkBenchmark.TEST_VIDEO_B_URL,
-                    partial_download=True
-                )
-                results_b.append(result)
-
-                print(f"[Benchmark] {test_name} 완료: {result['speed_mbps']:.1f} Mbps, {result['duration']:.1f}초, {result['file_size_mb']:.1f}MB (부분)")
-
-            except Exception as e:
-                print(f"[Benchmark] {test_name} 실패: {e}")
-                results_b.append({
-                    'workers': workers,
-                    'success': False,
-                    'error': str(e)
-                })
+                progress_callback(int(step / NetworkBenchmark.MAX_EVALUATIONS * 100))
+
+            speeds = []
+            for label, video_url, results in (('A', video_a_url, results_a), ('B', video_b_url, results_b)):
+                if status_callback:
+                    status_callback(f"{label} 영상 테스트 중: {test_name}")
+                print(f"\n[Benchmark] {label} 테스트 {step + 1}: {test_name}")
+
+                try:
+                    if video_url not in infos:
+                        infos[video_url] = NetworkBenchmark._extract_test_info(video_url)
+                    result = NetworkBenchmark._run_single_test(workers, video_url, infos[video_url])
+                    results.append(result)
+                    # 워밍업 전에 끝난 측정은 TTFB/증속 구간이 섞인 값이므로 탐색/선택에서 제외
+                    if result['steady_state']:
+                        speeds.append(result['speed_mbps'])
+
+                    print(f"[Benchmark] {test_name} 완료: 평균 {result['speed_mbps']:.1f} Mbps "
+                          f"(p50 {result['p50_mbps']:.1f}, p95 {result['p95_mbps']:.1f}, "
+                          f"표준편차 {math.sqrt(result['variance']):.1f}), "
+                          f"{result['duration']:.1f}초 동안 {result['file_size_mb']:.1f}MB, TTFB {result['ttfb']:.2f}초"
+                          f"{'' if result['steady_state'] else ' (워밍업 전에 완료 - 선택에서 제외)'}")
+
+                except Exception as e:
+                    print(f"[Benchmark] {test_name} 실패: {e}")
+                    results.append({
+                        'workers': workers,
+                        'success': False,
+                        'error': str(e)
+                    })
+
+            if not speeds:
+                print(f"[Benchmark] {test_name}: 정상 상태 측정 없음")
+            return sum(speeds) / len(speeds) if speeds else 0
+
+        search_path = NetworkBenchmark._search_workers(measure)
 
         if progress_callback:
             progress_callback(100)
 
-        # A/B 결과 분석
-        successful_a = [r for r in results_a if r.get('success', False)]
-        successful_b = [r for r in results_b if r.get('success', False)]
+        # A/B 결과 분석 (정상 상태 구간을 측정한 결과만 사용)
+        successful_a = [r for r in results_a if r.get('success', False) and r.get('steady_state')]
+        successful_b = [r for r in results_b if r.get('success', False) and r.get('steady_state')]
 
         if not successful_a and not successful_b:
-            raise Exception("모든 벤치마크 테스트가 실패했습니다")
+            raise Exception("정상 상태 구간을 측정한 벤치마크 결과가 없습니다")
 
         # A, B 결과 통합 (평균 속도 계산)
         combined_results = {}
@@ -183,12 +254,12 @@ class NetworkBenchmark:
         best_speed = best_result['avg_speed']
         best_workers = best_result['workers']
 
-        # 10% 이내 성능 차이면 더 적은 워커 선택 (자원 절약)
+        # PERFORMANCE_THRESHOLD(5%) 이내 성능 차이면 더 적은 워커 선택 (자원 절약)
         optimal_workers = best_workers
         for result in sorted_results:
             speed_diff_ratio = (best_speed - result['avg_speed']) / best_speed
             if speed_diff_ratio <= NetworkBenchmark.PERFORMANCE_THRESHOLD:
-                # 성능 차이가 10% 이내면 더 적은 워커 수 선택
+                # 성능 차이가 임계값 이내면 더 적은 워커 수 선택
                 if result['workers'] < optimal_workers:
                     optimal_workers = result['workers']
                     print(f"[Benchmark] {result['workers']}개 워커: {result['avg_speed']:.1f} Mbps (차이: {speed_diff_ratio*100:.1f}% - 자원 절약 우선)")
@@ -206,7 +277,7 @@ class NetworkBenchmark:
             int(avg_download_speed_mb_per_sec * min_chunk_duration_sec)
         )
 
-        print(f"\n[Benchmark] === A/B 벤치마크 완료! ===")
+        print("\n[Benchmark] === A/B 벤치마크 완료! ===")
         print(f"[Benchmark] 최고 속도: {best_speed:.1f} Mbps ({best_workers}개 워커)")
         print(f"[Benchmark] 최적 워커 수: {optimal_workers}개 (자원 효율 고려)")
         print(f"[Benchmark] 평균 다운로드 속도: {avg_download_speed_mb_per_sec:.1f} MB/s")
@@ -214,7 +285,10 @@ class NetworkBenchmark:
 
         print("\n[Benchmark] A/B 테스트 상세 결과:")
         for result in sorted_results:
-            print(f"  {result['workers']}개 워커: A={result['speed_a']:.1f} Mbps, B={result['speed_b']:.1f} Mbps, 평균={result['avg_speed']:.1f} Mbps")
+            # 정상 상태 측정이 없는 영상(워밍업 전에 완료 등)은 '-'로 표시
+            speed_a = f"{result['speed_a']:.1f} Mbps" if result['speed_a'] else "-"
+            speed_b = f"{result['speed_b']:.1f} Mbps" if result['speed_b'] else "-"
+            print(f"  {result['workers']}개 워커: A={speed_a}, B={speed_b}, 평균={result['avg_speed']:.1f} Mbps")
 
         return {
             'optimal_workers': optimal_workers,
@@ -223,110 +297,338 @@ class NetworkBenchmark:
             'avg_download_speed_mb_per_sec': avg_download_speed_mb_per_sec,
             'results_a': results_a,
             'results_b': results_b,
-            'combined_results': sorted_results
+            'combined_results': sorted_results,
+            'search_path': search_path
+        }
+
+    @staticmethod
+    def run_backend_benchmark(progress_callback=None, status_callback=None, media_server=None, workers=None):
+        """
+        전송 형식(https, m3u8, dash)별로 사용할 수 있는 백엔드를 A/B 영상으로 비교
+
+        워커 수 측정과 같은 시간 제한 테스트(_run_single_test)로 백엔드마다 A/B 평균 속도를 구하고,
+        native와의 차이가 PERFORMANCE_THRESHOLD 이내면 native를 선택합니다 (외부 프로세스 없이 동작).
+        사용할 수 있는 외부 백엔드가 없는 형식은 측정하지 않고 native로 둡니다.
+
+        Args:
+            progress_callback: 진행률 콜백 (0-100)
+            status_callback: 상태 메시지 콜백
+            media_server: 시작된 LocalMediaServer (지정하면 YouTube 대신 서버의 A/B 영상으로 오프라인 측정)
+            workers: 측정에 사용할 워커 수 (None이면 벤치마크 결과 또는 설정값)
+
+        Returns:
+            dict: {
+                'backends': dict,  # 전송 형식별 선택된 백엔드 {protocol: name}
+                'results': dict,  # {protocol: {backend: 평균 속도(Mbps)}}
+                'workers': int  # 측정에 사용한 워커 수
+            }
+        """
+        workers = workers or config.get("benchmark_optimal_workers") or config.get("concurrent_fragments")
+        candidates = {
+            protocol: TransferBackends.available_backends(protocol)
+            for protocol in TransferBackends.PROTOCOLS
+        }
+        total_tests = sum(len(names) for names in candidates.values() if len(names) > 1)
+
+        print(f"[Benchmark] 전송 백엔드 A/B 벤치마크 시작 (워커 {workers}개)")
+
+        backends = {}
+        results = {}
+        infos = {}  # 영상별 추출 정보 (형식마다 포맷만 다시 선택)
+        step = 0
+        for protocol, names in candidates.items():
+            if len(names) < 2:
+                print(f"[Benchmark] {protocol}: 비교할 외부 백엔드 없음 → {TransferBackends.DEFAULT}")
+                backends[protocol] = TransferBackends.DEFAULT
+                continue
+
+            if media_server:
+                videos = (('A', media_server.media_url('a', protocol)), ('B', media_server.media_url('b', protocol)))
+            else:
+                videos = (('A', NetworkBenchmark.TEST_VIDEO_A_URL), ('B', NetworkBenchmark.TEST_VIDEO_B_URL))
+
+            speeds = {}
+            received = {}  # native가 영상별로 받은 바이트 (ffmpeg 크기 상한 계산용)
+            for name in names:
+                if progress_callback:
+                    progress_callback(int(step / total_tests * 100))
+                step += 1
+
+                trial_speeds = []
+                for label, video_url in videos:
+                    if status_callback:
+                        status_callback(f"{label} 영상 테스트 중: {protocol} / {name}")
+                    print(f"\n[Benchmark] {label} 테스트: {protocol} / {name}")
+
+                    size_limit = None
+                    if name == 'ffmpeg':
+                        if video_url not in received:
+                            print(f"[Benchmark] {protocol} / {name} 건너뜀: native 측정 결과 없음 (크기 상한 계산 불가)")
+                            continue
+                        size_limit = received[video_url] * NetworkBenchmark.FFMPEG_SIZE_LIMIT_RATIO
+
+                    try:
+                        if video_url not in infos:
+                            infos[video_url] = NetworkBenchmark._extract_test_info(video_url)
+                        result = NetworkBenchmark._run_single_test(
+                            workers, video_url, infos[video_url],
+                            protocol=protocol, backend=name, size_limit=size_limit)
+                        if result['steady_state']:
+                            trial_speeds.append(result['speed_mbps'])
+                        if name == TransferBackends.DEFAULT:
+                            received[video_url] = result['received_bytes']
+
+                        print(f"[Benchmark] {protocol} / {name} 완료: 평균 {result['speed_mbps']:.1f} Mbps "
+                              f"(p50 {result['p50_mbps']:.1f}, p95 {result['p95_mbps']:.1f}), "
+                              f"{result['duration']:.1f}초 동안 {result['file_size_mb']:.1f}MB, TTFB {result['ttfb']:.2f}초"
+                              f"{'' if result['steady_state'] else ' (워밍업 전에 완료 - 선택에서 제외)'}")
+                    except Exception as e:
+                        print(f"[Benchmark] {protocol} / {name} 실패: {e}")
+
+                if trial_speeds:
+                    speeds[name] = sum(trial_speeds) / len(trial_speeds)
+
+            results[protocol] = speeds
+            if not speeds:
+                print(f"[Benchmark] {protocol}: 모든 백엔드 측정 실패 → {TransferBackends.DEFAULT}")
+                backends[protocol] = TransferBackends.DEFAULT
+                continue
+
+            # 가장 빠른 백엔드, native와 차이가 임계값 이내면 native 유지
+            best = max(speeds, key=speeds.get)
+            native_speed = speeds.get(TransferBackends.DEFAULT, 0)
+            if native_speed >= speeds[best] * (1 - NetworkBenchmark.PERFORMANCE_THRESHOLD):
+                best = TransferBackends.DEFAULT
+            backends[protocol] = best
+
+            print(f"[Benchmark] {protocol}: "
+                  f"{', '.join(f'{name}={speed:.1f} Mbps' for name, speed in speeds.items())} → {best}")
+
+        if progress_callback:
+            progress_callback(100)
+
+        print("\n[Benchmark] === 전송 백엔드 벤치마크 완료! ===")
+        print(f"[Benchmark] 선택: {', '.join(f'{protocol}={name}' for protocol, name in backends.items())}")
+
+        return {
+            'backends': backends,
+            'results': results,
+            'workers': workers,
+        }
+
+    @staticmethod
+    def _build_ydl_opts(workers, output_dir, protocol=None, backend=None):
+        """
+        벤치마크 다운로드용 yt-dlp 옵션
+
+        Args:
+            workers: 워커 수
+            output_dir: 임시 출력 디렉토리
+            protocol: 지정하면 해당 전송 형식의 포맷만 선택 (백엔드 비교용)
+            backend: protocol 형식에 사용할 백엔드 (None이면 yt-dlp 기본)
+        """
+        # yt-dlp 작업 디렉토리를 %APPDATA%로 제한 (권한 문제 방지)
+        yt_dlp_cache_dir = Config.get_config_dir() / "yt-dlp-cache"
+        yt_dlp_cache_dir.mkdir(parents=True, exist_ok=True)
+
+        ydl_opts = {
+            'format': 'bestvideo+bestaudio/best',  # 최대 품질 다운로드
+            'outtmpl': os.path.join(output_dir, 'benchmark_test.%(ext)s'),
+            'merge_output_format': 'mp4',  # mp4로 병합
+            'quiet': True,
+            'no_warnings': True,
+            'noprogress': True,
+            'concurrent_fragment_downloads': workers,
+            'retries': 3,
+            'fragment_retries': 3,
+
+            # 캐시는 %APPDATA%, 임시 파일은 측정마다 새 디렉토리 (이전 측정의 .part를 이어받지 않도록)
+            'cachedir': str(yt_dlp_cache_dir),
+            'paths': {'temp': output_dir},
+            'continuedl': False,
+            'socket_timeout': 30,
+
+            # 전송 속도만 측정하므로 받은 파일 보정(FFmpeg 처리)은 생략
+            'fixup': 'never',
+        }
+
+        if protocol:
+            # 실제 다운로드와 같은 경로로 비교 (native https는 Range 분할 다운로드)
+            selector = NetworkBenchmark.PROTOCOL_FILTERS[protocol]
+            ydl_opts['format'] = f'bestvideo{selector}+bestaudio{selector}/best{selector}'
+            ydl_opts['segmented_http'] = config.get("segmented_http")
+            TransferBackends.apply(ydl_opts, {protocol: backend})
+        return ydl_opts
+
+    @staticmethod
+    def _extract_test_info(video_url):
+        """테스트 영상 정보 추출 (측정마다 반복하지 않도록 1회만)"""
+        with ydl_pool.acquire(NetworkBenchmark._build_ydl_opts(1, tempfile.gettempdir())) as ydl:
+            return ydl.sanitize_info(ydl.extract_info(video_url, download=False), remove_private_keys=True)
+
+    @staticmethod
+    def _percentile(values, percent):
+        """백분위수 (nearest-rank)"""
+        ordered = sorted(values)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    @staticmethod
+    def _summarize_samples(samples, first_byte_time):
+        """
+        진행 샘플에서 정상 상태 구간의 처리량 통계 계산
+
+        첫 바이트 이후 WARMUP_SECONDS는 제외하고 MEASURE_SECONDS 동안 받은 바이트만 사용합니다.
+        다운로드가 워밍업 전에 끝난 경우(작은 파일)에는 첫 바이트 이후 전체 구간 값을 계산하되
+        steady_state를 False로 표시하며, 워커 수/백엔드 선택에서는 제외됩니다 (로그 참고용).
+
+        Args:
+            samples: [(시각, 누적 수신 바이트), ...] (시각 오름차순)
+            first_byte_time: 첫 바이트 수신 시각
+
+        Returns:
+            dict: 구간 길이, 수신량과 구간별 속도(Mbps)의 평균/p50/p95/분산
+        """
+        def bytes_at(moment):
+            """moment 시점의 누적 수신 바이트 (샘플 사이는 선형 보간)"""
+            previous = (first_byte_time, 0)
+            for sample in samples:
+                if sample[0] >= moment:
+                    if sample[0] == previous[0]:
+                        return sample[1]
+                    ratio = (moment - previous[0]) / (sample[0] - previous[0])
+                    return previous[1] + (sample[1] - previous[1]) * ratio
+                previous = sample
+            return previous[1]
+
+        last_time = samples[-1][0]
+        window_start = first_byte_time + NetworkBenchmark.WARMUP_SECONDS
+        steady_state = last_time - window_start >= NetworkBenchmark.SAMPLE_INTERVAL
+        if not steady_state:
+            window_start = first_byte_time
+        window_end = min(last_time, window_start + NetworkBenchmark.MEASURE_SECONDS)
+        duration = window_end - window_start
+
+        received = bytes_at(window_end) - bytes_at(window_start)
+        to_mbps = lambda count, seconds: (count / (1024 * 1024) * 8) / seconds if seconds > 0 else 0
+
+        # SAMPLE_INTERVAL 단위 구간별 속도
+        rates = []
+        moment = window_start
+        while moment + NetworkBenchmark.SAMPLE_INTERVAL <= window_end + 1e-9:
+            end = moment + NetworkBenchmark.SAMPLE_INTERVAL
+            rates.append(to_mbps(bytes_at(end) - bytes_at(moment), NetworkBenchmark.SAMPLE_INTERVAL))
+            moment = end
+        if not rates:
+            rates = [to_mbps(received, duration)]
+
+        return {
+            'steady_state': steady_state,
+            'duration': duration,
+            'file_size_mb': received / (1024 * 1024),
+            'speed_mbps': to_mbps(received, duration),
+            'p50_mbps': NetworkBenchmark._percentile(rates, 50),
+            'p95_mbps': NetworkBenchmark._percentile(rates, 95),
+            'variance': statistics.pvariance(rates),
+            'samples': len(rates),
         }
 
     @staticmethod
-    def _run_single_test(workers, video_url, partial_download=False):
+    def _run_single_test(workers, video_url, info=None, protocol=None, backend=None, size_limit=None):
         """
-        단일 워커 설정으로 테스트 다운로드 수행
+        단일 워커 설정으로 시간 제한 테스트 다운로드 수행
+
+        정보 추출, 병합, FFmpeg 처리 시간은 포함하지 않고 progress hook에서 받은
+        실제 수신 바이트만으로 처리량을 계산합니다. 첫 바이트 이후 WARMUP_SECONDS +
+        MEASURE_SECONDS가 지나면 다운로드를 중단합니다.
 
         Args:
             workers: 테스트할 워커 수
-            video_url: 테스트할 YouTube URL
-            partial_download: True면 PARTIAL_DOWNLOAD_LIMIT_MB까지만 다운로드
+            video_url: 테스트할 영상 URL
+            info: 미리 추출한 영상 정보 (None이면 추출)
+            protocol: 측정할 전송 형식 (None이면 최고 품질 포맷)
+            backend: protocol 형식에 사용할 백엔드
+            size_limit: ffmpeg 출력 크기 상한 (바이트, 시간으로 중단할 수 없는 ffmpeg 측정용)
 
         Returns:
-            dict: 테스트 결과
+            dict: 테스트 결과 (speed_mbps는 측정 구간 평균, p50/p95/분산은 SAMPLE_INTERVAL 단위 속도 기준)
         """
-        # 임시 디렉토리에 다운로드
-        temp_dir = tempfile.mkdtemp()
-
-        # 부분 다운로드 제어용 변수
-        download_state = {
-            'cancelled': False,
-            'downloaded_mb': 0,
-            'start_time': None
+        from yt_dlp.utils import DownloadError
+
+        if info is None:
+            info = NetworkBenchmark._extract_test_info(video_url)
+
+        # 측정마다 새 임시 디렉토리 (%APPDATA% 아래)
+        yt_dlp_temp_dir = Config.get_config_dir() / "temp"
+        yt_dlp_temp_dir.mkdir(parents=True, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(prefix="benchmark-", dir=yt_dlp_temp_dir)
+
+        # 측정 상태 (스트림별 누적 바이트 → 전체 누적 샘플)
+        state = {
+            'stopped': False,
+            'start_time': None,
+            'first_byte_time': None,
+            'streams': {},
+            'samples': [],
         }
+        # 병렬 스트림/분할 다운로드는 여러 스레드에서 hook을 호출하므로 샘플 순서가 시간 순서와 같도록 잠금
+        state_lock = threading.Lock()
+        time_limit = NetworkBenchmark.WARMUP_SECONDS + NetworkBenchmark.MEASURE_SECONDS
 
         def progress_hook(d):
-            """부분 다운로드 제어용 progress hook"""
-            if not partial_download:
+            """수신 바이트 샘플 기록, 측정 시간이 지나면 중단"""
+            if state['stopped']:
+                raise DownloadError("측정 시간 종료")
+            if d['status'] not in ('downloading', 'finished'):
                 return
 
-            if d['status'] == 'downloading':
-                downloaded = d.get('downloaded_bytes', 0)
-                downloaded_mb = downloaded / (1024 * 1024)
-                download_state['downloaded_mb'] = downloaded_mb
+            stream = d.get('info_dict', {}).get('format_id') or d.get('filename')
+            with state_lock:
+                now = time.monotonic()
+                state['streams'][stream] = d.get('downloaded_bytes') or 0
+                total = sum(state['streams'].values())
+                if total <= 0:
+                    return
 
-                # 제한 크기 도달 시 다운로드 중단
-                if downloaded_mb >= NetworkBenchmark.PARTIAL_DOWNLOAD_LIMIT_MB:
-                    download_state['cancelled'] = True
-                    raise yt_dlp.utils.DownloadError(f"부분 다운로드 완료: {downloaded_mb:.1f}MB")
+                if state['first_byte_time'] is None:
+                    state['first_byte_time'] = now
+                state['samples'].append((now, total))
 
-        try:
-            # yt-dlp 작업 디렉토리를 %APPDATA%로 제한 (권한 문제 방지)
-            yt_dlp_cache_dir = Config.get_config_dir() / "yt-dlp-cache"
-            yt_dlp_cache_dir.mkdir(parents=True, exist_ok=True)
-
-            yt_dlp_temp_dir = Config.get_config_dir() / "temp"
-            yt_dlp_temp_dir.mkdir(parents=True, exist_ok=True)
-
-            ydl_opts = {
-                'format': 'bestvideo+bestaudio/best',  # 최대 품질 다운로드
-                'outtmpl': os.path.join(temp_dir, 'benchmark_test.%(ext)s'),
-                'merge_output_format': 'mp4',  # mp4로 병합
-                'quiet': True,
-                'no_warnings': True,
-                'concurrent_fragment_downloads': workers,
-                'retries': 3,
-                'fragment_retries': 3,
-                'progress_hooks': [progress_hook],
-
-                # 캐시 및 임시 파일 경로를 %APPDATA%로 제한 (권한 문제 방지)
-                'cachedir': str(yt_dlp_cache_dir),
-                'paths': {'temp': str(yt_dlp_temp_dir)},
-                'socket_timeout': 30,
-            }
+                if now - state['first_byte_time'] >= time_limit:
+                    state['stopped'] = True
+            if state['stopped']:
+                raise DownloadError("측정 시간 종료")
 
-            start_time = time.time()
-            download_state['start_time'] = start_time
+        try:
+            ydl_opts = NetworkBenchmark._build_ydl_opts(workers, temp_dir, protocol, backend)
+            ydl_opts['progress_hooks'] = [progress_hook]
+            if size_limit and 'external_downloader_args' in ydl_opts:
+                ydl_opts['external_downloader_args']['ffmpeg_o'] = ['-fs', str(int(size_limit))]
 
+            state['start_time'] = time.monotonic()
             try:
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(video_url, download=True)
-                    file_size = info.get('filesize') or info.get('filesize_approx') or 0
-                    file_size_mb = file_size / (1024 * 1024) if file_size > 0 else 0
-            except yt_dlp.utils.DownloadError as e:
-                # 부분 다운로드 완료로 인한 에러는 정상 처리
-                if download_state['cancelled']:
-                    file_size_mb = download_state['downloaded_mb']
-                else:
+                with ydl_pool.acquire(ydl_opts) as ydl:
+                    ydl.process_ie_result(copy.deepcopy(info), download=True)
+            except Exception:
+                # 측정 시간 종료로 인한 중단은 정상 처리
+                # (병렬 프래그먼트 다운로드는 hook 예외를 조각 건너뛰기로 처리하므로
+                #  중단 후에는 빠진 조각 등 다른 종류의 오류로 끝날 수 있음)
+                if not state['stopped']:
                     raise
 
-            end_time = time.time()
-            duration = end_time - start_time
+            if not state['samples']:
+                raise Exception("수신한 데이터가 없습니다")
 
-            # 다운로드 속도 계산 (Mbps)
-            if duration > 0 and file_size_mb > 0:
-                speed_mbps = (file_size_mb * 8) / duration
-            else:
-                speed_mbps = 0
-
-            return {
+            result = NetworkBenchmark._summarize_samples(state['samples'], state['first_byte_time'])
+            result.update({
                 'workers': workers,
                 'success': True,
-                'duration': duration,
-                'file_size_mb': file_size_mb,
-                'speed_mbps': speed_mbps,
-                'partial': partial_download
-            }
+                'ttfb': state['first_byte_time'] - state['start_time'],
+                'received_bytes': state['samples'][-1][1],
+                'partial': state['stopped'],
+            })
+            return result
 
         finally:
             # 임시 파일 정리
-            try:
-                for file in Path(temp_dir).glob('*'):
-                    file.unlink()
-                Path(temp_dir).rmdir()
-            except Exception:
-                pass
+            shutil.rmtree(temp_dir, ignore_errors=True)
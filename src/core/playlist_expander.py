@@ -0,0 +1,140 @@
+"""
+플레이리스트/채널 확장 모듈
+
+flat 추출(extract_flat)로 플레이리스트와 채널의 항목을 발견되는 즉시 하나씩 내보냅니다.
+전체 항목을 미리 추출하지 않으므로 첫 항목이 몇 초 안에 다운로드를 시작할 수 있고,
+5,000개 항목 채널에서도 메모리 사용량이 일정하게 유지됩니다.
+각 항목의 전체 정보 추출은 다운로드 슬롯이 열리는 시점에 VideoDownloader가 수행합니다.
+"""
+from .ydl_pool import ydl_pool
+
+
+class PlaylistExpander:
+    """URL을 다운로드할 개별 항목으로 확장하는 generator 기반 확장기"""
+
+    # 채널 → 탭 → 플레이리스트처럼 중첩된 목록을 따라가는 최대 깊이
+    MAX_DEPTH = 3
+
+    def __init__(self, downloader):
+        """
+        Args:
+            downloader: 캐시 디렉토리와 쿠키 설정을 공유할 VideoDownloader
+        """
+        self.downloader = downloader
+
+    def _build_opts(self):
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+
+            # 플레이리스트 항목은 URL만 가져오고(전체 추출 안 함), 페이지 단위로 바로 처리
+            'extract_flat': 'in_playlist',
+            'lazy_playlist': True,
+
+            # 캐시 및 임시 파일 경로를 %APPDATA%로 제한
+            'cachedir': str(self.downloader.yt_dlp_cache_dir),
+            'paths': {'temp': str(self.downloader.yt_dlp_temp_dir)},
+
+            'socket_timeout': 30,
+        }
+        self.downloader._apply_cookie_settings(ydl_opts)
+        return ydl_opts
+
+    def expand(self, url):
+        """
+        URL을 다운로드 항목으로 확장 (generator)
+
+        Args:
+            url: 영상, 플레이리스트 또는 채널 URL
+
+        Yields:
+            dict: {
+                'url': str,  # 다운로드할 URL
+                'id': str,  # 영상 ID (알 수 없으면 None)
+                'ie_key': str,  # extractor 키 (알 수 없으면 None)
+                'title': str,  # 제목 (알 수 없으면 None)
+                'info': dict  # 이미 추출/처리된 info dict (단일 영상 URL일 때만, 그 외 None)
+            }
+        """
+        with ydl_pool.acquire(self._build_opts()) as ydl:
+            yield from self._expand(ydl, url, depth=0)
+
+    def _expand(self, ydl, url, depth):
+        # process=False: 플레이리스트 항목을 resolve하지 않고 extractor의 generator를 그대로 받음
+        result = ydl.extract_info(url, download=False, process=False)
+        if result is None:
+            return
+
+        result_type = result.get('_type', 'video')
+
+        if result_type in ('url', 'url_transparent') and depth < self.MAX_DEPTH:
+            # 다른 URL로 위임된 결과 (예: 채널 → 동영상 탭)
+            yield from self._expand(ydl, result['url'], depth + 1)
+            return
+
+        if result_type not in ('playlist', 'multi_video'):
+            # 단일 영상: 이미 추출한 정보를 넘겨 다운로드 시 재추출 방지
+            # process=False 결과는 포맷 정렬/필터링 전이므로 처리한 뒤 넘김 (크기 추정, 워커 계획, 스트림 분배가
+            # 정렬된 포맷을 사용). 포맷 선택 결과는 info_cache와 같이 제거해 다운로드 옵션으로 다시 선택되도록 함
+            info = None
+            if result_type == 'video':
+                info = ydl.sanitize_info(ydl.process_ie_result(result, download=False), remove_private_keys=True)
+            yield {
+                'url': url,
+                'id': result.get('id'),
+                'ie_key': result.get('extractor_key'),
+                'title': result.get('title'),
+                'info': info,
+            }
+            return
+
+        print(f"[Playlist] 확장 시작: {result.get('title') or url}")
+        count = 0
+        for entry in result.get('entries') or []:
+            if not entry:
+                continue
+
+            entry_url = entry.get('url') or entry.get('webpage_url')
+
+            if entry.get('_type') == 'playlist':
+                # 중첩 플레이리스트가 resolve된 상태로 온 경우
+                for sub_entry in entry.get('entries') or []:
+                    if sub_entry and (sub_entry.get('url') or sub_entry.get('webpage_url')):
+                        count += 1
+                        yield self._make_item(sub_entry)
+                continue
+
+            if not entry_url:
+                continue
+
+            if depth < self.MAX_DEPTH and self._is_playlist_url(ydl, entry):
+                # 채널의 탭처럼 목록을 가리키는 항목은 재귀적으로 확장
+                yield from self._expand(ydl, entry_url, depth + 1)
+                continue
+
+            count += 1
+            yield self._make_item(entry)
+
+        print(f"[Playlist] 확장 완료: {count}개 항목")
+
+    @staticmethod
+    def _make_item(entry):
+        return {
+            'url': entry.get('url') or entry.get('webpage_url'),
+            'id': entry.get('id'),
+            'ie_key': entry.get('ie_key'),
+            'title': entry.get('title'),
+            'info': None,
+        }
+
+    @staticmethod
+    def _is_playlist_url(ydl, entry):
+        """flat 항목이 영상이 아닌 목록(플레이리스트/탭)을 가리키는지 확인"""
+        ie_key = entry.get('ie_key')
+        if not ie_key:
+            return False
+        try:
+            ie = ydl.get_info_extractor(ie_key)
+        except Exception:
+            return False
+        return ie.is_single_video(entry['url']) is False
@@ -0,0 +1,167 @@
+"""
+다운로드 진행 이벤트 모듈
+
+yt-dlp progress hook은 조각(fragment)/청크마다 호출되므로 동시 조각 다운로드가 많으면
+초당 수백 번 호출됩니다. 이 모듈은 hook 데이터를 구조화된 이벤트 dict로 변환하고,
+워커 스레드에서 스트림별 최신 이벤트만 남겨 정해진 주기(기본 10Hz)로만 전달합니다.
+완료/오류 이벤트는 주기와 관계없이 즉시 전달합니다.
+영상/오디오를 동시에 받을 때는 스트림들을 합친 이벤트 하나로 전달할 수 있습니다.
+"""
+import threading
+import time
+
+
+def make_progress_event(d):
+    """
+    yt-dlp progress hook 데이터를 진행 이벤트로 변환
+
+    Args:
+        d: yt-dlp progress hook dict
+
+    Returns:
+        dict: {
+            'stream_id': str,  # 스트림 구분 (포맷 ID, 영상+오디오 분리 다운로드 시 각각 다름)
+            'status': str,  # 'downloading', 'finished', 'error'
+            'downloaded_bytes': int,  # 받은 바이트
+            'total_bytes': int,  # 전체 바이트 (모르면 None, 추정치 포함)
+            'speed': float,  # bytes/s (모르면 None)
+            'eta': float,  # 남은 시간 초 (모르면 None)
+            'percent': float,  # 0-100
+            'filename': str  # 저장 파일 경로
+        }
+    """
+    info = d.get('info_dict') or {}
+    downloaded = d.get('downloaded_bytes') or 0
+    total = d.get('total_bytes') or d.get('total_bytes_estimate')
+
+    if d.get('status') == 'finished':
+        percent = 100.0
+    elif total:
+        percent = min(100.0, downloaded * 100.0 / total)
+    elif d.get('fragment_count'):
+        percent = min(100.0, (d.get('fragment_index') or 0) * 100.0 / d['fragment_count'])
+    else:
+        percent = 0.0
+
+    return {
+        'stream_id': info.get('format_id') or d.get('filename'),
+        'status': d.get('status'),
+        'downloaded_bytes': downloaded,
+        'total_bytes': total,
+        'speed': d.get('speed'),
+        'eta': d.get('eta'),
+        'percent': percent,
+        'filename': d.get('filename'),
+    }
+
+
+def combine_progress_events(events):
+    """
+    동시에 받는 여러 스트림의 최신 이벤트를 하나로 합침
+
+    바이트 수와 속도는 합계, ETA는 가장 늦은 스트림 기준입니다.
+    모든 스트림이 끝나야 'finished', 하나라도 오류면 'error'입니다.
+
+    Args:
+        events: 스트림별 최신 이벤트 목록 (make_progress_event 형식)
+
+    Returns:
+        dict: make_progress_event 형식 (stream_id는 '137+140'처럼 스트림 ID를 +로 연결)
+    """
+    if len(events) == 1:
+        return events[0]
+
+    statuses = {event['status'] for event in events}
+    if 'error' in statuses:
+        status = 'error'
+    elif statuses == {'finished'}:
+        status = 'finished'
+    else:
+        status = 'downloading'
+
+    downloaded = sum(event['downloaded_bytes'] for event in events)
+    totals = [event['total_bytes'] for event in events]
+    total = sum(totals) if all(totals) else None
+    active = [event for event in events if event['status'] == 'downloading']
+    speeds = [event['speed'] for event in active if event['speed']]
+    etas = [event['eta'] for event in active if event['eta'] is not None]
+
+    if status == 'finished':
+        percent = 100.0
+    elif total:
+        percent = min(100.0, downloaded * 100.0 / total)
+    else:
+        percent = sum(event['percent'] for event in events) / len(events)
+
+    return {
+        'stream_id': '+'.join(str(event['stream_id']) for event in events),
+        'status': status,
+        'downloaded_bytes': downloaded,
+        'total_bytes': total,
+        'speed': sum(speeds) if speeds else None,
+        'eta': max(etas) if etas else None,
+        'percent': percent,
+        'filename': events[0]['filename'],
+    }
+
+
+class ProgressCoalescer:
+    """스트림별 최신 진행 이벤트만 남겨 일정 주기로 전달"""
+
+    # 기본 전달 주기 (초) - 10Hz
+    DEFAULT_INTERVAL = 0.1
+
+    def __init__(self, callback, interval=None, combine_streams=False):
+        """
+        Args:
+            callback: 이벤트 dict를 받는 함수 (hook을 호출한 워커 스레드에서 호출됨)
+            interval: 최소 전달 간격 (초)
+            combine_streams: True이면 스트림별 이벤트 대신 합친 이벤트 하나만 전달
+                             (영상/오디오 동시 다운로드)
+        """
+        self.callback = callback
+        self.interval = self.DEFAULT_INTERVAL if interval is None else interval
+        self.combine_streams = combine_streams
+        self._pending = {}  # stream_id -> 아직 전달하지 않은 최신 이벤트
+        self._streams = {}  # stream_id -> 최신 이벤트 (combine_streams일 때 전달 후에도 유지)
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+
+        # 통계 (받은 hook 수 / 전달한 이벤트 수)
+        self.received = 0
+        self.emitted = 0
+
+    def update(self, event):
+        """이벤트 추가 (주기가 지났거나 완료/오류 이벤트면 즉시 전달)"""
+        now = time.monotonic()
+        with self._lock:
+            self.received += 1
+            self._pending[event['stream_id']] = event
+            if self.combine_streams:
+                self._streams[event['stream_id']] = event
+            if event['status'] == 'downloading' and now - self._last_emit < self.interval:
+                return
+            events = self._take_pending()
+            self._last_emit = now
+            self.emitted += len(events)
+
+        for pending_event in events:
+            self.callback(pending_event)
+
+    def flush(self):
+        """남아 있는 이벤트 전달 (다운로드 종료 시)"""
+        with self._lock:
+            events = self._take_pending()
+            self._last_emit = time.monotonic()
+            self.emitted += len(events)
+
+        for event in events:
+            self.callback(event)
+
+    def _take_pending(self):
+        """전달할 이벤트 목록 (self._lock 잠금 상태에서 호출)"""
+        events = list(self._pending.values())
+        self._pending.clear()
+        if self.combine_streams and events:
+            return [combine_progress_events(list(self._streams.values()))]
+        return events
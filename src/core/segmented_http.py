@@ -0,0 +1,362 @@
+"""
+분할(Range) HTTP 다운로드 모듈
+
+큰 파일(FFmpeg 압축 파일 등)을 여러 HTTP Range 연결로 나누어 동시에 받습니다.
+
+- 받는 중인 파일(.part)과 진행 상황 파일(.part.json)을 남겨 중단 후 이어받기
+- 서버가 Range를 지원하지 않으면 단일 연결로 받음
+- 큰 버퍼(1MB)로 읽고, 지정한 SHA-256과 다르면 파일을 버림
+
+HttpRangeFile은 원격 파일을 seek 가능한 파일 객체로 열어 필요한 구간만 받습니다.
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+class ChecksumMismatchError(Exception):
+    """다운로드한 파일의 SHA-256이 예상 값과 다름"""
+
+
+class SegmentedDownloader:
+    """Range 요청 기반 분할 다운로드 (이어받기 + 무결성 검증)"""
+
+    # 동시 연결 수
+    DEFAULT_SEGMENTS = 4
+
+    # 연결 하나가 맡는 최소 크기 (작은 파일은 연결 수를 줄임)
+    MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+
+    # 한 번에 읽고 쓰는 크기
+    CHUNK_SIZE = 1024 * 1024
+
+    # 진행 상황 파일 저장 간격 (초)
+    STATE_SAVE_INTERVAL = 1.0
+
+    def __init__(self, segments=None, timeout=30, retries=3, session=None):
+        """
+        Args:
+            segments: 동시 연결 수
+            timeout: 연결/읽기 타임아웃 (초)
+            retries: 연결이 끊겼을 때 구간별 재시도 횟수 (받은 위치부터 이어받음)
+            session: requests.Session (None이면 새로 생성)
+        """
+        import requests
+
+        self.segments = segments or self.DEFAULT_SEGMENTS
+        self.timeout = timeout
+        self.retries = retries
+        self.session = session or requests.Session()
+
+        self._lock = threading.Lock()
+        self._downloaded = 0
+        self._total = 0
+        self._progress_callback = None
+        self._last_state_save = 0.0
+
+    def download(self, url, dest_path, progress_callback=None, expected_sha256=None):
+        """
+        파일 다운로드
+
+        Args:
+            url: 다운로드 URL
+            dest_path: 저장 경로 (완료 전까지는 dest_path + ".part"에 기록)
+            progress_callback: 진행 콜백 (downloaded_bytes, total_bytes) - total을 모르면 0
+            expected_sha256: 예상 SHA-256 (hex, None이면 검증 생략)
+
+        Returns:
+            Path: 저장된 파일 경로
+        """
+        dest_path = Path(dest_path)
+        part_path = dest_path.with_name(dest_path.name + ".part")
+        state_path = dest_path.with_name(dest_path.name + ".part.json")
+
+        self._progress_callback = progress_callback
+        self._downloaded = 0
+
+        start = time.time()
+        final_url, total, validator = self._probe(url)
+
+        if total:
+            # 작은 파일도 구간 1개로 받아 이어받기 가능하게 함
+            self._download_ranged(final_url, part_path, state_path, total, validator)
+        else:
+            self._download_single(final_url, part_path)
+            state_path.unlink(missing_ok=True)
+
+        duration = max(time.time() - start, 0.001)
+        size = part_path.stat().st_size
+        print(f"[HTTP] 다운로드 완료: {size / 1024 / 1024:.1f}MB, {duration:.1f}초 "
+              f"({size / 1024 / 1024 / duration:.1f}MB/s)")
+
+        if expected_sha256:
+            actual = self.sha256_file(part_path)
+            if actual.lower() != expected_sha256.lower():
+                part_path.unlink(missing_ok=True)
+                state_path.unlink(missing_ok=True)
+                raise ChecksumMismatchError(f"SHA-256 불일치: 예상 {expected_sha256}, 실제 {actual}")
+            print(f"[HTTP] SHA-256 확인 완료: {actual}")
+
+        os.replace(part_path, dest_path)
+        state_path.unlink(missing_ok=True)
+        return dest_path
+
+    def _probe(self, url):
+        """
+        파일 크기와 Range 지원 여부 확인 (리다이렉트를 따라간 최종 URL 사용)
+
+        Returns:
+            tuple: (최종 URL, 전체 크기 (Range 미지원이면 0), 파일 식별자 (ETag/Last-Modified))
+        """
+        with self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True,
+                              timeout=self.timeout, allow_redirects=True) as response:
+            response.raise_for_status()
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified') or ""
+
+            content_range = response.headers.get('Content-Range', '')
+            if response.status_code == 206 and '/' in content_range:
+                total = content_range.rsplit('/', 1)[1]
+                if total.isdigit():
+                    return response.url, int(total), validator
+
+            print("[HTTP] 서버가 Range 요청을 지원하지 않음 - 단일 연결로 다운로드")
+            return response.url, 0, validator
+
+    def _download_single(self, url, part_path):
+        """단일 연결 다운로드 (Range 미지원 서버)"""
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            self._total = int(response.headers.get('Content-Length') or 0)
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        self._add_progress(len(chunk))
+
+    def _download_ranged(self, url, part_path, state_path, total, validator):
+        """Range 분할 다운로드 (이전 진행 상황이 같은 파일이면 이어받기)"""
+        self._total = total
+        state = self._load_state(state_path, total, validator) if part_path.exists() else None
+
+        if state is None:
+            count = max(1, min(self.segments, total // self.MIN_SEGMENT_SIZE))
+            segment_size = -(-total // count)  # 올림 나눗셈
+            state = {
+                'total': total,
+                'validator': validator,
+                'segments': [
+                    [start, min(start + segment_size, total) - 1, 0]  # [시작, 끝(포함), 받은 바이트]
+                    for start in range(0, total, segment_size)
+                ],
+            }
+            # 전체 크기로 미리 할당하여 구간별로 제자리에 기록
+            with open(part_path, 'wb') as f:
+                f.truncate(total)
+            print(f"[HTTP] 분할 다운로드: {total / 1024 / 1024:.1f}MB, 연결 {len(state['segments'])}개")
+        else:
+            resumed = sum(segment[2] for segment in state['segments'])
+            self._downloaded = resumed
+            print(f"[HTTP] 이어받기: {resumed / 1024 / 1024:.1f}MB / {total / 1024 / 1024:.1f}MB")
+
+        self._last_state_save = 0.0
+        self._save_state(state_path, state)
+
+        with ThreadPoolExecutor(max_workers=len(state['segments']), thread_name_prefix="segment") as executor:
+            futures = [
+                executor.submit(self._download_segment, url, part_path, state_path, state, segment)
+                for segment in state['segments']
+                if segment[0] + segment[2] <= segment[1]
+            ]
+            errors = [future.exception() for future in futures if future.exception() is not None]
+
+        self._save_state(state_path, state, force=True)
+        if errors:
+            # 진행 상황 파일은 남겨 두어 다음 시도에서 이어받음
+            raise errors[0]
+
+    def _download_segment(self, url, part_path, state_path, state, segment):
+        """구간 하나 다운로드 (연결이 끊기면 받은 위치부터 재시도)"""
+        attempt = 0
+        while True:
+            position = segment[0] + segment[2]
+            if position > segment[1]:
+                return
+            try:
+                headers = {'Range': f"bytes={position}-{segment[1]}"}
+                with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise IOError(f"Range 응답이 아님 (HTTP {response.status_code})")
+                    with open(part_path, 'r+b') as f:
+                        f.seek(position)
+                        for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                            if not chunk:
+                                continue
+                            # 서버가 요청보다 많이 보내도 구간을 넘지 않도록 자름
+                            chunk = chunk[:segment[1] - (segment[0] + segment[2]) + 1]
+                            f.write(chunk)
+                            # 진행 상황 파일에 기록되는 위치보다 파일 내용이 뒤처지지 않도록 바로 기록
+                            f.flush()
+                            with self._lock:
+                                segment[2] += len(chunk)
+                            self._add_progress(len(chunk))
+                            self._save_state(state_path, state)
+                            if segment[0] + segment[2] > segment[1]:
+                                break
+                # 구간 끝 전에 응답이 끝나면 (연결 종료 등) 받은 위치부터 재시도
+                if segment[0] + segment[2] <= segment[1]:
+                    raise IOError(f"구간 끝 전에 응답 종료 ({segment[0] + segment[2]}/{segment[1] + 1})")
+            except Exception as e:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                print(f"[HTTP] 구간 {segment[0]}-{segment[1]} 재시도 ({attempt}/{self.retries}): {e}")
+                time.sleep(min(2 ** attempt, 10))
+
+    def _add_progress(self, size):
+        with self._lock:
+            self._downloaded += size
+            downloaded = self._downloaded
+        if self._progress_callback:
+            self._progress_callback(downloaded, self._total)
+
+    @staticmethod
+    def _load_state(state_path, total, validator):
+        """이전 진행 상황 읽기 (같은 파일이 아니면 None)"""
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('total') != total or state.get('validator') != validator:
+            print("[HTTP] 서버 파일이 변경되어 처음부터 다시 받음")
+            return None
+        return state
+
+    def _save_state(self, state_path, state, force=False):
+        """진행 상황 저장 (STATE_SAVE_INTERVAL마다, 임시 파일에 쓴 뒤 교체)"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_state_save < self.STATE_SAVE_INTERVAL:
+                return
+            self._last_state_save = now
+            data = json.dumps(state)
+
+            temp_path = state_path.with_name(state_path.name + ".tmp")
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, state_path)
+
+    @staticmethod
+    def sha256_file(path):
+        """파일의 SHA-256 계산 (hex)"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(SegmentedDownloader.CHUNK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fetch_sha256(self, checksums_url, filename):
+        """
+        체크섬 목록 파일("<sha256>  <파일 이름>" 형식)에서 파일의 SHA-256 조회
+
+        Args:
+            checksums_url: 체크섬 목록 URL (예: BtbN 릴리스의 checksums.sha256)
+            filename: 찾을 파일 이름
+
+        Returns:
+            str: SHA-256 (hex, 목록에 없으면 None)
+        """
+        response = self.session.get(checksums_url, timeout=self.timeout)
+        response.raise_for_status()
+        for line in response.text.splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and parts[-1].lstrip('*') == filename:
+                return parts[0]
+        return None
+
+
+class HttpRangeFile(io.RawIOBase):
+    """
+    HTTP Range 요청으로 읽는 seek 가능한 읽기 전용 파일
+
+    zipfile처럼 파일 끝(중앙 디렉토리)과 필요한 부분만 읽는 라이브러리에 전달하면
+    압축 파일 전체를 받지 않고 필요한 구간만 받습니다.
+    연속해서 읽는 동안에는 열어 둔 응답 하나를 계속 사용하고, 다른 위치로 이동하면 새로 요청합니다.
+    """
+
+    def __init__(self, url, session=None, timeout=30):
+        import requests
+
+        super().__init__()
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.bytes_fetched = 0  # 실제로 받은 바이트 수
+
+        with self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True,
+                              timeout=timeout, allow_redirects=True) as response:
+            response.raise_for_status()
+            content_range = response.headers.get('Content-Range', '')
+            total = content_range.rsplit('/', 1)[-1]
+            if response.status_code != 206 or not total.isdigit():
+                raise IOError("서버가 Range 요청을 지원하지 않음")
+            self.url = response.url
+            self.size = int(total)
+
+        self._pos = 0
+        self._response = None
+        self._stream_pos = None  # 열어 둔 응답의 현재 위치
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self.size + offset
+        return self._pos
+
+    def readinto(self, buffer):
+        if self._pos >= self.size:
+            return 0
+
+        if self._response is None or self._stream_pos != self._pos:
+            self._close_response()
+            self._response = self.session.get(self.url, headers={'Range': f"bytes={self._pos}-"},
+                                              stream=True, timeout=self.timeout)
+            self._response.raise_for_status()
+            if self._response.status_code != 206:
+                raise IOError(f"Range 응답이 아님 (HTTP {self._response.status_code})")
+            self._stream_pos = self._pos
+
+        data = self._response.raw.read(min(len(buffer), self.size - self._pos))
+        if not data:
+            raise IOError("응답이 예상보다 일찍 끝남")
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        self._stream_pos = self._pos
+        self.bytes_fetched += len(data)
+        return len(data)
+
+    def _close_response(self):
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def close(self):
+        self._close_response()
+        super().close()
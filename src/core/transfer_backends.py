@@ -0,0 +1,136 @@
+"""
+전송 백엔드 선택 모듈
+
+전송 형식(https, m3u8, dash)마다 다운로드를 수행할 백엔드를 고릅니다.
+
+- native: yt-dlp 내장 다운로더 (HttpFD/SegmentedHttpFD, HlsFD, DashSegmentsFD)
+- aria2c: 외부 aria2c (단일 파일 https만 지원, 서버당 연결 수/분할 수 설정)
+- ffmpeg: 외부 ffmpeg (HLS만, HLS 디먹서의 다중 연결/지속 연결 설정)
+
+선택은 yt-dlp의 external_downloader / external_downloader_args 옵션(형식별 dict)으로
+전달되므로 yt-dlp가 형식마다 알맞은 다운로더를 고릅니다. 형식별 최적 백엔드는
+NetworkBenchmark.run_backend_benchmark로 측정해 config의 transfer_backends에 저장합니다.
+"""
+import shutil
+
+
+class TransferBackends:
+    """전송 형식별 다운로드 백엔드"""
+
+    # 벤치마크/설정의 전송 형식 → yt-dlp external_downloader dict 키 (yt-dlp가 https를 http로 줄여 씀)
+    PROTOCOLS = {
+        'https': 'http',
+        'm3u8': 'm3u8',
+        'dash': 'dash',
+    }
+
+    # 백엔드별 지원 전송 형식 (yt-dlp의 Aria2cFD는 http/https만, ffmpeg는 HLS 용도로만 사용)
+    BACKENDS = {
+        'native': ('https', 'm3u8', 'dash'),
+        'aria2c': ('https',),
+        'ffmpeg': ('m3u8',),
+    }
+
+    DEFAULT = 'native'
+
+    @staticmethod
+    def executable(name):
+        """
+        외부 백엔드 실행 파일 경로
+
+        Args:
+            name: 백엔드 이름 (aria2c, ffmpeg)
+
+        Returns:
+            str: 실행 파일 경로 (없으면 None)
+        """
+        from .config import config
+
+        if name == 'aria2c':
+            return config.get("aria2c_path") or shutil.which("aria2c")
+        if name == 'ffmpeg':
+            from .ffmpeg_installer import FFmpegInstaller
+            return FFmpegInstaller.check_ffmpeg()
+        return None
+
+    @staticmethod
+    def available_backends(protocol):
+        """
+        전송 형식에 사용할 수 있는 백엔드 목록 (native가 항상 첫 번째)
+
+        Args:
+            protocol: 전송 형식 (https, m3u8, dash)
+
+        Returns:
+            list: 백엔드 이름 목록
+        """
+        return [
+            name for name, protocols in TransferBackends.BACKENDS.items()
+            if protocol in protocols and (name == TransferBackends.DEFAULT or TransferBackends.executable(name))
+        ]
+
+    @staticmethod
+    def build_args(name):
+        """
+        백엔드별 연결/분할 설정 → yt-dlp external_downloader_args 항목
+
+        yt-dlp의 aria2c 명령에는 기본값(-x16 -s16 -k1M) 뒤에 이 인자가 붙으므로 설정값이 우선합니다.
+
+        Args:
+            name: 백엔드 이름
+
+        Returns:
+            dict: {external_downloader_args 키: [인자, ...]}
+        """
+        from .config import config
+
+        if name == 'aria2c':
+            return {'aria2c': [
+                '--max-connection-per-server', str(config.get("aria2c_connections")),
+                '--split', str(config.get("aria2c_split")),
+                '--min-split-size', f'{config.get("aria2c_min_split_size_mb")}M',
+            ]}
+        if name == 'ffmpeg':
+            # HLS 세그먼트를 연결 여러 개/지속 연결로 받음 (입력 옵션이므로 -i 앞에 붙는 ffmpeg_i 키)
+            multiple = '1' if config.get("ffmpeg_hls_multiple_connections") else '0'
+            return {'ffmpeg_i': ['-http_persistent', '1', '-http_multiple', multiple]}
+        return {}
+
+    @staticmethod
+    def apply(ydl_opts, selection):
+        """
+        형식별 백엔드 선택을 yt-dlp 옵션에 적용
+
+        native만 선택된 경우 옵션을 추가하지 않습니다 (yt-dlp 기본 동작).
+        실행 파일을 찾을 수 없는 백엔드는 native로 대체합니다.
+
+        Args:
+            ydl_opts: yt-dlp 옵션 dict (직접 수정)
+            selection: {전송 형식: 백엔드 이름} (config의 transfer_backends)
+
+        Returns:
+            dict: 실제로 적용된 {전송 형식: 백엔드 이름}
+        """
+        applied = {}
+        downloaders = {}
+        downloader_args = {}
+        for protocol, key in TransferBackends.PROTOCOLS.items():
+            name = (selection or {}).get(protocol) or TransferBackends.DEFAULT
+            if name != TransferBackends.DEFAULT:
+                path = TransferBackends.executable(name) if protocol in TransferBackends.BACKENDS.get(name, ()) else None
+                if not path:
+                    print(f"[Backend] {protocol}: {name}을(를) 사용할 수 없어 native로 대체")
+                    name = TransferBackends.DEFAULT
+                else:
+                    # aria2c는 경로를 그대로 넘기면 yt-dlp가 해당 실행 파일 사용, ffmpeg는 ffmpeg_location으로 지정
+                    downloaders[key] = path if name == 'aria2c' else name
+                    downloader_args.update(TransferBackends.build_args(name))
+                    if name == 'ffmpeg':
+                        ydl_opts.setdefault('ffmpeg_location', path)
+            applied[protocol] = name
+
+        if downloaders:
+            # dict에 없는 형식은 yt-dlp 기본 다운로더 사용
+            ydl_opts['external_downloader'] = downloaders
+            ydl_opts['external_downloader_args'] = downloader_args
+        return applied
@@ -0,0 +1,764 @@
+"""
+yt-dlp 다운로더 확장 모듈
+
+yt-dlp의 프래그먼트 다운로더(HLS, DASH)를 상속해 다운로드 중에 동시 프래그먼트 수를
+조절하는 적응형 다운로더와, 이를 선택하는 YoutubeDL 하위 클래스를 제공합니다.
+
+고정된 concurrent_fragment_downloads는 CDN이 연결 단위로 제한할 때는 부족하고
+IP 단위로 제한할 때는 과해서(429, 연결 끊김) 어느 한쪽에서는 손해를 봅니다.
+적응형 다운로더는 프래그먼트별 처리량과 오류/429 비율을 보고
+AIMD(가산 증가, 곱셈 감소)로 활성 워커 수를 조절합니다.
+
+bestvideo+bestaudio처럼 여러 포맷을 받아 병합하는 경우 yt-dlp는 포맷을 차례로 받지만,
+ExtendedYoutubeDL은 작업의 연결 예산을 나누어 모든 포맷을 동시에 받을 수 있습니다.
+
+프래그먼트가 없는 단일 파일(progressive/https) 포맷은 SegmentedHttpFD가
+HTTP Range 요청 여러 개로 나누어 받습니다 (segmented_http.SegmentedDownloader와 같은 방식).
+
+외부 다운로더(aria2c, ffmpeg - transfer_backends.TransferBackends로 선택)는 실행 중
+임시 파일 크기로 진행 상황을 보고하도록 감싸므로 취소와 벤치마크 측정이 내장 다운로더와 같게 동작합니다.
+
+후처리는 병합과 메타데이터/썸네일/자막 삽입을 ydl_postprocessors.SinglePassPP 하나로 모아
+출력 파일을 한 번만 쓰도록 할 수 있습니다.
+
+yt_dlp를 모듈 수준에서 import하므로 ydl_pool이 첫 인스턴스를 만들 때만 불러옵니다.
+"""
+import contextlib
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+import yt_dlp
+from yt_dlp.downloader import get_suitable_downloader
+from yt_dlp.downloader.dash import DashSegmentsFD
+from yt_dlp.downloader.external import Aria2cFD, FFmpegFD
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.downloader.http import HttpFD
+from yt_dlp.networking import Request
+from yt_dlp.networking.exceptions import HTTPError, RequestError, TransportError
+from yt_dlp.postprocessor.ffmpeg import FFmpegMergerPP, FFmpegPostProcessor
+from yt_dlp.utils import DownloadCancelled, Popen
+
+from .segmented_http import SegmentedDownloader
+from .ydl_postprocessors import SinglePassPP
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD 방식의 동시 프래그먼트 수 제어기
+
+    워커 스레드는 프래그먼트마다 acquire()로 슬롯을 얻고 release()로 결과(크기, 오류)를 알립니다.
+    완료된 프래그먼트가 max(MIN_WINDOW, 현재 한도)개 모일 때마다 구간 처리량과 오류를 보고
+    한도를 조절합니다.
+
+    - 오류(429, 5xx, 연결 오류)가 있었으면 한도를 DECREASE_FACTOR배로 감소
+    - 처리량이 이전 구간보다 DROP_RATIO 이상 떨어졌으면 감소 (직전 조치가 감소였으면 유지)
+    - 직전 증가로 얻은 처리량 향상이 GAIN_RATIO 미만이면 유지 (포화 상태)
+    - 그 외에는 1 증가
+    """
+
+    # 판단에 필요한 최소 완료 프래그먼트 수
+    MIN_WINDOW = 4
+
+    # 감소 시 곱하는 비율
+    DECREASE_FACTOR = 0.5
+
+    # 감소로 판단하는 처리량 하락 비율
+    DROP_RATIO = 0.15
+
+    # 증가를 계속하는 데 필요한 처리량 향상 비율
+    GAIN_RATIO = 0.05
+
+    def __init__(self, initial, maximum, minimum=1):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.initial = min(max(self.minimum, initial), self.maximum)
+        self.limit = self.initial
+
+        self.active = 0
+        self.history = [self.initial]  # 한도 변경 기록
+        self.increases = 0
+        self.decreases = 0
+        self.fragments = 0  # 완료(성공/실패)된 프래그먼트 수
+        self.errors = 0
+        self.throttled = 0  # 429 응답 수
+
+        self._condition = threading.Condition()
+        self._last_action = None  # 'increase' / 'decrease' / 'hold'
+        self._last_speed = None  # 이전 구간 처리량 (bytes/s)
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+        self._window_count = 0
+        self._window_errors = 0
+
+        # 시간 가중 평균 한도 계산용
+        self._started = self._window_start
+        self._limit_since = self._window_start
+        self._limit_seconds = 0.0
+
+    def acquire(self):
+        """활성 프래그먼트 수가 한도 아래가 될 때까지 대기"""
+        with self._condition:
+            while self.active >= self.limit:
+                self._condition.wait()
+            self.active += 1
+
+    def release(self, size=0, error_status=None):
+        """
+        프래그먼트 완료 알림
+
+        Args:
+            size: 받은 바이트 수 (실패 시 0)
+            error_status: 실패한 경우 HTTP 상태 코드 (HTTP 오류가 아니면 0, 성공이면 None)
+        """
+        with self._condition:
+            self.active -= 1
+            self.fragments += 1
+            self._window_count += 1
+            if error_status is None:
+                self._window_bytes += size
+            else:
+                self.errors += 1
+                self._window_errors += 1
+                if error_status == 429:
+                    self.throttled += 1
+
+            if self._window_count >= max(self.MIN_WINDOW, self.limit):
+                self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self):
+        """구간 결과로 한도 조절 (self._condition 잠금 상태에서 호출)"""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        speed = self._window_bytes / elapsed if elapsed > 0 else 0
+
+        if self._window_errors:
+            action = 'decrease'
+        elif (self._last_speed and speed < self._last_speed * (1 - self.DROP_RATIO)
+              and self._last_action != 'decrease'):
+            action = 'decrease'
+        elif (self._last_action == 'increase' and self._last_speed
+              and speed < self._last_speed * (1 + self.GAIN_RATIO)):
+            action = 'hold'
+        else:
+            action = 'increase'
+
+        if action == 'decrease':
+            new_limit = max(self.minimum, int(self.limit * self.DECREASE_FACTOR))
+        elif action == 'increase':
+            new_limit = min(self.maximum, self.limit + 1)
+        else:
+            new_limit = self.limit
+
+        if new_limit > self.limit:
+            self.increases += 1
+        elif new_limit < self.limit:
+            self.decreases += 1
+        if new_limit != self.limit:
+            self._set_limit(new_limit, now)
+
+        self._last_action = action
+        self._last_speed = speed
+        self._window_start = now
+        self._window_bytes = 0
+        self._window_count = 0
+        self._window_errors = 0
+
+    def _set_limit(self, limit, now):
+        self._limit_seconds += self.limit * (now - self._limit_since)
+        self._limit_since = now
+        self.limit = limit
+        self.history.append(limit)
+
+    def summary(self):
+        """
+        조절 결과 요약 (작업 telemetry에 기록)
+
+        Returns:
+            dict: {'initial', 'final', 'min', 'max', 'average', 'increases', 'decreases',
+                   'fragments', 'errors', 'throttled'}
+        """
+        with self._condition:
+            now = time.monotonic()
+            total = now - self._started
+            limit_seconds = self._limit_seconds + self.limit * (now - self._limit_since)
+            return {
+                'initial': self.initial,
+                'final': self.limit,
+                'min': min(self.history),
+                'max': max(self.history),
+                'average': round(limit_seconds / total, 2) if total > 0 else float(self.limit),
+                'increases': self.increases,
+                'decreases': self.decreases,
+                'fragments': self.fragments,
+                'errors': self.errors,
+                'throttled': self.throttled,
+            }
+
+
+class AdaptiveFragmentMixin:
+    """
+    프래그먼트 다운로더에 AdaptiveConcurrency를 적용하는 mixin
+
+    params['adaptive_fragments'] = {'initial': int, 'maximum': int, 'on_report': callable | None}
+
+    스레드 풀은 최대 워커 수로 만들고, 각 프래그먼트 요청 전에 제어기의 슬롯을 얻게 하여
+    실제로 동시에 진행되는 요청 수만 조절합니다.
+    """
+
+    def real_download(self, filename, info_dict):
+        settings = self.params.get('adaptive_fragments') or {}
+        maximum = settings.get('maximum') or self.params.get('concurrent_fragment_downloads') or 1
+        self._concurrency = AdaptiveConcurrency(settings.get('initial') or maximum, maximum)
+        # yt-dlp는 다운로드 시작 시 이 값으로 스레드 풀 크기를 정함 (다른 작업과 공유하지 않도록 복사)
+        self.params = dict(self.params, concurrent_fragment_downloads=self._concurrency.maximum)
+        try:
+            return super().real_download(filename, info_dict)
+        finally:
+            summary = self._concurrency.summary()
+            print(f"[Adaptive] 프래그먼트 {summary['fragments']}개: 워커 {summary['initial']} → {summary['final']}개 "
+                  f"(범위 {summary['min']}~{summary['max']}, 평균 {summary['average']}, "
+                  f"증가 {summary['increases']}회, 감소 {summary['decreases']}회, "
+                  f"오류 {summary['errors']}회, 429 {summary['throttled']}회)")
+            on_report = settings.get('on_report')
+            if on_report:
+                on_report(summary)
+
+    def _download_fragment(self, ctx, frag_url, info_dict, headers=None, request_data=None):
+        concurrency = getattr(self, '_concurrency', None)
+        if concurrency is None:
+            return super()._download_fragment(ctx, frag_url, info_dict, headers, request_data)
+
+        concurrency.acquire()
+        size = 0
+        error_status = 0
+        try:
+            success = super()._download_fragment(ctx, frag_url, info_dict, headers, request_data)
+            if success:
+                error_status = None
+                try:
+                    size = os.path.getsize(ctx['fragment_filename_sanitized'])
+                except OSError:
+                    pass
+            return success
+        except HTTPError as e:
+            error_status = e.status
+            raise
+        finally:
+            concurrency.release(size, error_status)
+
+
+class AdaptiveHlsFD(AdaptiveFragmentMixin, HlsFD):
+    pass
+
+
+class AdaptiveDashSegmentsFD(AdaptiveFragmentMixin, DashSegmentsFD):
+    pass
+
+
+# yt-dlp 기본 다운로더 → 적응형 다운로더
+ADAPTIVE_DOWNLOADERS = {
+    HlsFD: AdaptiveHlsFD,
+    DashSegmentsFD: AdaptiveDashSegmentsFD,
+}
+
+
+class SegmentedHttpFD(HttpFD):
+    """
+    단일 파일 포맷을 여러 Range 연결로 나누어 받는 다운로더
+
+    연결 수는 concurrent_fragment_downloads(벤치마크 프로필로 계획된 작업/스트림별 워커 수)를
+    사용합니다. 전체 크기로 미리 할당한 .part 파일의 각 위치에 구간을 직접 기록하고,
+    진행 상황(.part.json)을 남겨 실패한 구간만 받은 위치부터 다시 받습니다.
+
+    크기를 모르거나 Range를 지원하지 않는 서버, 작은 파일, 속도 제한이 있는 경우에는
+    yt-dlp 기본 HttpFD로 받습니다.
+    """
+
+    FD_NAME = 'segmented_http'
+
+    def real_download(self, filename, info_dict):
+        connections = self.params.get('concurrent_fragment_downloads') or 1
+        headers = dict(info_dict.get('http_headers') or {})
+        if (connections <= 1 or self.params.get('ratelimit') or info_dict.get('request_data')
+                or any(key.lower() == 'range' for key in headers)):
+            return super().real_download(filename, info_dict)
+
+        try:
+            url, total, validator, last_modified = self._probe(info_dict['url'], headers)
+        except RequestError as e:
+            self.write_debug(f'Range probe failed, falling back to single connection: {e}')
+            return super().real_download(filename, info_dict)
+        count = min(connections, total // SegmentedDownloader.MIN_SEGMENT_SIZE)
+        if count < 2:
+            return super().real_download(filename, info_dict)
+
+        tmpfilename = self.temp_name(filename)
+        state_path = f'{tmpfilename}.json'
+        state = None
+        if os.path.isfile(tmpfilename) and os.path.getsize(tmpfilename) == total:
+            state = SegmentedDownloader._load_state(state_path, total, validator)
+
+        if state is None:
+            segment_size = -(-total // count)  # 올림 나눗셈
+            state = {
+                'total': total,
+                'validator': validator,
+                'segments': [
+                    [start, min(start + segment_size, total) - 1, 0]  # [시작, 끝(포함), 받은 바이트]
+                    for start in range(0, total, segment_size)
+                ],
+            }
+            # 전체 크기로 미리 할당하여 구간별로 제자리에 기록
+            with open(tmpfilename, 'wb') as f:
+                f.truncate(total)
+            print(f"[SegmentedHTTP] 분할 다운로드: {total / 1024 / 1024:.1f}MB, 연결 {len(state['segments'])}개")
+        else:
+            resumed = sum(segment[2] for segment in state['segments'])
+            self.report_resuming_byte(resumed)
+            print(f"[SegmentedHTTP] 이어받기: {resumed / 1024 / 1024:.1f}MB / {total / 1024 / 1024:.1f}MB")
+
+        self.report_destination(filename)
+        progress = {
+            'lock': threading.Lock(),
+            'stop': threading.Event(),
+            'start': time.time(),
+            'resumed': sum(segment[2] for segment in state['segments']),
+            'last_save': 0.0,
+        }
+        chunk_size = (self.params.get('http_chunk_size')
+                      or (info_dict.get('downloader_options') or {}).get('http_chunk_size'))
+
+        remaining = [segment for segment in state['segments'] if segment[0] + segment[2] <= segment[1]]
+        with ThreadPoolExecutor(max_workers=max(1, len(remaining)), thread_name_prefix="segment") as executor:
+            futures = [
+                executor.submit(self._download_segment, url, headers, chunk_size, tmpfilename, state_path,
+                                state, segment, progress, filename, info_dict)
+                for segment in remaining
+            ]
+            # 한 구간이 재시도 후에도 실패하거나 취소되면 나머지 구간도 중단
+            # (진행 상황은 남겨 다음 시도에서 이어받음)
+            wait(futures, return_when=FIRST_EXCEPTION)
+            progress['stop'].set()
+        errors = [future.exception() for future in futures if future.exception() is not None]
+
+        self._save_segment_state(state_path, state, progress, force=True)
+        if errors:
+            raise errors[0]
+
+        self.try_rename(tmpfilename, filename)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        if self.params.get('updatetime'):
+            info_dict['filetime'] = self.try_utime(filename, last_modified)
+
+        elapsed = time.time() - progress['start']
+        self._hook_progress({
+            'downloaded_bytes': total,
+            'total_bytes': total,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': elapsed,
+            'ctx_id': info_dict.get('ctx_id'),
+        }, info_dict)
+        received = total - progress['resumed']
+        print(f"[SegmentedHTTP] 다운로드 완료: {total / 1024 / 1024:.1f}MB, {elapsed:.1f}초 "
+              f"({received / 1024 / 1024 / max(elapsed, 0.001):.1f}MB/s)")
+        return True
+
+    def _probe(self, url, headers):
+        """
+        파일 크기와 Range 지원 여부 확인 (리다이렉트를 따라간 최종 URL 사용)
+
+        Returns:
+            tuple: (최종 URL, 전체 크기 (Range 미지원이면 0), 파일 식별자, Last-Modified)
+        """
+        with self.ydl.urlopen(Request(url, headers=dict(headers, Range='bytes=0-0'))) as response:
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified') or ""
+            content_range = response.headers.get('Content-Range', '')
+            total = content_range.rsplit('/', 1)[-1]
+            if response.status != 206 or not total.isdigit():
+                return response.url, 0, validator, None
+            return response.url, int(total), validator, response.headers.get('Last-Modified')
+
+    def _download_segment(self, url, headers, chunk_size, tmpfilename, state_path, state, segment,
+                          progress, filename, info_dict):
+        """구간 하나 다운로드 (연결이 끊기면 받은 위치부터 재시도, chunk_size가 있으면 그 크기씩 요청)"""
+        retries = self.params.get('retries') or 0
+        attempt = 0
+        while not progress['stop'].is_set():
+            position = segment[0] + segment[2]
+            if position > segment[1]:
+                return
+            end = min(segment[1], position + chunk_size - 1) if chunk_size else segment[1]
+            try:
+                request = Request(url, headers=dict(headers, Range=f'bytes={position}-{end}'))
+                with self.ydl.urlopen(request) as response, open(tmpfilename, 'r+b') as f:
+                    if response.status != 206:
+                        raise OSError(f"Range 응답이 아님 (HTTP {response.status})")
+                    f.seek(position)
+                    while position <= end and not progress['stop'].is_set():
+                        block = response.read(min(SegmentedDownloader.CHUNK_SIZE, end - position + 1))
+                        if not block:
+                            break
+                        f.write(block)
+                        # 진행 상황 파일에 기록되는 위치보다 파일 내용이 뒤처지지 않도록 바로 기록
+                        f.flush()
+                        position += len(block)
+                        self._add_segment_progress(segment, len(block), state, state_path, progress,
+                                                   filename, tmpfilename, info_dict)
+                    if position <= end and not progress['stop'].is_set():
+                        raise TransportError("응답이 예상보다 일찍 끝남")
+                attempt = 0
+            except RequestError as e:
+                attempt += 1
+                if attempt > retries:
+                    raise
+                self.report_retry(e, attempt, retries)
+                time.sleep(min(2 ** attempt, 10))
+
+    def _add_segment_progress(self, segment, size, state, state_path, progress, filename, tmpfilename, info_dict):
+        with progress['lock']:
+            segment[2] += size
+            downloaded = sum(item[2] for item in state['segments'])
+        self._save_segment_state(state_path, state, progress)
+
+        now = time.time()
+        received = downloaded - progress['resumed']
+        self._hook_progress({
+            'status': 'downloading',
+            'downloaded_bytes': downloaded,
+            'total_bytes': state['total'],
+            'tmpfilename': tmpfilename,
+            'filename': filename,
+            'eta': self.calc_eta(progress['start'], now, state['total'] - progress['resumed'], received),
+            'speed': self.calc_speed(progress['start'], now, received),
+            'elapsed': now - progress['start'],
+            'ctx_id': info_dict.get('ctx_id'),
+        }, info_dict)
+
+    @staticmethod
+    def _save_segment_state(state_path, state, progress, force=False):
+        """진행 상황 저장 (SegmentedDownloader와 같은 형식, STATE_SAVE_INTERVAL마다)"""
+        with progress['lock']:
+            now = time.monotonic()
+            if not force and now - progress['last_save'] < SegmentedDownloader.STATE_SAVE_INTERVAL:
+                return
+            progress['last_save'] = now
+            data = json.dumps(state)
+
+            temp_path = f'{state_path}.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, state_path)
+
+
+class MonitoredExternalMixin:
+    """
+    외부 다운로더(ExternalFD)의 진행 상황 보고
+
+    yt-dlp의 ExternalFD는 프로세스가 끝난 뒤 'finished'만 보고하므로 진행률 표시, 취소,
+    벤치마크의 시간 제한 측정이 동작하지 않습니다. 실행 중에는 PROGRESS_INTERVAL마다 임시 파일 크기로
+    'downloading' hook을 호출하고, hook이 예외를 던지면 프로세스를 종료한 뒤 그 예외를 다시 던집니다.
+
+    프로세스 핸들은 _call_process를 거치는 다운로더(aria2c)에서만 얻을 수 있습니다.
+    yt-dlp의 FFmpegFD는 프로세스를 직접 실행하므로 ffmpeg는 중단 요청 후에도 스스로 끝날 때까지 기다립니다.
+    """
+
+    PROGRESS_INTERVAL = 0.5
+
+    def real_download(self, filename, info_dict):
+        self._process = None
+        self._monitor_error = None
+        finished = threading.Event()
+        monitor = threading.Thread(
+            target=self._monitor_progress, args=(filename, info_dict, finished),
+            name=f"{self.get_basename()}-progress", daemon=True)
+        monitor.start()
+        try:
+            result = super().real_download(filename, info_dict)
+        except Exception:
+            # 종료한 프로세스의 오류 코드 대신 중단 원인(hook 예외)을 전달
+            if self._monitor_error is None:
+                raise
+            result = False
+        finally:
+            finished.set()
+            monitor.join()
+
+        if self._monitor_error is not None:
+            raise self._monitor_error
+        return result
+
+    def _call_process(self, cmd, info_dict):
+        """ExternalFD._call_process와 같지만 중단할 수 있도록 프로세스 핸들 보관"""
+        with Popen(cmd, text=True, stderr=subprocess.PIPE if self._CAPTURE_STDERR else None) as proc:
+            self._process = proc
+            stdout, stderr = proc.communicate_or_kill()
+            return stdout or '', stderr or '', proc.returncode
+
+    def _monitor_progress(self, filename, info_dict, finished):
+        """프로세스가 끝날 때까지 임시 파일 크기로 진행 hook 호출"""
+        tmpfilename = self.temp_name(filename)
+        total = info_dict.get('filesize') or info_dict.get('filesize_approx')
+        start = time.time()
+        while not finished.wait(self.PROGRESS_INTERVAL):
+            try:
+                stat = os.stat(tmpfilename)
+            except OSError:
+                continue  # 아직 파일을 만들지 않음
+
+            # aria2c는 여러 위치에 나누어 쓰므로(희소 파일) 실제 할당된 블록 기준 (Windows는 파일 크기)
+            downloaded = stat.st_size
+            if hasattr(stat, 'st_blocks'):
+                downloaded = min(downloaded, stat.st_blocks * 512)
+
+            now = time.time()
+            try:
+                self._hook_progress({
+                    'status': 'downloading',
+                    'filename': filename,
+                    'tmpfilename': tmpfilename,
+                    'downloaded_bytes': downloaded,
+                    'total_bytes_estimate': total,
+                    'elapsed': now - start,
+                    'speed': self.calc_speed(start, now, downloaded),
+                    'eta': self.calc_eta(start, now, total, downloaded),
+                }, info_dict)
+            except Exception as e:
+                self._monitor_error = e
+                if self._process is not None:
+                    self._process.kill()
+                return
+
+
+class MonitoredAria2cFD(MonitoredExternalMixin, Aria2cFD):
+    """진행 상황을 보고하고 중단할 수 있는 aria2c 다운로더"""
+
+    @classmethod
+    def get_basename(cls):
+        return 'aria2c'  # external_downloader_args 키와 실행 파일 이름
+
+
+class MonitoredFFmpegFD(MonitoredExternalMixin, FFmpegFD):
+    """진행 상황을 보고하는 ffmpeg 다운로더"""
+
+    @classmethod
+    def get_basename(cls):
+        return 'ffmpeg'
+
+
+# yt-dlp가 고른 외부 다운로더 → 진행 보고 버전
+MONITORED_DOWNLOADERS = {
+    Aria2cFD: MonitoredAria2cFD,
+    FFmpegFD: MonitoredFFmpegFD,
+}
+
+
+class ParallelStreams:
+    """
+    한 영상의 여러 포맷(영상/오디오)을 동시에 다운로드
+
+    yt-dlp는 requested_formats의 포맷마다 차례로 dl()을 호출합니다. 이 그룹은 각 호출을
+    백그라운드 스레드로 넘기고 바로 반환하며, 마지막 포맷의 dl() 호출에서 모든 스트림이 끝날 때까지
+    기다려 결과를 합칩니다. 이후 병합(FFmpegMergerPP)은 yt-dlp가 평소처럼 실행합니다.
+
+    한 스트림이 실패하면 공유 취소 이벤트를 설정해 나머지 스트림도 다음 progress hook에서 중단하고,
+    남은 스트림이 끝날 때까지 기다리지 않고 바로 오류를 전달합니다.
+    """
+
+    def __init__(self, ydl, budgets):
+        """
+        Args:
+            ydl: ExtendedYoutubeDL
+            budgets: {format_id: {'workers': int, 'maximum': int}} 스트림별 연결 수
+        """
+        self.ydl = ydl
+        self.pending = dict(budgets)  # 아직 dl()이 호출되지 않은 포맷
+        self._executor = ThreadPoolExecutor(max_workers=len(budgets), thread_name_prefix="ParallelStream")
+        self._futures = []
+        self._cancelled = threading.Event()  # 설정되면 모든 스트림이 다음 progress hook에서 중단
+        self._started = time.monotonic()
+
+    def submit(self, name, info):
+        """스트림 다운로드 시작 (마지막 스트림이면 전체 완료까지 대기 후 결과 반환)"""
+        budget = self.pending.pop(info['format_id'])
+        params = dict(self.ydl.params, concurrent_fragment_downloads=budget['workers'])
+        adaptive = params.get('adaptive_fragments')
+        if adaptive:
+            params['adaptive_fragments'] = dict(adaptive, initial=budget['workers'], maximum=budget['maximum'])
+
+        # 이미 실패한 스트림이 있으면 다음 스트림을 시작하지 않고 바로 오류 전달
+        self._raise_first_error()
+
+        print(f"[Parallel] 스트림 {info['format_id']} 동시 다운로드 시작 (워커 {budget['workers']}개)")
+        self._futures.append(self._executor.submit(self._download_stream, name, info, params))
+        if self.pending:
+            return True, True  # 실제 결과는 마지막 스트림의 dl() 반환값에 합쳐짐
+        return self.wait()
+
+    def _download_stream(self, name, info, params):
+        """스트림 하나 다운로드 (실패하면 나머지 스트림 취소)"""
+        try:
+            return self.ydl._download_with(name, info, params, extra_hooks=[self._check_cancelled])
+        except BaseException:
+            self._cancelled.set()
+            raise
+
+    def _check_cancelled(self, d):
+        """progress hook: 다른 스트림이 실패했거나 그룹이 닫혔으면 중단"""
+        if self._cancelled.is_set():
+            raise DownloadCancelled('다른 스트림이 실패하여 중단')
+
+    def _raise_first_error(self):
+        """끝난 스트림 중 실패한 것이 있으면 나머지를 취소하고 그 오류를 전달"""
+        for future in self._futures:
+            if future.done() and not future.cancelled() and future.exception() is not None:
+                self._cancelled.set()
+                raise future.exception()
+
+    def wait(self):
+        """
+        시작한 스트림이 모두 끝날 때까지 대기
+
+        Returns:
+            tuple: (모두 성공했는지, 실제로 받은 스트림이 있는지) - YoutubeDL.dl 반환값과 같은 형식
+        """
+        # 처음 실패한 스트림에서 바로 깨어나 나머지를 취소 (늦게 끝나는 스트림을 기다리지 않음)
+        done, _ = wait(self._futures, return_when=FIRST_EXCEPTION)
+        if any(future.exception() is not None for future in done):
+            # 취소된 스트림이 먼저 끝나 보고될 수 있으므로 원래 실패한 스트림의 오류를 우선 전달
+            errors = [future.exception() for future in done if future.exception() is not None]
+            error = next((e for e in errors if not isinstance(e, DownloadCancelled)), errors[0])
+            self._cancelled.set()
+            print(f"[Parallel] 스트림 실패로 나머지 스트림 취소: {error}")
+            raise error
+
+        success, real_download = True, False
+        for future in self._futures:
+            stream_success, stream_real_download = future.result()
+            success = success and stream_success
+            real_download = real_download or stream_real_download
+        self._futures.clear()
+        print(f"[Parallel] 스트림 동시 다운로드 완료: {time.monotonic() - self._started:.2f}초")
+        return success, real_download
+
+    def close(self):
+        """
+        남은 스트림 정리
+
+        yt-dlp가 마지막 포맷 전에 중단했거나 스트림이 실패한 경우 아직 시작하지 않은 스트림은 취소하고,
+        실행 중인 스트림은 다음 progress hook에서 중단되므로 끝까지 받지 않습니다.
+        """
+        self._cancelled.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class ExtendedYoutubeDL(yt_dlp.YoutubeDL):
+    """
+    다운로더 선택을 확장한 YoutubeDL (ydl_pool이 생성)
+
+    - params['adaptive_fragments']가 있으면 HLS/DASH 프래그먼트 다운로드에 적응형 다운로더 사용
+    - params['parallel_streams']가 있으면 requested_formats(영상+오디오)를 동시에 다운로드
+      ({format_id: {'workers', 'maximum'}}, 없는 포맷은 concurrent_fragment_downloads를 나누어 사용)
+    - params['segmented_http']가 True이면 단일 파일(https) 포맷을 SegmentedHttpFD로 다운로드
+    - params['external_downloader']로 고른 aria2c/ffmpeg는 진행 상황을 보고하는 버전으로 실행
+    - params['single_pass_postprocess']가 있으면 병합과 삽입 작업을 SinglePassPP 하나로 실행
+      ({'metadata', 'thumbnail', 'subtitles', 'on_report'})
+
+    그 외에는 yt-dlp 기본 동작과 같습니다.
+    """
+
+    _parallel_streams = None  # 처리 중인 영상의 ParallelStreams
+
+    def process_info(self, info_dict):
+        budgets = self.params.get('parallel_streams')
+        requested = info_dict.get('requested_formats') or []
+        if not budgets or len(requested) < 2:
+            with self._ffmpeg_location():
+                return super().process_info(info_dict)
+
+        share = max(1, (self.params.get('concurrent_fragment_downloads') or 1) // len(requested))
+        self._parallel_streams = ParallelStreams(self, {
+            fmt['format_id']: budgets.get(fmt['format_id']) or {'workers': share, 'maximum': share}
+            for fmt in requested
+        })
+        try:
+            with self._ffmpeg_location():
+                return super().process_info(info_dict)
+        finally:
+            self._parallel_streams.close()
+            self._parallel_streams = None
+
+    def dl(self, name, info, subtitle=False, test=False):
+        if test or subtitle or name == '-':
+            return super().dl(name, info, subtitle, test)
+
+        streams = self._parallel_streams
+        if streams is not None and info.get('format_id') in streams.pending:
+            return streams.submit(name, info)
+        if (self.params.get('adaptive_fragments') or self.params.get('segmented_http')
+                or self.params.get('external_downloader')):
+            return self._download_with(name, info, self.params)
+        return super().dl(name, info, subtitle, test)
+
+    def post_process(self, filename, info, files_to_move=None):
+        options = self.params.get('single_pass_postprocess')
+        embeds = {key: bool((options or {}).get(key)) for key in ('metadata', 'thumbnail', 'subtitles')}
+        if not any(embeds.values()):
+            return super().post_process(filename, info, files_to_move)
+
+        # yt-dlp 병합 후처리기 자리에 넣어 병합과 삽입을 한 번에 처리 (병합이 없으면 수정 후처리기 뒤에 실행)
+        postprocessors = list(info.get('__postprocessors') or [])
+        merger = next((pp for pp in postprocessors if isinstance(pp, FFmpegMergerPP)), None)
+        single_pass = SinglePassPP(self, merge=merger is not None, on_report=options.get('on_report'), **embeds)
+        if merger is not None:
+            postprocessors[postprocessors.index(merger)] = single_pass
+        else:
+            postprocessors.append(single_pass)
+        info['__postprocessors'] = postprocessors
+        return super().post_process(filename, info, files_to_move)
+
+    @contextlib.contextmanager
+    def _ffmpeg_location(self):
+        """
+        현재 스레드에서 yt-dlp가 params의 ffmpeg_location을 쓰도록 설정
+
+        다운로더 선택 시 FFmpegFD.available()은 params 없이 PATH만 확인하므로
+        앱 데이터 디렉토리에 설치한 ffmpeg를 외부 다운로더로 고를 수 없습니다.
+        """
+        token = FFmpegPostProcessor._ffmpeg_location.set(self.params.get('ffmpeg_location'))
+        try:
+            yield
+        finally:
+            FFmpegPostProcessor._ffmpeg_location.reset(token)
+
+    def _download_with(self, name, info, params, extra_hooks=()):
+        """
+        YoutubeDL.dl과 같은 순서로 다운로드 (params와 다운로더 클래스만 교체)
+
+        extra_hooks는 이 다운로드에만 추가할 progress hook (ParallelStreams의 취소 확인)
+        """
+        if not info.get('url'):
+            self.raise_no_formats(info, True)
+
+        with self._ffmpeg_location():
+            downloader = get_suitable_downloader(info, params)
+        downloader = MONITORED_DOWNLOADERS.get(downloader, downloader)
+        if params.get('adaptive_fragments'):
+            downloader = ADAPTIVE_DOWNLOADERS.get(downloader, downloader)
+        if params.get('segmented_http') and downloader is HttpFD:
+            downloader = SegmentedHttpFD
+        fd = downloader(self, params)
+        for ph in [*extra_hooks, *self._progress_hooks]:
+            fd.add_progress_hook(ph)
+        self.write_debug(f'Invoking {fd.FD_NAME} downloader on "{info["url"]}"')
+
+        new_info = self._copy_infodict(info)
+        if new_info.get('http_headers') is None:
+            new_info['http_headers'] = self._calc_headers(new_info)
+        return fd.download(name, new_info)
@@ -0,0 +1,245 @@
+"""
+YoutubeDL 인스턴스 풀 모듈
+
+작업마다 yt_dlp.YoutubeDL을 새로 만들면 extractor 초기화, 쿠키 jar 로드(브라우저 쿠키 복호화),
+HTTP 핸들러/연결 풀 생성이 매번 반복됩니다. 이 모듈은 옵션 fingerprint(쿠키, 캐시 디렉토리,
+네트워크 옵션 등)별로 생성된 인스턴스를 보관해 두었다가 재사용하여 keep-alive 연결과
+불러온 쿠키가 작업 간에 유지되도록 합니다.
+
+작업마다 달라지는 옵션(포맷, 출력 경로, progress hook 등)은 인스턴스를 빌려줄 때 적용합니다.
+"""
+import atexit
+import contextlib
+import threading
+import time
+
+
+class YdlPool:
+    """옵션 fingerprint별 YoutubeDL 인스턴스 풀"""
+
+    # 인스턴스를 빌려줄 때마다 새로 적용하는 작업별 옵션
+    # (yt-dlp가 생성자에서 한 번만 읽지 않고 추출/다운로드 시점에 params에서 읽는 옵션만 해당)
+    PER_JOB_KEYS = frozenset({
+        'format',
+        'outtmpl',
+        'merge_output_format',
+        'format_sort',
+        'progress_hooks',
+        'postprocessor_hooks',
+        'download_archive',
+        'extract_flat',
+        'lazy_playlist',
+        'concurrent_fragment_downloads',
+        'adaptive_fragments',
+        'parallel_streams',
+        'segmented_http',
+        'external_downloader',
+        'external_downloader_args',
+        'single_pass_postprocess',
+        'ratelimit',
+        'throttledratelimit',
+        'retries',
+        'fragment_retries',
+    })
+
+    # fingerprint별로 보관할 최대 유휴 인스턴스 수
+    MAX_IDLE_PER_KEY = 4
+
+    # 유휴 인스턴스 최대 보관 시간 (초) - 쿠키가 오래되지 않도록 주기적으로 새로 생성
+    IDLE_TIMEOUT = 600
+
+    def __init__(self):
+        self._idle = {}  # fingerprint -> [(YoutubeDL, 반납 시각), ...]
+        self._lock = threading.Lock()
+        self.created = 0  # 새로 생성한 인스턴스 수
+        self.reused = 0  # 재사용한 횟수
+
+    @classmethod
+    def _fingerprint(cls, ydl_opts):
+        """인스턴스 공유 여부를 결정하는 옵션 fingerprint (작업별 옵션 제외)"""
+        shared = {k: v for k, v in ydl_opts.items() if k not in cls.PER_JOB_KEYS}
+        return repr(sorted(shared.items()))
+
+    @classmethod
+    def _apply_job_options(cls, ydl, ydl_opts):
+        """작업별 옵션 적용 (해당 옵션이 없으면 기본값으로 되돌림)"""
+        params = ydl.params
+
+        for key in cls.PER_JOB_KEYS:
+            if key in ydl_opts:
+                params[key] = ydl_opts[key]
+            else:
+                params.pop(key, None)
+
+        # 포맷 선택자는 생성자에서 미리 파싱되므로 다시 생성
+        format_spec = params.get('format')
+        ydl.format_selector = (
+            format_spec if format_spec in (None, '-') or callable(format_spec)
+            else ydl.build_format_selector(format_spec))
+
+        # 출력 템플릿도 생성자에서 dict 형태로 정규화됨 (호출자의 dict는 수정하지 않도록 복사)
+        outtmpl = ydl_opts.get('outtmpl', {})
+        params['outtmpl'] = dict(outtmpl) if isinstance(outtmpl, dict) else outtmpl
+        ydl._parse_outtmpl()
+
+        # hook 목록 교체
+        ydl._progress_hooks.clear()
+        for hook in ydl_opts.get('progress_hooks', []):
+            ydl.add_progress_hook(hook)
+        # add_postprocessor_hook은 이미 등록된 후처리기(_pps)에도 hook을 추가하므로
+        # 이전 작업의 hook을 후처리기에서도 제거 (후처리기 자체의 report_progress는 유지)
+        previous_hooks = list(ydl._postprocessor_hooks)
+        ydl._postprocessor_hooks.clear()
+        for pps in ydl._pps.values():
+            for pp in pps:
+                pp._progress_hooks[:] = [hook for hook in pp._progress_hooks if hook not in previous_hooks]
+        for hook in ydl_opts.get('postprocessor_hooks', []):
+            ydl.add_postprocessor_hook(hook)
+
+        # 다운로드 기록 (파일 경로가 아닌 객체만 지원 - DownloadArchive)
+        # 비어 있는 DownloadArchive도 falsy이므로 None 여부로 판단
+        archive = ydl_opts.get('download_archive')
+        ydl.archive = archive if archive is not None else set()
+
+        ydl._download_retcode = 0
+
+    def _take_idle(self, key):
+        """유효한 유휴 인스턴스 꺼내기 (없으면 None)"""
+        now = time.time()
+        expired = []
+        ydl = None
+        with self._lock:
+            entries = self._idle.get(key, [])
+            while entries:
+                candidate, released_at = entries.pop()
+                if now - released_at > self.IDLE_TIMEOUT:
+                    expired.append(candidate)
+                    continue
+                ydl = candidate
+                break
+
+        for old in expired:
+            self._close(old)
+        return ydl
+
+    @contextlib.contextmanager
+    def acquire(self, ydl_opts):
+        """
+        YoutubeDL 인스턴스 빌리기
+
+        with ydl_pool.acquire(ydl_opts) as ydl:
+            ydl.extract_info(...)
+
+        작업 중 예외가 발생한 인스턴스는 상태를 신뢰할 수 없으므로 반납하지 않고 닫습니다.
+
+        Args:
+            ydl_opts: yt-dlp 옵션 dict
+
+        Yields:
+            ExtendedYoutubeDL: 작업별 옵션이 적용된 인스턴스 (yt_dlp.YoutubeDL 하위 클래스)
+        """
+        key = self._fingerprint(ydl_opts)
+        ydl = self._take_idle(key)
+
+        if ydl is None:
+            # yt_dlp(전체 extractor 포함)는 첫 인스턴스 생성 시점에 import (프로그램 시작 시간 단축)
+            from .ydl_downloaders import ExtendedYoutubeDL
+            ydl = ExtendedYoutubeDL(dict(ydl_opts))
+            self.created += 1
+        else:
+            self._apply_job_options(ydl, ydl_opts)
+            self.reused += 1
+
+        try:
+            yield ydl
+        except BaseException:
+            self._close(ydl)
+            raise
+        else:
+            self._release(key, ydl)
+
+    def _release(self, key, ydl):
+        with self._lock:
+            entries = self._idle.setdefault(key, [])
+            if len(entries) < self.MAX_IDLE_PER_KEY:
+                entries.append((ydl, time.time()))
+                return
+        self._close(ydl)
+
+    @staticmethod
+    def _close(ydl):
+        try:
+            ydl.close()
+        except Exception as e:
+            print(f"[YdlPool] 인스턴스 종료 실패: {e}")
+
+    def close(self):
+        """모든 유휴 인스턴스 종료 (쿠키 파일 저장 포함)"""
+        with self._lock:
+            idle = self._idle
+            self._idle = {}
+        for entries in idle.values():
+            for ydl, _ in entries:
+                self._close(ydl)
+
+
+ydl_pool = YdlPool()
+atexit.register(ydl_pool.close)
+
+
+def benchmark_setup(ydl_opts=None, iterations=20):
+    """
+    작업당 YoutubeDL 준비 시간 측정 (풀 사용 전/후 비교)
+
+    - 이전 방식: 작업마다 YoutubeDL 생성 → 쿠키 jar/요청 핸들러 초기화 → close
+    - 풀 방식: ydl_pool.acquire로 빌리고 반납
+
+    실행: python -m src.core.ydl_pool
+
+    Returns:
+        dict: {'fresh_ms': float, 'pooled_ms': float, 'speedup': float} (작업당 평균 ms)
+    """
+    import yt_dlp
+    from .config import Config
+
+    if ydl_opts is None:
+        cache_dir = Config.get_config_dir() / "yt-dlp-cache"
+        ydl_opts = {
+            'quiet': True,
+            'no_warnings': True,
+            'cachedir': str(cache_dir),
+            'socket_timeout': 30,
+        }
+
+    def prepare(ydl):
+        # 실제 첫 요청 시 초기화되는 쿠키 jar와 요청 핸들러까지 포함하여 측정
+        ydl.cookiejar
+        ydl._request_director
+
+    # 이전 방식: 작업마다 새로 생성
+    start = time.perf_counter()
+    for i in range(iterations):
+        with yt_dlp.YoutubeDL(dict(ydl_opts, format='best', progress_hooks=[lambda d: None])) as ydl:
+            prepare(ydl)
+    fresh_ms = (time.perf_counter() - start) * 1000 / iterations
+
+    # 풀 방식
+    pool = YdlPool()
+    start = time.perf_counter()
+    for i in range(iterations):
+        with pool.acquire(dict(ydl_opts, format='best', progress_hooks=[lambda d: None])) as ydl:
+            prepare(ydl)
+    pooled_ms = (time.perf_counter() - start) * 1000 / iterations
+    pool.close()
+
+    speedup = fresh_ms / pooled_ms if pooled_ms > 0 else 0
+    print(f"[YdlPool] 작업당 준비 시간 ({iterations}회 평균)")
+    print(f"[YdlPool]   매번 생성: {fresh_ms:.1f} ms")
+    print(f"[YdlPool]   풀 재사용: {pooled_ms:.1f} ms (x{speedup:.1f})")
+    print(f"[YdlPool]   생성 {pool.created}회, 재사용 {pool.reused}회")
+
+    return {'fresh_ms': fresh_ms, 'pooled_ms': pooled_ms, 'speedup': speedup}
+
+
+if __name__ == "__main__":
+    benchmark_setup()
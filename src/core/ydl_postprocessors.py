@@ -0,0 +1,219 @@
+"""
+yt-dlp 후처리기 확장 모듈
+
+yt-dlp는 병합(FFmpegMerger), 메타데이터(FFmpegMetadata), 자막 삽입(FFmpegEmbedSubtitle),
+썸네일 삽입(EmbedThumbnail)을 각각 별도 후처리기로 실행하며, 후처리기마다 출력 파일 전체를
+다시 씁니다. 수 GB 파일이면 작업 수만큼 디스크를 처음부터 끝까지 읽고 쓰게 됩니다.
+
+SinglePassPP는 요청된 작업을 모아 입력/스트림 매핑을 계획한 뒤 FFmpeg 한 번으로 실행하므로
+출력 파일을 한 번만 씁니다.
+
+yt_dlp를 모듈 수준에서 import하므로 ydl_downloaders(ExtendedYoutubeDL)에서만 불러옵니다.
+"""
+import os
+import time
+
+from yt_dlp.postprocessor.common import PostProcessor
+from yt_dlp.postprocessor.ffmpeg import FFmpegMetadataPP, FFmpegThumbnailsConvertorPP
+from yt_dlp.utils import ISO639Utils, prepend_extension, replace_extension
+
+
+class SinglePassPP(FFmpegMetadataPP):
+    """
+    병합 + 메타데이터(챕터 포함) + 자막 + 썸네일을 FFmpeg 한 번으로 처리하는 후처리기
+
+    ExtendedYoutubeDL.post_process가 yt-dlp의 병합 후처리기 자리에 넣습니다 (병합이 없으면 마지막에 추가).
+    병합도 삽입할 내용도 없으면 FFmpeg를 실행하지 않습니다.
+    """
+
+    # 자막을 넣을 수 있는 컨테이너 (mp4 계열은 mov_text로 변환, webm은 WebVTT만)
+    SUBTITLE_EXTS = ('mp4', 'mov', 'm4a', 'webm', 'mkv', 'mka')
+    MOV_TEXT_EXTS = ('mp4', 'mov', 'm4a')
+    # 썸네일을 넣을 수 있는 컨테이너 (mp4 계열은 attached_pic 스트림, mkv 계열은 첨부 파일)
+    THUMBNAIL_EXTS = ('mp4', 'mov', 'm4a', 'm4v', 'mkv', 'mka')
+    ATTACHMENT_EXTS = ('mkv', 'mka')
+
+    def __init__(self, downloader, merge=False, metadata=False, thumbnail=False, subtitles=False, on_report=None):
+        """
+        Args:
+            downloader: YoutubeDL 인스턴스
+            merge: requested_formats를 병합할지 (yt-dlp 병합 후처리기를 대신할 때 True)
+            metadata: 제목/업로더 등 메타데이터와 챕터 삽입
+            thumbnail: 썸네일 삽입 (writethumbnail로 받은 파일)
+            subtitles: 자막 삽입 (writesubtitles로 받은 파일)
+            on_report: 완료 시 호출할 콜백 (operations, phases 등 dict)
+        """
+        FFmpegMetadataPP.__init__(self, downloader, add_metadata=metadata, add_chapters=metadata, add_infojson=False)
+        self._merge = merge
+        self._thumbnail = thumbnail
+        self._subtitles = subtitles
+        self._on_report = on_report
+
+    @PostProcessor._restrict_to(images=False)
+    def run(self, info):
+        started = time.monotonic()
+        phases = {}
+        filename = info['filepath']
+        ext = info['ext']
+
+        # 1. 계획: 입력 파일, 스트림 매핑, 작업 목록
+        inputs, options, video_streams = self._plan_streams(info)
+        operations = ['merge'] if self._merge else []
+        files_to_delete = list(inputs) if self._merge else []
+
+        if self._add_metadata:
+            last_chapter = (info.get('chapters') or [{}])[-1]
+            if last_chapter and not last_chapter.get('end_time'):
+                # 마지막 챕터 끝은 실제 길이로 (병합 전에는 출력 파일이 없으므로 첫 입력 파일 기준)
+                last_chapter['end_time'] = self._get_real_video_duration(inputs[0])
+            if info.get('chapters'):
+                # 챕터는 ffmetadata 파일을 입력으로 추가해 전역 메타데이터로 가져옴
+                metadata_filename = replace_extension(filename, 'meta')
+                for _ in self._get_chapter_opts(info['chapters'], metadata_filename):
+                    pass
+                options += ['-map_metadata', str(len(inputs))]
+                inputs.append(metadata_filename)
+                files_to_delete.append(metadata_filename)
+            for option in self._get_metadata_opts(info):
+                options.extend(option)
+            operations.append('metadata')
+
+        subtitle_files = self._find_subtitles(info) if self._subtitles else []
+        if subtitle_files:
+            if not self._merge:
+                # 이전 실행에서 넣은 자막은 새 자막으로 교체
+                options += ['-map', '-0:s']
+            for i, (lang, name, path) in enumerate(subtitle_files):
+                options += ['-map', f'{len(inputs)}:0', f'-metadata:s:s:{i}', f'language={ISO639Utils.short2long(lang) or lang}']
+                if name:
+                    options += [f'-metadata:s:s:{i}', f'handler_name={name}', f'-metadata:s:s:{i}', f'title={name}']
+                inputs.append(path)
+                files_to_delete.append(path)
+            if ext in self.MOV_TEXT_EXTS:
+                options += ['-c:s', 'mov_text']
+            operations.append('subtitles')
+        phases['plan'] = time.monotonic() - started
+
+        if self._thumbnail and ext in self.THUMBNAIL_EXTS:
+            convert_start = time.monotonic()
+            thumbnail = self._prepare_thumbnail(info)
+            phases['thumbnail'] = time.monotonic() - convert_start
+            if thumbnail:
+                path, thumbnail_ext, originals = thumbnail
+                if ext in self.ATTACHMENT_EXTS:
+                    mimetype = f'image/{thumbnail_ext.replace("jpg", "jpeg")}'
+                    options += [
+                        '-attach', self._ffmpeg_filename_argument(path),
+                        '-metadata:s:t', f'mimetype={mimetype}',
+                        '-metadata:s:t', f'filename=cover.{thumbnail_ext}',
+                    ]
+                else:
+                    options += ['-map', f'{len(inputs)}:0', f'-disposition:v:{video_streams}', 'attached_pic']
+                    inputs.append(path)
+                files_to_delete.extend(originals)
+                operations.append('thumbnail')
+
+        if not operations:
+            self.to_screen('There is nothing to post-process')
+            return [], info
+
+        # 2. 실행: 출력 파일을 한 번만 씀
+        temp_filename = prepend_extension(filename, 'temp')
+        self.to_screen(f'Post-processing ({", ".join(operations)}) into "{filename}"')
+        ffmpeg_start = time.monotonic()
+        self.run_ffmpeg_multiple_files(inputs, temp_filename, options)
+        os.replace(temp_filename, filename)
+        phases['ffmpeg'] = time.monotonic() - ffmpeg_start
+
+        report = {
+            'operations': operations,
+            'inputs': len(inputs),
+            'phases': phases,
+            'seconds': time.monotonic() - started,
+        }
+        print(f"[SinglePass] {'+'.join(operations)}: 입력 {len(inputs)}개, "
+              f"FFmpeg {phases['ffmpeg']:.2f}초 (전체 {report['seconds']:.2f}초)")
+        if self._on_report:
+            self._on_report(report)
+        return files_to_delete, info
+
+    def _plan_streams(self, info):
+        """
+        미디어 입력과 스트림 매핑
+
+        병합이면 FFmpegMergerPP와 같은 순서(포맷마다 오디오, 영상)로 매핑하고,
+        단일 파일이면 기존 스트림을 모두 복사합니다.
+
+        Returns:
+            tuple: (입력 파일 목록, FFmpeg 옵션 목록, 출력 영상 스트림 수)
+        """
+        if not self._merge:
+            video_streams = 0 if info.get('vcodec') == 'none' else 1
+            return [info['filepath']], list(self.stream_copy_opts()), video_streams
+
+        options = ['-dn', '-ignore_unknown', '-c', 'copy']
+        audio_streams = video_streams = 0
+        for i, fmt in enumerate(info['requested_formats']):
+            if fmt.get('acodec') != 'none':
+                options += ['-map', f'{i}:a:0']
+                if fmt['protocol'].startswith('m3u8') and self.get_audio_codec(fmt['filepath']) == 'aac':
+                    options += [f'-bsf:a:{audio_streams}', 'aac_adtstoasc']
+                audio_streams += 1
+            if fmt.get('vcodec') != 'none':
+                options += ['-map', f'{i}:v:0']
+                video_streams += 1
+        return list(info['__files_to_merge']), options, video_streams
+
+    def _find_subtitles(self, info):
+        """
+        삽입할 자막 파일 (FFmpegEmbedSubtitlePP와 같은 조건)
+
+        Returns:
+            list: [(언어, 이름, 파일 경로), ...]
+        """
+        ext = info['ext']
+        if ext not in self.SUBTITLE_EXTS:
+            self.to_screen(f'Subtitles can only be embedded in {", ".join(self.SUBTITLE_EXTS)} files')
+            return []
+
+        subtitle_files = []
+        for lang, sub_info in (info.get('requested_subtitles') or {}).items():
+            if not os.path.exists(sub_info.get('filepath') or ''):
+                self.report_warning(f'Skipping embedding {lang} subtitle because the file is missing')
+                continue
+            sub_ext = sub_info['ext']
+            if sub_ext == 'json':
+                self.report_warning('JSON subtitles cannot be embedded')
+            elif ext == 'webm' and sub_ext != 'vtt':
+                self.report_warning('Only WebVTT subtitles can be embedded in webm files')
+            else:
+                subtitle_files.append((lang, sub_info.get('name'), sub_info['filepath']))
+        return subtitle_files
+
+    def _prepare_thumbnail(self, info):
+        """
+        삽입할 썸네일 준비 (EmbedThumbnailPP와 같이 마지막으로 받은 썸네일, 필요하면 png로 변환)
+
+        Returns:
+            tuple: (파일 경로, 확장자, 삭제할 파일 목록) 또는 None
+        """
+        thumbnails = info.get('thumbnails') or []
+        idx = next((-i for i, t in enumerate(thumbnails[::-1], 1) if t.get('filepath')), None)
+        if idx is None:
+            self.to_screen('There are no thumbnails on disk')
+            return None
+        if not os.path.exists(thumbnails[idx]['filepath']):
+            self.report_warning('Skipping embedding the thumbnail because the file is missing.')
+            return None
+
+        # 확장자가 잘못된 WebP 보정, mp4 계열이 지원하지 않는 형식은 png로 변환
+        convertor = FFmpegThumbnailsConvertorPP(self._downloader)
+        convertor.fixup_webp(info, idx)
+        original = path = thumbnails[idx]['filepath']
+        thumbnail_ext = os.path.splitext(path)[1][1:]
+        if info['ext'] not in self.ATTACHMENT_EXTS and thumbnail_ext not in ('jpg', 'jpeg', 'png'):
+            path = convertor.convert_thumbnail(path, 'png')
+            thumbnail_ext = 'png'
+
+        # 썸네일은 삽입용으로만 받으므로 원본/변환본 모두 삭제
+        return path, thumbnail_ext, [original] if path == original else [original, path]
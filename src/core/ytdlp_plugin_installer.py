@@ -3,13 +3,16 @@ yt-dlp 플러그인 설치 및 관리 모듈
 
 Chrome 쿠키 잠금 문제 해결을 위한 ChromeCookieUnlock 플러그인 설치
 """
+import hashlib
+import io
+import json
 import os
-import sys
-import subprocess
+import shutil
+import tempfile
 import zipfile
-import requests
 from pathlib import Path
 from .config import Config
+from .segmented_http import SegmentedDownloader
 
 
 class YtDlpPluginInstaller:
@@ -24,6 +27,12 @@ class YtDlpPluginInstaller:
     GITHUB_REPO = "seproDev/yt-dlp-ChromeCookieUnlock"
     GITHUB_ZIP_URL = f"https://github.com/{GITHUB_REPO}/archive/refs/heads/main.zip"
 
+    # 설치 기록 파일 (설정 디렉토리에 저장)
+    MANIFEST_FILENAME = "plugin-manifest.json"
+
+    # ZIP 멤버 복사/해시 단위
+    COPY_CHUNK_SIZE = 64 * 1024
+
     @staticmethod
     def get_plugin_dir():
         """
@@ -69,52 +78,164 @@ class YtDlpPluginInstaller:
             return False
 
     @staticmethod
-    def install_plugin(progress_callback=None):
+    def _get_manifest_path():
+        return Config.get_config_dir() / YtDlpPluginInstaller.MANIFEST_FILENAME
+
+    @staticmethod
+    def _load_manifest():
+        """
+        설치 기록 읽기
+
+        Returns:
+            dict: {"url", "etag", "last_modified", "files": {상대 경로: sha256}}
+        """
+        try:
+            with open(YtDlpPluginInstaller._get_manifest_path(), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        # 다운로드 주소가 바뀌었으면 이전 기록은 사용하지 않음
+        if manifest.get("url") != YtDlpPluginInstaller.GITHUB_ZIP_URL:
+            manifest = {}
+        manifest.setdefault("files", {})
+        return manifest
+
+    @staticmethod
+    def _save_manifest(manifest):
+        """설치 기록 저장 (임시 파일에 쓴 뒤 교체)"""
+        manifest_path = YtDlpPluginInstaller._get_manifest_path()
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix="plugin-manifest-", suffix=".tmp", dir=manifest_path.parent)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(temp_path, manifest_path)
+        except OSError as e:
+            print(f"[Plugin] 설치 기록 저장 실패: {e}")
+
+    @staticmethod
+    def _resolve_inside(base_path, relative_path):
+        """
+        상대 경로를 base_path 기준으로 해석 (ZIP 멤버, 설치 기록의 경로용)
+
+        Returns:
+            Path: base_path 안의 절대 경로, '..'이나 절대 경로로 밖을 가리키면 None
+        """
+        base = base_path.resolve()
+        target = (base / relative_path).resolve()
+        try:
+            target.relative_to(base)
+        except ValueError:
+            return None
+        return target if target != base else None
+
+    @staticmethod
+    def _verify_manifest(manifest, target_plugin_path):
+        """설치 기록의 파일이 모두 있고 내용(SHA-256)이 기록과 같은지 확인"""
+        if not manifest["files"]:
+            return False
+        for relative_path, digest in manifest["files"].items():
+            target_file = YtDlpPluginInstaller._resolve_inside(target_plugin_path, relative_path)
+            if target_file is None or not target_file.is_file() or SegmentedDownloader.sha256_file(target_file) != digest:
+                return False
+        return True
+
+    @staticmethod
+    def _hash_member(zip_ref, name):
+        """ZIP 멤버의 SHA-256 계산 (메모리에 통째로 읽지 않고 블록 단위로)"""
+        digest = hashlib.sha256()
+        with zip_ref.open(name) as source:
+            for block in iter(lambda: source.read(YtDlpPluginInstaller.COPY_CHUNK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _write_member(zip_ref, name, target_file):
+        """ZIP 멤버를 임시 파일에 스트리밍 복사한 뒤 교체 (중간에 실패해도 기존 파일 유지)"""
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".plugin-", suffix=".tmp", dir=target_file.parent)
+        try:
+            with zip_ref.open(name) as source, os.fdopen(fd, 'wb') as target:
+                shutil.copyfileobj(source, target, YtDlpPluginInstaller.COPY_CHUNK_SIZE)
+            os.replace(temp_path, target_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @staticmethod
+    def install_plugin(progress_callback=None, force=False):
         """
         ChromeCookieUnlock 플러그인 설치
         GitHub에서 직접 다운로드하여 plugins 폴더에 설치
 
+        이전 설치 기록(ETag/Last-Modified, 파일별 SHA-256)이 있고 설치된 파일이 그대로이면
+        조건부 요청을 보내 GitHub 쪽이 바뀌지 않은 경우(304) 다운로드 없이 끝냅니다.
+        바뀐 경우에도 ZIP은 메모리에서 처리하고 내용이 달라진 파일만 다시 씁니다.
+
         Args:
             progress_callback: 진행률 콜백 함수 (0-100)
+            force: True이면 설치 기록을 무시하고 다시 다운로드
 
         Returns:
             bool: 설치 성공 여부
         """
+        # requests는 설치할 때만 필요하므로 시작 시간에 포함되지 않도록 여기서 import
+        import requests
+
         print(f"[Plugin] {YtDlpPluginInstaller.PLUGIN_NAME} 설치 시작...")
         print(f"[Plugin] GitHub에서 다운로드: {YtDlpPluginInstaller.GITHUB_ZIP_URL}")
 
         plugin_dir = YtDlpPluginInstaller.get_plugin_dir()
-        temp_zip = plugin_dir / "temp_plugin.zip"
+        target_plugin_path = plugin_dir / "yt_dlp_plugins"
 
         try:
-            # 1. GitHub에서 ZIP 다운로드
+            # 1. 설치 기록 확인 (설치된 파일이 기록과 같을 때만 조건부 요청)
+            manifest = YtDlpPluginInstaller._load_manifest()
+            verified = not force and YtDlpPluginInstaller._verify_manifest(manifest, target_plugin_path)
+
+            headers = {}
+            if verified:
+                if manifest.get("etag"):
+                    headers["If-None-Match"] = manifest["etag"]
+                if manifest.get("last_modified"):
+                    headers["If-Modified-Since"] = manifest["last_modified"]
+
+            # 2. GitHub에서 ZIP 다운로드 (메모리로)
             if progress_callback:
                 progress_callback(10)
 
             print("[Plugin] 다운로드 중...")
-            response = requests.get(YtDlpPluginInstaller.GITHUB_ZIP_URL, stream=True, timeout=30)
-            response.raise_for_status()
-
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-
-            with open(temp_zip, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback and total_size > 0:
-                            percent = 10 + int((downloaded / total_size) * 50)
-                            progress_callback(percent)
-
-            print(f"[Plugin] 다운로드 완료: {temp_zip}")
-
-            # 2. ZIP 압축 해제
+            with requests.get(YtDlpPluginInstaller.GITHUB_ZIP_URL, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 304:
+                    print("[Plugin] 변경 없음 (304) - 설치된 플러그인 유지")
+                    if progress_callback:
+                        progress_callback(100)
+                    return True
+                response.raise_for_status()
+
+                total_size = int(response.headers.get('content-length', 0))
+                archive = io.BytesIO()
+                for chunk in response.iter_content(chunk_size=YtDlpPluginInstaller.COPY_CHUNK_SIZE):
+                    archive.write(chunk)
+                    if progress_callback and total_size > 0:
+                        progress_callback(10 + int((archive.tell() / total_size) * 50))
+
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+
+            print(f"[Plugin] 다운로드 완료: {archive.tell()} bytes")
+
+            # 3. ZIP 압축 해제 (바뀐 파일만 다시 씀)
             if progress_callback:
                 progress_callback(70)
 
             print("[Plugin] 압축 해제 중...")
-            with zipfile.ZipFile(temp_zip, 'r') as zip_ref:
+            known_files = manifest["files"] if verified else {}
+            installed_files = {}
+            written = unchanged = 0
+
+            with zipfile.ZipFile(archive, 'r') as zip_ref:
                 # ZIP 내용 확인
                 file_list = zip_ref.namelist()
                 print(f"[Plugin] ZIP 파일 수: {len(file_list)}")
@@ -130,32 +251,63 @@ class YtDlpPluginInstaller:
                     raise Exception("ZIP 파일에서 yt_dlp_plugins 폴더를 찾을 수 없습니다")
 
                 # yt_dlp_plugins 폴더 내용만 추출
-                target_plugin_path = plugin_dir / "yt_dlp_plugins"
                 target_plugin_path.mkdir(parents=True, exist_ok=True)
 
+                # 쓰기 전에 모든 항목의 경로를 확인 (하나라도 폴더 밖을 가리키면 아무것도 쓰지 않음)
+                members = []
                 for file in file_list:
-                    if file.startswith(plugin_folder + '/'):
-                        # 파일 경로에서 상위 폴더명 제거
-                        relative_path = file[len(plugin_folder) + 1:]
-                        if relative_path:  # 빈 경로 제외
-                            target_file = target_plugin_path / relative_path
-                            target_file.parent.mkdir(parents=True, exist_ok=True)
-
-                            if not file.endswith('/'):  # 디렉토리가 아닌 파일만
-                                with zip_ref.open(file) as source:
-                                    with open(target_file, 'wb') as target:
-                                        target.write(source.read())
+                    if not file.startswith(plugin_folder + '/') or file.endswith('/'):
+                        continue  # 다른 폴더와 디렉토리 항목 제외
+
+                    # 파일 경로에서 상위 폴더명 제거
+                    relative_path = file[len(plugin_folder) + 1:]
+                    target_file = YtDlpPluginInstaller._resolve_inside(target_plugin_path, relative_path)
+                    if target_file is None:
+                        raise Exception(f"플러그인 폴더 밖을 가리키는 ZIP 항목: {file}")
+                    members.append((file, relative_path, target_file))
+
+                for file, relative_path, target_file in members:
+                    digest = YtDlpPluginInstaller._hash_member(zip_ref, file)
+                    installed_files[relative_path] = digest
+
+                    # 기록이 없거나 검증되지 않은 파일은 디스크의 내용과 직접 비교
+                    if relative_path in known_files:
+                        same = known_files[relative_path] == digest
+                    else:
+                        same = target_file.is_file() and SegmentedDownloader.sha256_file(target_file) == digest
+
+                    if same:
+                        unchanged += 1
+                    else:
+                        YtDlpPluginInstaller._write_member(zip_ref, file, target_file)
+                        written += 1
+
+            # 새 버전에서 빠진 파일 정리 (이전에 이 설치기가 설치한 파일만)
+            removed = 0
+            for relative_path in manifest["files"]:
+                if relative_path not in installed_files:
+                    stale_file = YtDlpPluginInstaller._resolve_inside(target_plugin_path, relative_path)
+                    if stale_file is None:
+                        print(f"[Plugin] 플러그인 폴더 밖의 경로는 삭제하지 않음: {relative_path}")
+                    elif stale_file.is_file():
+                        stale_file.unlink()
+                        removed += 1
+
+            print(f"[Plugin] 파일 갱신: {written}개 기록, {unchanged}개 변경 없음, {removed}개 삭제")
 
             if progress_callback:
                 progress_callback(90)
 
-            # 3. 임시 파일 삭제
-            temp_zip.unlink()
-
             # 4. 설치 확인
             if YtDlpPluginInstaller.check_plugin_installed():
+                YtDlpPluginInstaller._save_manifest({
+                    "url": YtDlpPluginInstaller.GITHUB_ZIP_URL,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "files": installed_files
+                })
                 print(f"[Plugin] {YtDlpPluginInstaller.PLUGIN_NAME} 설치 완료")
-                print(f"[Plugin] 설치 경로: {plugin_dir / 'yt_dlp_plugins'}")
+                print(f"[Plugin] 설치 경로: {target_plugin_path}")
                 if progress_callback:
                     progress_callback(100)
                 return True
@@ -164,13 +316,9 @@ class YtDlpPluginInstaller:
 
         except requests.exceptions.RequestException as e:
             print(f"[Plugin] 다운로드 실패: {e}")
-            if temp_zip.exists():
-                temp_zip.unlink()
             return False
         except Exception as e:
             print(f"[Plugin] 설치 오류: {e}")
-            if temp_zip.exists():
-                temp_zip.unlink()
             return False
 
     @staticmethod
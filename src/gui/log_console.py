@@ -0,0 +1,112 @@
+import collections
+import threading
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import QTimer
+
+
+class LogBuffer:
+    """
+    스레드 안전 링 버퍼
+
+    여러 스레드의 print 출력을 모아 두었다가 GUI 스레드가 주기적으로 한꺼번에 가져갑니다.
+    화면에 반영되기 전에 최대 줄 수를 넘으면 오래된 줄부터 버리고 버린 줄 수만 셉니다.
+    """
+
+    def __init__(self, max_lines):
+        self._lines = collections.deque(maxlen=max_lines)
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, line):
+        with self._lock:
+            if len(self._lines) == self._lines.maxlen:
+                self._dropped += 1
+            self._lines.append(line)
+
+    def drain(self):
+        """
+        쌓인 줄을 모두 꺼냄
+
+        Returns:
+            tuple: (줄 목록, 넘쳐서 버린 줄 수)
+        """
+        with self._lock:
+            lines = list(self._lines)
+            self._lines.clear()
+            dropped = self._dropped
+            self._dropped = 0
+        return lines, dropped
+
+
+class OutputRedirector:
+    """stdout/stderr를 로그 버퍼로 리다이렉트 (write마다 Qt 시그널을 보내지 않음)"""
+
+    def __init__(self, buffer, original_stream=None, prefix=""):
+        self.buffer = buffer
+        self.original_stream = original_stream
+        self.prefix = prefix
+
+    def write(self, text):
+        for line in text.splitlines():
+            # \r로 갱신되는 진행 표시는 마지막 상태만 남김
+            line = line.rsplit('\r', 1)[-1].rstrip()
+            if line.strip():  # 빈 줄 무시
+                self.buffer.append(self.prefix + line)
+        # 원래 스트림에도 출력 (디버깅용)
+        if self.original_stream:
+            self.original_stream.write(text)
+            self.original_stream.flush()
+
+    def flush(self):
+        if self.original_stream:
+            self.original_stream.flush()
+
+
+class LogConsole(QPlainTextEdit):
+    """
+    줄 수가 제한된 로그 뷰
+
+    - 출력은 LogBuffer에 쌓이고 FLUSH_INTERVAL_MS마다 한 번에 추가됨
+    - MAX_LINES를 넘으면 가장 오래된 줄부터 삭제 (세션이 길어져도 메모리 일정)
+    - 사용자가 위로 스크롤해 둔 경우에는 자동 스크롤하지 않음
+    """
+
+    # 화면에 유지할 최대 줄 수
+    MAX_LINES = 5000
+
+    # 버퍼를 화면에 반영하는 주기 (ms)
+    FLUSH_INTERVAL_MS = 100
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(self.MAX_LINES)
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+
+        self.buffer = LogBuffer(self.MAX_LINES)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._flush_timer.start()
+
+    def append_line(self, line):
+        """로그 한 줄 추가 (어느 스레드에서나 호출 가능, 다음 flush 때 표시)"""
+        self.buffer.append(line)
+
+    def flush(self):
+        """버퍼에 쌓인 줄을 한 번에 추가"""
+        lines, dropped = self.buffer.drain()
+        if not lines:
+            return
+
+        if dropped:
+            lines.insert(0, f"... 출력이 많아 {dropped}줄 생략 ...")
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        self.appendPlainText("\n".join(lines))
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
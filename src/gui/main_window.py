@@ -2,59 +2,48 @@ import asyncio
 import sys
 import os
 import subprocess
+import threading
+import time
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QLineEdit, QPushButton, QProgressBar, QTextEdit,
+                             QLineEdit, QPushButton,
                              QLabel, QComboBox, QMessageBox, QMenuBar, QApplication)
-from PyQt6.QtCore import Qt, pyqtSlot, pyqtSignal, QObject
-from PyQt6.QtGui import QTextCursor
+from PyQt6.QtCore import Qt, pyqtSlot, pyqtSignal, QTimer
 from qasync import QEventLoop, asyncSlot
 
-from src.core.downloader import VideoDownloader
+from src.core.download_queue import DownloadQueue, DownloadJob
 from src.core.config import config
-from src.gui.settings_dialog import SettingsDialog
+from src.gui.progress_view import ProgressView
+from src.gui.log_console import LogConsole, OutputRedirector
 
 
-class OutputRedirector(QObject):
-    """stdout/stderr를 GUI 로그 영역으로 리다이렉트"""
-    output_written = pyqtSignal(str)
-
-    def __init__(self, original_stream=None):
-        super().__init__()
-        self.original_stream = original_stream
-
-    def write(self, text):
-        if text.strip():  # 빈 줄 무시
-            self.output_written.emit(text.rstrip())
-        # 원래 스트림에도 출력 (디버깅용)
-        if self.original_stream:
-            self.original_stream.write(text)
-            self.original_stream.flush()
-
-    def flush(self):
-        if self.original_stream:
-            self.original_stream.flush()
-
 class MainWindow(QMainWindow):
-    progress_signal = pyqtSignal(float)
+    progress_event_signal = pyqtSignal(dict)
     status_signal = pyqtSignal(str)
+    job_added_signal = pyqtSignal(object)
 
     def __init__(self):
         super().__init__()
         self.setWindowTitle("비디오 다운로더")
         self.resize(600, 450)
 
-        self.downloader = VideoDownloader()
-        self.last_status_line = None  # \r 효과를 위한 마지막 상태 라인 추적
+        self.download_queue = DownloadQueue()
+        self.failed_jobs = []  # (job_id, 오류 메시지), 대기열이 빌 때 한 번에 알림
+        self.finished_count = 0  # 마지막 알림 이후 끝난 작업 수
+        self.pending_feeds = set()  # 아직 항목을 추가 중인 URL 확장 (submit_url의 Future)
 
         # Connect signals
-        self.progress_signal.connect(self.update_progress)
+        self.progress_event_signal.connect(self.update_progress)
         self.status_signal.connect(self.update_status)
+        self.job_added_signal.connect(self.track_job)
 
         self.setup_ui()
 
         # stdout/stderr 리다이렉트 설정
         self.setup_output_redirect()
 
+        # 무거운 모듈(yt_dlp 등)은 창이 표시된 뒤 백그라운드에서 import
+        QTimer.singleShot(0, self.start_background_imports)
+
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -118,15 +107,13 @@ class MainWindow(QMainWindow):
 
         layout.addLayout(download_layout)
 
-        # Progress Bar
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setValue(0)
-        layout.addWidget(self.progress_bar)
+        # Progress (작업별 진행 막대)
+        self.progress_view = ProgressView()
+        layout.addWidget(self.progress_view)
 
-        # Log Area
-        self.log_area = QTextEdit()
-        self.log_area.setReadOnly(True)
-        layout.addWidget(self.log_area)
+        # Log Area (줄 수 제한, 일정 주기로 한꺼번에 갱신)
+        self.log_console = LogConsole()
+        layout.addWidget(self.log_console)
 
     def paste_url(self):
         """클립보드 내용을 URL 입력란에 붙여넣기"""
@@ -153,7 +140,26 @@ class MainWindow(QMainWindow):
 
         self.log(f"다운로드 폴더 열기: {download_path}")
 
+    def start_background_imports(self):
+        """첫 화면 표시 후 다운로드에 필요한 모듈을 미리 import (첫 다운로드 지연 방지)"""
+        def preload():
+            start = time.perf_counter()
+            try:
+                import yt_dlp
+                from yt_dlp.extractor import gen_extractor_classes
+                gen_extractor_classes()
+                import requests
+                import src.gui.settings_dialog
+            except Exception as e:
+                print(f"[Startup] 백그라운드 import 실패: {e}")
+                return
+            print(f"[Startup] 백그라운드 import 완료: {time.perf_counter() - start:.2f}초")
+
+        threading.Thread(target=preload, name="preload-imports", daemon=True).start()
+
     def open_settings(self):
+        # 설정 창은 열 때 import (FFmpeg/플러그인 설치 모듈 포함)
+        from src.gui.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self)
         if dialog.exec():
             # Refresh UI with new settings if needed
@@ -165,58 +171,15 @@ class MainWindow(QMainWindow):
             self.log("설정이 업데이트되었습니다.")
 
     def log(self, message):
-        self.log_area.append(message)
-        self.scroll_to_bottom()
+        self.log_console.append_line(message)
 
-    def update_progress(self, percent):
-        self.progress_bar.setValue(int(percent))
+    def update_progress(self, event):
+        self.progress_view.update_event(event)
 
     def update_status(self, message):
-        """
-        다운로드 진행 상황 메시지는 같은 줄에 덮어쓰기 (\r 효과)
-
-        QTextEdit에서 마지막 줄을 덮어쓰는 가장 확실한 방법:
-        QTextDocument의 마지막 블록을 제거하고 새 내용 삽입
-        """
-        # 상태바에 표시
+        """상태 메시지를 상태바와 로그에 표시 (진행률은 progress_view에서 표시)"""
         self.statusBar().showMessage(message)
-
-        # 다운로드 진행 상황 메시지는 같은 줄 갱신
-        if "다운로드 중:" in message or "Downloading:" in message or "속도:" in message:
-            cursor = self.log_area.textCursor()
-
-            # 마지막 줄이 진행 상황 메시지였다면 제거
-            if self.last_status_line is not None:
-                # 문서 끝으로 이동
-                cursor.movePosition(QTextCursor.MoveOperation.End)
-
-                # 현재 블록의 시작으로 이동
-                cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock)
-
-                # 블록 전체 선택
-                cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
-
-                # 선택된 블록 제거
-                cursor.removeSelectedText()
-
-                # 블록 자체도 제거 (줄바꿈 문자 제거)
-                cursor.deletePreviousChar()
-
-            # 커서를 문서 끝으로 이동
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-
-            # 새 메시지 삽입 (HTML 형식)
-            cursor.insertHtml(f"<span style='color: blue;'>{message}</span>")
-            cursor.insertBlock()  # 줄바꿈
-
-            # 커서 업데이트
-            self.log_area.setTextCursor(cursor)
-            self.scroll_to_bottom()
-            self.last_status_line = message
-        else:
-            # 일반 메시지는 새 줄로 추가
-            self.last_status_line = None
-            self.log(message)
+        self.log(message)
 
     @asyncSlot()
     async def start_download(self):
@@ -225,69 +188,110 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "오류", "주소를 입력해주세요.")
             return
 
-        self.download_btn.setEnabled(False)
-        self.progress_bar.setValue(0)
-        self.log(f"다운로드 시작: {url}")
+        # 대기열에 추가하므로 버튼을 비활성화하지 않고 다음 URL을 바로 입력받음
+        self.url_input.clear()
+
+        # 화질/포맷은 작업에 고정되고, 설정에는 다음 실행을 위한 마지막 선택으로만 저장
+        # (메모리에 바로 반영되고 파일 저장은 잠시 후 한 번에 수행됨)
+        quality = self.quality_combo.currentText()
+        output_format = self.format_combo.currentText()
+        with config.transaction():
+            config.set("default_quality", quality)
+            config.set("output_format", output_format)
+
+        # 플레이리스트/채널은 항목이 발견되는 대로 대기열에 추가됨
+        self.log(f"주소 확인 중: {url} ({quality}/{output_format})")
+        feed_future = self.download_queue.submit_url(
+            url,
+            status_callback=self.update_status_safe,
+            on_job=self.job_added_signal.emit,
+            progress_event_callback=self.update_progress_safe,
+            quality=quality,
+            output_format=output_format
+        )
+
+        self.pending_feeds.add(feed_future)
+        try:
+            count = await asyncio.wrap_future(feed_future)
+            if count > 1:
+                self.log(f"플레이리스트 항목 {count}개를 모두 대기열에 추가했습니다")
+        except Exception as e:
+            self.log(f"오류: {str(e)}")
+            QMessageBox.critical(self, "오류", f"주소 확인 실패: {str(e)}")
+        finally:
+            # 확장이 끝나기 전에 마지막 작업이 먼저 끝났을 수 있으므로 여기서도 확인
+            self.pending_feeds.discard(feed_future)
+            self.maybe_show_queue_summary()
 
-        config.set("default_quality", self.quality_combo.currentText())
-        config.set("output_format", self.format_combo.currentText())
+    def track_job(self, job):
+        """대기열에 추가된 작업의 완료를 추적 (GUI 스레드)"""
+        self.log(f"다운로드 대기열 추가 (#{job.job_id}): {job.url}")
+        self.progress_view.add_job(job.job_id)
+        asyncio.ensure_future(self.wait_for_job(job))
 
+    async def wait_for_job(self, job):
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None, 
-                self.downloader.download, 
-                url, 
-                self.update_progress_safe, 
-                self.update_status_safe
-            )
-            self.log("다운로드가 성공적으로 완료되었습니다!")
-            QMessageBox.information(self, "성공", "다운로드 완료.")
+            await asyncio.wrap_future(job.future)
+            self.log(f"[#{job.job_id}] 다운로드가 성공적으로 완료되었습니다!")
         except Exception as e:
-            self.log(f"오류: {str(e)}")
-            QMessageBox.critical(self, "오류", f"다운로드 실패: {str(e)}")
+            # 작업마다 창을 띄우지 않고 모아 두었다가 대기열이 비면 한 번에 알림
+            self.log(f"[#{job.job_id}] 오류: {str(e)}")
+            if job.state != DownloadJob.CANCELLED:
+                self.failed_jobs.append((job.job_id, str(e)))
         finally:
-            self.download_btn.setEnabled(True)
+            self.progress_view.remove_job(job.job_id)
+            self.finished_count += 1
+            self.maybe_show_queue_summary()
 
-    def update_progress_safe(self, percent):
-        self.progress_signal.emit(percent)
+    def maybe_show_queue_summary(self):
+        """
+        대기열이 비고 URL 확장도 모두 끝났을 때만 결과 표시
+
+        플레이리스트 확장 중에는 다음 항목이 추가되기 전에 대기열이 잠시 빌 수 있으므로 제외
+        """
+        if self.pending_feeds or self.download_queue.active_count() > 0 or not self.finished_count:
+            return
+        self.show_queue_summary()
+
+    def show_queue_summary(self):
+        """대기열이 비었을 때 결과를 한 번만 표시 (실패가 있으면 목록 요약)"""
+        failed, self.failed_jobs = self.failed_jobs, []
+        self.finished_count = 0
+        if not failed:
+            QMessageBox.information(self, "성공", "대기열의 모든 다운로드 완료.")
+            return
+
+        shown = 10
+        lines = [f"#{job_id}: {error}" for job_id, error in failed[:shown]]
+        if len(failed) > shown:
+            lines.append(f"... 외 {len(failed) - shown}개 (자세한 내용은 로그 참고)")
+        QMessageBox.warning(self, "일부 실패", f"다운로드 실패 {len(failed)}개:\n\n" + "\n".join(lines))
+
+    def update_progress_safe(self, event):
+        """진행 이벤트를 GUI 스레드로 전달 (다운로드 워커에서 작업당 최대 10Hz로 호출)"""
+        self.progress_event_signal.emit(event)
 
     def update_status_safe(self, message):
         self.status_signal.emit(message)
 
     def setup_output_redirect(self):
-        """stdout/stderr를 로그 영역으로 리다이렉트"""
+        """stdout/stderr를 로그 영역으로 리다이렉트 (출력은 버퍼에 쌓였다가 주기적으로 표시)"""
         # stdout 리다이렉트
-        self.stdout_redirector = OutputRedirector(sys.stdout)
-        self.stdout_redirector.output_written.connect(self.append_log_output)
+        self.stdout_redirector = OutputRedirector(self.log_console.buffer, sys.stdout)
         sys.stdout = self.stdout_redirector
 
         # stderr 리다이렉트 (에러 메시지)
-        self.stderr_redirector = OutputRedirector(sys.stderr)
-        self.stderr_redirector.output_written.connect(self.append_log_error)
+        self.stderr_redirector = OutputRedirector(self.log_console.buffer, sys.stderr, prefix="[ERROR] ")
         sys.stderr = self.stderr_redirector
 
         # 초기 메시지
         print("비디오 다운로더 시작됨")
         print(f"설정 파일 위치: {config.CONFIG_FILE}")
 
-    def append_log_output(self, text):
-        """일반 출력을 로그에 추가"""
-        self.log_area.append(f"<span style='color: black;'>{text}</span>")
-        self.scroll_to_bottom()
-
-    def append_log_error(self, text):
-        """에러 출력을 로그에 추가 (빨간색)"""
-        self.log_area.append(f"<span style='color: red;'>[ERROR] {text}</span>")
-        self.scroll_to_bottom()
-
-    def scroll_to_bottom(self):
-        """로그를 맨 아래로 스크롤"""
-        sb = self.log_area.verticalScrollBar()
-        sb.setValue(sb.maximum())
-
     def closeEvent(self, event):
-        """윈도우 닫을 때 stdout/stderr 복원"""
+        """윈도우 닫을 때 다운로드 대기열 종료 및 stdout/stderr 복원"""
+        self.download_queue.shutdown(wait=False)
+        config.flush()
         if hasattr(self, 'stdout_redirector'):
             sys.stdout = self.stdout_redirector.original_stream
         if hasattr(self, 'stderr_redirector'):
@@ -0,0 +1,91 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QScrollArea
+
+
+def _format_bytes(num):
+    """바이트 수를 읽기 쉬운 단위로 변환"""
+    if num is None:
+        return "?"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if num < 1024:
+            return f"{num:.1f}{unit}" if unit != "B" else f"{int(num)}{unit}"
+        num /= 1024
+    return f"{num:.1f}TiB"
+
+
+def _format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressView(QScrollArea):
+    """
+    작업별 진행 상황 표시 (작업마다 라벨 + 진행 막대 한 줄)
+
+    다운로드 워커가 최대 10Hz로 묶어 보낸 진행 이벤트만 받아 위젯 값만 갱신하므로
+    로그 영역에 텍스트를 삽입/삭제하지 않습니다.
+    재생목록처럼 작업이 많아도 창이 늘어나지 않도록 줄 목록은 스크롤 영역 안에 둡니다.
+    """
+
+    MAX_HEIGHT = 180  # 약 6줄, 넘으면 스크롤
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWidgetResizable(True)
+        self.setMaximumHeight(self.MAX_HEIGHT)
+
+        self.container = QWidget()
+        self.rows_layout = QVBoxLayout(self.container)
+        self.rows_layout.setContentsMargins(0, 0, 0, 0)
+        self.rows_layout.addStretch()  # 줄은 위에서부터 채움
+        self.setWidget(self.container)
+        self.rows = {}  # job_id -> (row widget, label, progress bar)
+
+    def add_job(self, job_id):
+        """작업 줄 추가 (대기열에 작업이 추가될 때)"""
+        if job_id not in self.rows:
+            row = QWidget(self.container)
+            row_layout = QHBoxLayout(row)
+            row_layout.setContentsMargins(0, 0, 0, 0)
+
+            label = QLabel(f"#{job_id} 대기 중")
+            label.setMinimumWidth(320)
+            bar = QProgressBar()
+            bar.setRange(0, 1000)  # 0.1% 단위
+            bar.setValue(0)
+
+            row_layout.addWidget(label)
+            row_layout.addWidget(bar)
+            self.rows_layout.insertWidget(self.rows_layout.count() - 1, row)
+            self.rows[job_id] = (row, label, bar)
+
+    def update_event(self, event):
+        """진행 이벤트 반영 (GUI 스레드, 이미 제거된 작업의 늦게 도착한 이벤트는 무시)"""
+        entry = self.rows.get(event.get('job_id'))
+        if entry is None:
+            return
+        _, label, bar = entry
+
+        bar.setValue(int(event['percent'] * 10))
+
+        if event['status'] == 'finished':
+            label.setText(f"#{event.get('job_id')} [{event['stream_id']}] 처리 중...")
+            return
+
+        speed = f"{_format_bytes(event['speed'])}/s" if event['speed'] else "-"
+        label.setText(
+            f"#{event.get('job_id')} [{event['stream_id']}] "
+            f"{_format_bytes(event['downloaded_bytes'])} / {_format_bytes(event['total_bytes'])} | "
+            f"{speed} | {_format_eta(event['eta'])}"
+        )
+
+    def remove_job(self, job_id):
+        """끝난 작업의 줄 제거"""
+        entry = self.rows.pop(job_id, None)
+        if entry:
+            row = entry[0]
+            self.rows_layout.removeWidget(row)
+            row.deleteLater()
@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from src.core.config import config
 from src.core.ffmpeg_installer import FFmpegInstaller
+from src.core.transfer_backends import TransferBackends
 from src.core.ytdlp_plugin_installer import YtDlpPluginInstaller
 
 
@@ -38,6 +39,12 @@ class BenchmarkThread(QThread):
                 progress_callback=lambda p: self.progress.emit(p),
                 status_callback=lambda s: self.status.emit(s)
             )
+            # 찾은 워커 수로 형식별 전송 백엔드 비교 (aria2c/ffmpeg가 없으면 측정 없이 native)
+            result['transfer_backends'] = NetworkBenchmark.run_backend_benchmark(
+                progress_callback=lambda p: self.progress.emit(p),
+                status_callback=lambda s: self.status.emit(s),
+                workers=result['optimal_workers']
+            )['backends']
             self.finished.emit(result)
         except Exception as e:
             self.error.emit(str(e))
@@ -110,6 +117,15 @@ class SettingsDialog(QDialog):
         path_h_layout.addWidget(self.path_btn)
         path_layout.addRow("다운로드 경로:", path_h_layout)
 
+        self.archive_check = QCheckBox("이미 다운로드한 영상 건너뛰기")
+        self.archive_check.setChecked(config.get("download_archive_enabled"))
+        path_layout.addRow("", self.archive_check)
+
+        archive_note = QLabel("다운로드 기록을 확인하여 플레이리스트를 다시 받을 때 새 영상만 다운로드합니다")
+        archive_note.setStyleSheet("color: gray; font-size: 9px;")
+        archive_note.setWordWrap(True)
+        path_layout.addRow("", archive_note)
+
         path_group.setLayout(path_layout)
         layout.addWidget(path_group)
 
@@ -169,6 +185,28 @@ class SettingsDialog(QDialog):
         format_note.setWordWrap(True)
         quality_layout.addRow("", format_note)
 
+        # 메타데이터/썸네일/자막 삽입
+        self.embed_metadata_check = QCheckBox("메타데이터(제목, 업로더, 챕터) 삽입")
+        self.embed_metadata_check.setChecked(config.get("embed_metadata"))
+        quality_layout.addRow("", self.embed_metadata_check)
+
+        self.embed_thumbnail_check = QCheckBox("썸네일 삽입")
+        self.embed_thumbnail_check.setChecked(config.get("embed_thumbnail"))
+        quality_layout.addRow("", self.embed_thumbnail_check)
+
+        self.embed_subtitles_check = QCheckBox("자막 삽입")
+        self.embed_subtitles_check.setChecked(config.get("embed_subtitles"))
+        quality_layout.addRow("", self.embed_subtitles_check)
+
+        self.single_pass_check = QCheckBox("병합과 삽입을 한 번에 처리")
+        self.single_pass_check.setChecked(config.get("single_pass_postprocess"))
+        quality_layout.addRow("", self.single_pass_check)
+
+        single_pass_note = QLabel("FFmpeg를 한 번만 실행해 출력 파일을 한 번만 씁니다 (큰 파일의 후처리 시간 단축)")
+        single_pass_note.setStyleSheet("color: gray; font-size: 9px;")
+        single_pass_note.setWordWrap(True)
+        quality_layout.addRow("", single_pass_note)
+
         quality_group.setLayout(quality_layout)
         layout.addWidget(quality_group)
 
@@ -251,12 +289,51 @@ class SettingsDialog(QDialog):
 
         # 동시 프래그먼트 수
         self.concurrent_spin = QSpinBox()
-        self.concurrent_spin.setRange(1, 16)
+        self.concurrent_spin.setRange(1, 32)
         self.concurrent_spin.setValue(config.get("concurrent_fragments"))
         self.concurrent_spin.setSuffix(" 개")
         concurrent_label = QLabel("동시 다운로드 조각 수")
         download_layout.addRow(concurrent_label, self.concurrent_spin)
 
+        # 동시 다운로드 작업 수
+        self.max_jobs_spin = QSpinBox()
+        self.max_jobs_spin.setRange(1, 8)
+        self.max_jobs_spin.setValue(config.get("max_concurrent_downloads"))
+        self.max_jobs_spin.setSuffix(" 개")
+        download_layout.addRow(QLabel("동시 다운로드 작업 수"), self.max_jobs_spin)
+
+        # 전체 연결 예산
+        self.connection_budget_spin = QSpinBox()
+        self.connection_budget_spin.setRange(1, 64)
+        self.connection_budget_spin.setValue(config.get("connection_budget"))
+        self.connection_budget_spin.setSuffix(" 개")
+        download_layout.addRow(QLabel("전체 연결 예산"), self.connection_budget_spin)
+
+        queue_note = QLabel("동시에 실행되는 작업들이 전체 연결 예산을 나누어 사용합니다 (프로그램 재시작 후 적용)")
+        queue_note.setStyleSheet("color: gray; font-size: 9px;")
+        queue_note.setWordWrap(True)
+        download_layout.addRow("", queue_note)
+
+        # 적응형 프래그먼트 수 조절
+        self.adaptive_fragments_check = QCheckBox("다운로드 중 조각 수 자동 조절")
+        self.adaptive_fragments_check.setChecked(config.get("adaptive_fragments"))
+        download_layout.addRow("", self.adaptive_fragments_check)
+
+        adaptive_note = QLabel("처리량과 오류(429) 비율을 보고 위 조각 수 안에서 워커 수를 늘리거나 줄입니다 (HLS/DASH)")
+        adaptive_note.setStyleSheet("color: gray; font-size: 9px;")
+        adaptive_note.setWordWrap(True)
+        download_layout.addRow("", adaptive_note)
+
+        # 영상/오디오 동시 다운로드
+        self.parallel_streams_check = QCheckBox("영상과 오디오를 동시에 다운로드")
+        self.parallel_streams_check.setChecked(config.get("parallel_streams"))
+        download_layout.addRow("", self.parallel_streams_check)
+
+        # 단일 파일 형식 분할 다운로드
+        self.segmented_http_check = QCheckBox("단일 파일 형식도 여러 연결로 나누어 다운로드")
+        self.segmented_http_check.setChecked(config.get("segmented_http"))
+        download_layout.addRow("", self.segmented_http_check)
+
         perf_note = QLabel("※ 청크 크기, 버퍼 등의 네트워크 최적화는 yt-dlp가 자동으로 처리합니다")
         perf_note.setStyleSheet("color: gray; font-size: 9px;")
         perf_note.setWordWrap(True)
@@ -265,6 +342,28 @@ class SettingsDialog(QDialog):
         download_group.setLayout(download_layout)
         layout.addWidget(download_group)
 
+        # 전송 형식별 다운로드 백엔드
+        backend_group = QGroupBox("전송 백엔드")
+        backend_layout = QFormLayout()
+
+        selected_backends = config.get("transfer_backends") or {}
+        self.backend_combos = {}
+        for protocol in TransferBackends.PROTOCOLS:
+            combo = QComboBox()
+            combo.addItems([name for name, protocols in TransferBackends.BACKENDS.items() if protocol in protocols])
+            combo.setCurrentText(selected_backends.get(protocol) or TransferBackends.DEFAULT)
+            combo.setEnabled(combo.count() > 1)
+            self.backend_combos[protocol] = combo
+            backend_layout.addRow(f"{protocol}:", combo)
+
+        backend_note = QLabel("aria2c/ffmpeg를 찾을 수 없으면 native로 다운로드합니다 (네트워크 벤치마크가 형식별로 자동 선택)")
+        backend_note.setStyleSheet("color: gray; font-size: 9px;")
+        backend_note.setWordWrap(True)
+        backend_layout.addRow("", backend_note)
+
+        backend_group.setLayout(backend_layout)
+        layout.addWidget(backend_group)
+
         # 속도 제한 설정
         speed_group = QGroupBox("속도 제한")
         speed_layout = QFormLayout()
@@ -280,6 +379,41 @@ class SettingsDialog(QDialog):
         speed_group.setLayout(speed_layout)
         layout.addWidget(speed_group)
 
+        # 영상 정보 캐시 설정
+        cache_group = QGroupBox("영상 정보 캐시")
+        cache_layout = QFormLayout()
+
+        self.info_cache_check = QCheckBox("추출한 영상 정보 캐시 사용")
+        self.info_cache_check.setChecked(config.get("info_cache_enabled"))
+        cache_layout.addRow("", self.info_cache_check)
+
+        self.info_cache_ttl_spin = QSpinBox()
+        self.info_cache_ttl_spin.setRange(1, 360)
+        self.info_cache_ttl_spin.setValue(config.get("info_cache_ttl_minutes"))
+        self.info_cache_ttl_spin.setSuffix(" 분")
+        cache_layout.addRow("유효 시간:", self.info_cache_ttl_spin)
+
+        self.info_cache_size_spin = QSpinBox()
+        self.info_cache_size_spin.setRange(1, 1024)
+        self.info_cache_size_spin.setValue(config.get("info_cache_max_mb"))
+        self.info_cache_size_spin.setSuffix(" MB")
+        cache_layout.addRow("최대 용량:", self.info_cache_size_spin)
+
+        clear_cache_layout = QHBoxLayout()
+        clear_cache_btn = QPushButton("캐시 비우기")
+        clear_cache_btn.clicked.connect(self.clear_info_cache)
+        clear_cache_layout.addWidget(clear_cache_btn)
+        clear_cache_layout.addStretch()
+        cache_layout.addRow("", clear_cache_layout)
+
+        cache_note = QLabel("재시도하거나 같은 영상을 다시 받을 때 영상 정보 추출을 생략합니다 (포맷 URL 만료 전까지)")
+        cache_note.setStyleSheet("color: gray; font-size: 9px;")
+        cache_note.setWordWrap(True)
+        cache_layout.addRow("", cache_note)
+
+        cache_group.setLayout(cache_layout)
+        layout.addWidget(cache_group)
+
         # 자동 최적화 버튼
         auto_group = QGroupBox("자동 최적화")
         auto_layout = QVBoxLayout()
@@ -344,23 +478,30 @@ class SettingsDialog(QDialog):
                 f"자동 설정 중 오류가 발생했습니다:\n{e}"
             )
 
+    def clear_info_cache(self):
+        """영상 정보 캐시 비우기"""
+        from src.core.info_cache import info_cache
+
+        stats = info_cache.stats()
+        info_cache.clear()
+        QMessageBox.information(
+            self,
+            "캐시 비우기",
+            f"영상 정보 캐시를 비웠습니다.\n\n"
+            f"삭제된 항목: {stats['entries']}개 ({stats['total_bytes'] / 1024:.1f} KB)\n"
+            f"이번 실행 중 적중/미스: {stats['hits']} / {stats['misses']}"
+        )
+
     def run_benchmark(self):
         """네트워크 벤치마크 실행"""
-        import os
-        cpu_count = os.cpu_count() or 4
-
-        # 테스트 횟수 계산 (1, 2, 4, 8, 16, ... CPU 코어 수까지)
-        test_count = 0
-        workers = 1
-        while workers <= cpu_count:
-            test_count += 1
-            workers *= 2
-
-        # 예상 데이터 사용량 (A/B 테스트: 각각 824MB)
-        # A 영상: 824MB * test_count
-        # B 영상: 824MB * test_count (부분 다운로드)
-        estimated_data_mb = 824 * test_count * 2  # A/B 테스트
-        estimated_data_gb = estimated_data_mb / 1024
+        from src.core.network_benchmark import NetworkBenchmark
+
+        # 적응형 탐색이므로 실제 측정 횟수는 보통 상한보다 적음
+        max_tests = NetworkBenchmark.MAX_EVALUATIONS
+
+        # 예상 소요 시간 상한 (A/B 테스트마다 워밍업 + 측정 시간, 시작/정리 약 3초)
+        trial_seconds = NetworkBenchmark.WARMUP_SECONDS + NetworkBenchmark.MEASURE_SECONDS + 3
+        estimated_minutes = max(1, round(trial_seconds * max_tests * 2 / 60))
 
         # 확인 대화상자
         reply = QMessageBox.question(
@@ -369,9 +510,9 @@ class SettingsDialog(QDialog):
             f"A/B 테스트 벤치마크를 실행하면 작은 파일과 큰 파일로\n"
             f"각각 테스트하여 최적의 병렬 다운로드 설정을 찾습니다.\n\n"
             f"테스트: A 영상(작은 파일) + B 영상(큰 파일 부분)\n"
-            f"워커 범위: 1~{cpu_count}개 (총 {test_count}가지 설정)\n"
-            f"예상 소요 시간: 10-20분\n"
-            f"예상 데이터 사용량: 약 {estimated_data_gb:.1f}GB\n\n"
+            f"워커 범위: 1~{NetworkBenchmark.MAX_WORKERS}개 (적응형 탐색, 최대 {max_tests}가지 설정)\n"
+            f"예상 소요 시간: 최대 약 {estimated_minutes}분 (테스트마다 {trial_seconds:.0f}초 이내)\n"
+            f"데이터 사용량: 측정 시간 동안 받은 만큼만 사용\n\n"
             f"벤치마크를 실행하시겠습니까?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
@@ -424,12 +565,17 @@ class SettingsDialog(QDialog):
         best_speed = result['best_speed_mbps']
         avg_speed_mb_per_sec = result.get('avg_download_speed_mb_per_sec', best_speed / 8)
 
-        config.set("benchmark_completed", True)
-        config.set("benchmark_optimal_workers", optimal_workers)
-        config.set("benchmark_min_size_per_worker", min_size_per_worker)
+        with config.transaction():
+            config.set("benchmark_completed", True)
+            config.set("benchmark_optimal_workers", optimal_workers)
+            config.set("benchmark_min_size_per_worker", min_size_per_worker)
+            config.set("transfer_backends", result['transfer_backends'])
 
         # UI 업데이트
         self.concurrent_spin.setValue(optimal_workers)
+        for protocol, name in result['transfer_backends'].items():
+            self.backend_combos[protocol].setCurrentText(name)
+        backends_text = ", ".join(f"{protocol}={name}" for protocol, name in result['transfer_backends'].items())
 
         # 결과 표시
         QMessageBox.information(
@@ -438,7 +584,8 @@ class SettingsDialog(QDialog):
             f"A/B 테스트 벤치마크가 완료되었습니다!\n\n"
             f"최고 속도: {best_speed:.1f} Mbps ({avg_speed_mb_per_sec:.1f} MB/s)\n"
             f"최적 워커 수: {optimal_workers}개 (자원 효율 고려)\n"
-            f"워커당 최소 크기: {min_size_per_worker}MB (I/O 병목 방지)\n\n"
+            f"워커당 최소 크기: {min_size_per_worker}MB (I/O 병목 방지)\n"
+            f"전송 백엔드: {backends_text}\n\n"
             f"※ 10% 이내 성능 차이 시 더 적은 워커 선택\n"
             f"※ 파일 크기에 따라 워커 수가 동적으로 조정됩니다\n\n"
             f"이 설정이 자동으로 적용되었습니다."
@@ -619,10 +766,12 @@ class SettingsDialog(QDialog):
         """FFmpeg 설치 여부 확인"""
         ffmpeg_path = FFmpegInstaller.check_ffmpeg()
         if ffmpeg_path:
+            capabilities = FFmpegInstaller.get_capabilities(ffmpeg_path)
+            version = capabilities['version'] if capabilities else "확인 불가"
             QMessageBox.information(
                 self,
                 "FFmpeg 확인",
-                f"FFmpeg가 설치되어 있습니다.\n\n경로: {ffmpeg_path}"
+                f"FFmpeg가 설치되어 있습니다.\n\n경로: {ffmpeg_path}\n버전: {version}"
             )
             self.ffmpeg_edit.setText(ffmpeg_path)
         else:
@@ -701,26 +850,44 @@ class SettingsDialog(QDialog):
         )
 
     def save_settings(self):
-        # 일반 설정 저장
-        config.set("download_path", self.path_edit.text())
-        config.set("ffmpeg_path", self.ffmpeg_edit.text())
-        config.set("default_quality", self.quality_combo.currentText())
-        config.set("output_format", self.format_combo.currentText())
-
-        # 쿠키 설정 저장
-        config.set("cookies_enabled", self.cookies_enabled_check.isChecked())
-
-        browser_selection = self.browser_combo.currentText()
-        if browser_selection == "(사용 안 함)":
-            config.set("cookies_from_browser", "")
-        else:
-            config.set("cookies_from_browser", browser_selection)
-
-        config.set("cookies_file_path", self.cookies_file_edit.text())
-
-        # 성능 설정 저장
-        config.set("concurrent_fragments", self.concurrent_spin.value())
-        config.set("speed_limit_mbps", self.speed_spin.value())
-        # chunk_size_mb, buffer_size_mb는 yt-dlp 자동 최적화에 맡기므로 저장하지 않음
+        # 모든 설정을 한 번의 파일 쓰기로 저장
+        with config.transaction():
+            # 일반 설정 저장
+            config.set("download_path", self.path_edit.text())
+            config.set("download_archive_enabled", self.archive_check.isChecked())
+            config.set("ffmpeg_path", self.ffmpeg_edit.text())
+            config.set("default_quality", self.quality_combo.currentText())
+            config.set("output_format", self.format_combo.currentText())
+            config.set("embed_metadata", self.embed_metadata_check.isChecked())
+            config.set("embed_thumbnail", self.embed_thumbnail_check.isChecked())
+            config.set("embed_subtitles", self.embed_subtitles_check.isChecked())
+            config.set("single_pass_postprocess", self.single_pass_check.isChecked())
+
+            # 쿠키 설정 저장
+            config.set("cookies_enabled", self.cookies_enabled_check.isChecked())
+
+            browser_selection = self.browser_combo.currentText()
+            if browser_selection == "(사용 안 함)":
+                config.set("cookies_from_browser", "")
+            else:
+                config.set("cookies_from_browser", browser_selection)
+
+            config.set("cookies_file_path", self.cookies_file_edit.text())
+
+            # 성능 설정 저장
+            config.set("concurrent_fragments", self.concurrent_spin.value())
+            config.set("speed_limit_mbps", self.speed_spin.value())
+            config.set("max_concurrent_downloads", self.max_jobs_spin.value())
+            config.set("connection_budget", self.connection_budget_spin.value())
+            config.set("adaptive_fragments", self.adaptive_fragments_check.isChecked())
+            config.set("parallel_streams", self.parallel_streams_check.isChecked())
+            config.set("segmented_http", self.segmented_http_check.isChecked())
+            config.set("transfer_backends", {
+                protocol: combo.currentText() for protocol, combo in self.backend_combos.items()
+            })
+            config.set("info_cache_enabled", self.info_cache_check.isChecked())
+            config.set("info_cache_ttl_minutes", self.info_cache_ttl_spin.value())
+            config.set("info_cache_max_mb", self.info_cache_size_spin.value())
+            # chunk_size_mb, buffer_size_mb는 yt-dlp 자동 최적화에 맡기므로 저장하지 않음
 
         self.accept()
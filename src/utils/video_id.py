@@ -0,0 +1,64 @@
+"""
+영상 식별자 유틸리티
+
+URL 또는 추출된 info dict로부터 yt-dlp 다운로드 아카이브와 동일한 형식의
+정규화된 영상 키("<extractor> <id>", 예: "youtube p_lrljKEVQY")를 생성합니다.
+"""
+import functools
+
+
+@functools.lru_cache(maxsize=1024)
+def make_video_key(url, ie_key=None):
+    """
+    URL만으로 정규화된 영상 키 생성 (추출 없이 extractor URL 패턴만 사용)
+
+    youtu.be/ID, youtube.com/watch?v=ID&t=30 처럼 표기가 다른 URL도 같은 키가 됩니다.
+    extractor를 모르면 전체 extractor(1,800개 이상)의 URL 패턴을 차례로 검사하므로
+    플레이리스트 항목처럼 ie_key를 알고 있으면 함께 넘깁니다.
+
+    Args:
+        url: 영상 URL
+        ie_key: extractor 키 (flat 항목의 ie_key 등, 지정하면 해당 extractor만 확인)
+
+    Returns:
+        str: "<extractor> <id>" 형식의 키 (식별 불가능한 URL이면 None)
+    """
+    from yt_dlp.extractor import gen_extractor_classes, get_info_extractor
+
+    if ie_key:
+        try:
+            ie = get_info_extractor(ie_key)
+        except KeyError:
+            ie = None
+        if ie is not None and ie.suitable(url):
+            return _make_key(ie, url)
+        # 알 수 없는 키이거나 URL과 맞지 않으면 전체 검사
+
+    for ie in gen_extractor_classes():
+        if ie.suitable(url):
+            return _make_key(ie, url)
+    return None
+
+
+def _make_key(ie, url):
+    from yt_dlp.utils import make_archive_id
+
+    # Generic extractor는 URL만으로 영상을 식별할 수 없음
+    if ie.ie_key() == 'Generic':
+        return None
+    temp_id = ie.get_temp_id(url)
+    return make_archive_id(ie, temp_id) if temp_id else None
+
+
+def make_video_key_from_info(info):
+    """
+    추출된 info dict(또는 flat 플레이리스트 항목)로부터 정규화된 영상 키 생성
+
+    Returns:
+        str: "<extractor> <id>" 형식의 키 (정보가 부족하면 None)
+    """
+    video_id = info.get('id')
+    extractor = info.get('extractor_key') or info.get('ie_key')
+    if not video_id or not extractor:
+        return None
+    return f"{extractor.lower()} {video_id}"
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+시작 시간(import) 벤치마크
+
+python -X importtime으로 시작 모듈을 import하여 모듈별 import 시간을 보고합니다.
+yt_dlp, requests처럼 시작 후 백그라운드/필요 시점에 import해야 하는 모듈이
+시작 경로에 다시 들어오면 --check로 실패 처리하여 회귀를 바로 확인할 수 있습니다.
+
+사용 예:
+    python startup_benchmark.py                 # 보고서 출력
+    python startup_benchmark.py --check         # 지연 import 대상이 시작 경로에 있으면 종료 코드 1
+    python startup_benchmark.py -o report.txt   # 보고서 파일 저장
+"""
+
+import argparse
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.resolve()
+
+# 측정할 시작 모듈 (GUI는 PyQt6가 설치된 경우에만)
+STARTUP_TARGETS = [
+    ("GUI", "src.gui.main_window", "PyQt6"),
+    ("CLI", "src.cli", None),
+]
+
+# 시작 경로에서 import되면 안 되는 모듈 (첫 화면 이후 또는 사용 시점에 import)
+DEFERRED_MODULES = ("yt_dlp", "requests", "src.gui.settings_dialog", "src.core.network_benchmark")
+
+
+def measure_imports(module, runs=3):
+    """
+    모듈 import 시간 측정 (여러 번 실행하여 모듈별 최소값 사용)
+
+    Returns:
+        dict: {모듈 이름: (self_us, cumulative_us)}
+    """
+    best = {}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            # "import time:  self [us] | cumulative | imported package" 형식
+            self_us, cumulative_us, name = [part.strip() for part in line.split(":", 1)[1].split("|")]
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+            if name not in best or cumulative_us < best[name][1]:
+                best[name] = (self_us, cumulative_us)
+    return best
+
+
+def build_report(label, module, timings, top=15):
+    """모듈별 import 시간 보고서 생성"""
+    lines = []
+    total_us = timings.get(module, (0, 0))[1]
+    lines.append(f"[{label}] import {module}: {total_us / 1000:.1f} ms (모듈 {len(timings)}개)")
+
+    # 최상위 패키지별 합계 (self 시간 기준)
+    packages = {}
+    for name, (self_us, _) in timings.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    lines.append("  패키지별 (self 합계):")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"    {self_us / 1000:8.1f} ms  {package}")
+
+    lines.append("  모듈별 (누적 시간 상위):")
+    for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: -item[1][1])[:top]:
+        lines.append(f"    {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    return lines
+
+
+def find_deferred(timings):
+    """시작 경로에 포함된 지연 import 대상 모듈"""
+    return sorted(
+        name for name in timings
+        if any(name == deferred or name.startswith(deferred + ".") for deferred in DEFERRED_MODULES)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 시간(import) 벤치마크")
+    parser.add_argument("--runs", type=int, default=3, help="반복 측정 횟수 (모듈별 최소값 사용)")
+    parser.add_argument("--top", type=int, default=15, help="보고서에 표시할 항목 수")
+    parser.add_argument("--check", action="store_true", help="지연 import 대상이 시작 경로에 있으면 실패")
+    parser.add_argument("-o", "--output", help="보고서 저장 파일")
+    args = parser.parse_args()
+
+    report = []
+    violations = []
+
+    for label, module, requirement in STARTUP_TARGETS:
+        if requirement and importlib.util.find_spec(requirement) is None:
+            report.append(f"[{label}] {requirement} 미설치 - 측정 생략")
+            continue
+
+        timings = measure_imports(module, args.runs)
+        report.extend(build_report(label, module, timings, args.top))
+
+        deferred = find_deferred(timings)
+        if deferred:
+            violations.append((label, deferred))
+            report.append(f"  [경고] 시작 경로에서 import된 지연 대상: {', '.join(deferred[:10])}")
+        report.append("")
+
+    text = "\n".join(report)
+    print(text)
+
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+        print(f"[OK] 보고서 저장: {args.output}")
+
+    if args.check and violations:
+        for label, deferred in violations:
+            print(f"[ERROR] {label}: 시작 경로에서 {len(deferred)}개 지연 대상 모듈 import됨", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
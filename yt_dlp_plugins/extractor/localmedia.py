@@ -0,0 +1,59 @@
+"""
+yt-dlp 추출기 플러그인: 로컬 미디어 서버 (src/core/local_media_server.py)
+
+저장소 루트가 sys.path에 있으면 yt-dlp가 yt_dlp_plugins 네임스페이스에서 자동으로 불러옵니다.
+http://host:port/localmedia/<이름>[?protocol=https,m3u8,dash] 주소만 처리하므로
+일반 다운로드에는 영향이 없습니다.
+"""
+from yt_dlp.extractor.common import InfoExtractor
+from yt_dlp.utils import float_or_none, int_or_none, parse_qs
+
+
+class LocalMediaIE(InfoExtractor):
+    IE_NAME = 'localmedia'
+    IE_DESC = False  # 추출기 목록에 표시하지 않음
+    _VALID_URL = r'(?P<base>https?://[^/?#]+/localmedia/(?P<id>[\w-]+))/?(?:[?#]|$)'
+
+    _PROTOCOLS = ('https', 'm3u8', 'dash')
+
+    def _real_extract(self, url):
+        base, video_id = self._match_valid_url(url).group('base', 'id')
+        protocols = (parse_qs(url).get('protocol') or [','.join(self._PROTOCOLS)])[0].split(',')
+        meta = self._download_json(f'{base}/info.json', video_id, 'Downloading local media info')
+
+        formats = []
+        if 'https' in protocols:
+            formats.append(self._progressive_format('https', f'{base}/video.mp4', meta))
+            # 영상/오디오가 별도 스트림이면 오디오도 단일 파일로 제공
+            audio = meta.get('audio')
+            if audio:
+                audio_base = base.rpartition('/')[0] + f"/{audio['id']}"
+                formats.append(self._progressive_format('https-audio', f'{audio_base}/video.mp4', audio, 'm4a'))
+        if 'm3u8' in protocols:
+            formats.extend(self._extract_m3u8_formats(
+                f'{base}/hls/master.m3u8', video_id, 'mp4', m3u8_id='hls'))
+        if 'dash' in protocols:
+            formats.extend(self._extract_mpd_formats(
+                f'{base}/dash/manifest.mpd', video_id, mpd_id='dash'))
+
+        return {
+            'id': video_id,
+            'title': meta.get('title') or video_id,
+            'duration': float_or_none(meta.get('duration')),
+            'formats': formats,
+        }
+
+    @staticmethod
+    def _progressive_format(format_id, url, meta, ext='mp4'):
+        return {
+            'format_id': format_id,
+            'url': url,
+            'ext': ext,
+            'filesize': int_or_none(meta.get('filesize')),
+            'width': int_or_none(meta.get('width')),
+            'height': int_or_none(meta.get('height')),
+            'fps': float_or_none(meta.get('fps')),
+            'vcodec': meta.get('vcodec'),
+            'acodec': meta.get('acodec'),
+            'tbr': float_or_none(meta.get('tbr')),
+        }